@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+    uvicorn config.asgi:application --workers 1
+
+finlife 의 async API(/finlife/async/...)와 async 동기화 작업은 이 진입점으로 실행할 때 이벤트 루프를 씁니다.
 """
 
 import os
@@ -45,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 요청별 처리 시간 / SQL / 응답 크기 지표 (/finlife/metrics/). 다른 미들웨어 시간까지 재도록 맨 앞에 둡니다.
+    'finlife.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -77,13 +79,105 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+# SQLite 운영 프로필 (SQLITE_PROFILE=production, 기본값)
+# - WAL: 쓰기(동기화) 중에도 읽기가 막히지 않습니다. synchronous=NORMAL 은 WAL 에서 안전한 권장값입니다.
+# - busy_timeout / timeout: 잠금을 만나면 바로 "database is locked" 를 내지 않고 기다립니다.
+# - transaction_mode=IMMEDIATE: 쓰기 트랜잭션이 시작할 때 쓰기 잠금을 잡아, 도중에 잠금을 올리다 실패하는 일을 막습니다.
+# - CONN_MAX_AGE: 요청마다 연결을 새로 열지 않고 재사용합니다.
+# SQLITE_PROFILE=default 이면 Django 기본 설정(rollback journal, 요청마다 새 연결)을 씁니다. (벤치마크 비교용)
+SQLITE_NAME = env('SQLITE_NAME', default=str(BASE_DIR / 'db.sqlite3'))
+SQLITE_PROFILE = env('SQLITE_PROFILE', default='production')
+SQLITE_PRAGMAS = {
+    'journal_mode': env('SQLITE_JOURNAL_MODE', default='WAL'),
+    'synchronous': env('SQLITE_SYNCHRONOUS', default='NORMAL'),
+    'mmap_size': env.int('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024),
+    # 음수는 KiB 단위 (-65536 = 64MB)
+    'cache_size': env.int('SQLITE_CACHE_SIZE', default=-65536),
+    'busy_timeout': env.int('SQLITE_BUSY_TIMEOUT_MS', default=5000),
+}
+# 읽기 전용 연결에서는 저널 모드를 바꿀 수 없으므로 연결 단위 PRAGMA 만 씁니다.
+SQLITE_READ_PRAGMAS = {'query_only': 1, **{
+    name: value for name, value in SQLITE_PRAGMAS.items() if name in ('mmap_size', 'cache_size', 'busy_timeout')
+}}
+
+
+def sqlite_options(pragmas, **options):
+    return {
+        'init_command': '; '.join(f'PRAGMA {name}={value}' for name, value in pragmas.items()),
+        'timeout': pragmas['busy_timeout'] / 1000,
+        **options,
+    }
+
+
+if SQLITE_PROFILE == 'production':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': SQLITE_NAME,
+            'OPTIONS': sqlite_options(SQLITE_PRAGMAS, transaction_mode='IMMEDIATE'),
+            'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=600),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': SQLITE_NAME,
+        }
+    }
+
+# finlife 읽기를 읽기 전용 연결(finlife_read)로 보내는 라우터 (FINLIFE_READ_REPLICA=true 일 때)
+# 같은 DB 파일을 mode=ro 로 한 번 더 연 연결이며, 쓰기 트랜잭션 안의 읽기는 기본 DB 로 갑니다. (finlife/routers.py)
+if SQLITE_PROFILE == 'production' and env.bool('FINLIFE_READ_REPLICA', default=False):
+    DATABASES['finlife_read'] = {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': Path(SQLITE_NAME).resolve().as_uri() + '?mode=ro',
+        'OPTIONS': sqlite_options(SQLITE_READ_PRAGMAS),
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'CONN_HEALTH_CHECKS': True,
+        # 테스트에서는 별도 테스트 DB 를 만들지 않고 default 를 그대로 씁니다.
+        'TEST': {'MIRROR': 'default'},
     }
+    DATABASE_ROUTERS = ['finlife.routers.FinlifeReadRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# finlife 읽기 API 응답 캐시. 워커가 여러 개인 배포에서는 공유 백엔드(Redis 등)로 바꿔야
+# 동기화 직후 모든 워커가 같은 카탈로그 버전을 보게 됩니다.
+#   'finlife': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:6379'}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'finlife': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'finlife',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
 }
 
+FINLIFE_CACHE_ALIAS = 'finlife'
+
+# 이 시간(초)을 넘긴 요청은 실행된 SQL 과 함께 'finlife.slow_requests' 로거에 WARNING 으로 남깁니다. (None 이면 끔)
+FINLIFE_SLOW_REQUEST_SECONDS = 1.0
+
+# 금융감독원 depositProductsSearch API 주소 (비우면 공식 주소). 부하 테스트에서는 로컬 스텁 서버를 가리킵니다.
+FINLIFE_API_URL = env('FINLIFE_API_URL', default='')
+
+# true 이면 상품 옵션 / 여러 상품 / 최고 금리 / 수령액 계산 조회를 워커 메모리의 카탈로그 스냅샷(finlife/snapshot.py)에서 답합니다.
+# 워커마다 카탈로그 전체를 열 배열로 한 벌씩 들고 있으므로, 크기는 /finlife/metrics/ 의 finlife_snapshot_bytes 로 확인하세요.
+FINLIFE_SNAPSHOT = env.bool('FINLIFE_SNAPSHOT', default=False)
+
+# true 이면 동기화가 끝까지 성공한 뒤 응답에 없던 상품을 삭제하고 변경 피드(/finlife/changes/)에 product_removed 로 남깁니다.
+# 삭제된 상품의 금리 변경 이력도 함께 지워지므로 기본값은 false (상품을 계속 보관) 입니다.
+FINLIFE_SYNC_PRUNE = env.bool('FINLIFE_SYNC_PRUNE', default=False)
+
+# 대기 / 진행 중인 동기화 작업이 이 시간(초) 동안 진행 기록(heartbeat)이 없으면, 다음 등록 때 failed 로 정리하고 새 작업을 만듭니다.
+FINLIFE_SYNC_STALE_SECONDS = env.int('FINLIFE_SYNC_STALE_SECONDS', default=30 * 60)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -0,0 +1,137 @@
+# finlife/async_views.py
+# ASGI(config/asgi.py) 로 실행할 때 쓰는 async 뷰입니다. URL 은 finlife/async/... 아래에 있습니다.
+# DRF 의 @api_view 는 async 뷰를 지원하지 않으므로 일반 Django async 뷰로 만들고,
+# 응답 모양(필드 / 순서 / 오류 메시지)은 finlife/views.py 의 같은 이름 API 와 맞춥니다. (JSON 만 지원)
+#
+# DB 는 async ORM(aget / afirst / async for)으로 읽으므로, 요청이 DB 를 기다리는 동안에도
+# 이벤트 루프는 다른 요청과 진행 중인 동기화(aenqueue_sync)의 API 호출을 계속 처리합니다.
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
+from .cache import versioned_cache
+from .fastpath import FastJSONResponse, aserialize_products, paginated_response, product_values
+from .filters import PRODUCT_SORTS, filter_products, get_ordering
+from .jobs import aenqueue_sync
+from .leaderboard import ALL_TERMS, ALL_TYPES, aget_leaderboard, leaderboard_size
+from .models import DepositProducts, SyncRun
+from .pagination import DepositProductsCursorPagination
+from .serializers import DepositProductOptionsSerializer, SyncRunSerializer
+from .views import BATCH_LOOKUP_LIMIT
+
+
+def _error(message, status):
+    return FastJSONResponse({ 'error': message }, status=status)
+
+
+def _api_exception(exc):
+    # DRF 의 기본 exception_handler 와 같은 모양 (목록 / dict 는 그대로, 문자열은 {'detail': ...})
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else { 'detail': exc.detail }
+    return FastJSONResponse(data, status=exc.status_code)
+
+
+# [F01] 동기화 작업 등록 (이벤트 루프의 task 로 실행)
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+async def save_deposit_products(request):
+    sync_run = await aenqueue_sync()
+    return FastJSONResponse({
+        'message': '정기예금 상품 동기화 작업이 등록되었습니다.',
+        'job_id': sync_run.pk,
+        'status': sync_run.status,
+    }, status=202)
+
+
+# 동기화 작업 진행 상황 조회
+@require_GET
+async def sync_job_status(request, job_id):
+    try:
+        sync_run = await SyncRun.objects.aget(pk=job_id)
+    except SyncRun.DoesNotExist:
+        return _error('작업을 찾을 수 없습니다.', 404)
+    return FastJSONResponse(SyncRunSerializer(sync_run).data)
+
+
+# [F02] 상품 목록 조회 (JSON 빠른 경로와 같은 응답)
+@versioned_cache
+@require_GET
+async def deposit_products(request):
+    paginator = DepositProductsCursorPagination()
+    nested = request.GET.get('nested') in ('1', 'true')
+    try:
+        # 잘못된 sort / 필터 값 / 커서는 동기 뷰처럼 400 / 404 JSON 으로 답합니다.
+        paginator.ordering = get_ordering(request.GET, PRODUCT_SORTS, 'id')
+        products = filter_products(DepositProducts.objects.all(), request.GET)
+        # DRF 커서 페이지네이션은 동기 API 뿐이므로 페이지 조회만 DB 스레드에서 실행합니다.
+        rows = await sync_to_async(paginator.paginate_queryset)(product_values(products), Request(request))
+    except APIException as exc:
+        return _api_exception(exc)
+    return paginated_response(paginator, await aserialize_products(rows, nested=nested))
+
+
+# [F04] 특정 상품 옵션 리스트 출력
+@versioned_cache
+@require_GET
+async def deposit_product_options(request, fin_prdt_cd):
+    rows = [row async for row in product_values(DepositProducts.objects.filter(fin_prdt_cd=fin_prdt_cd))]
+    if not rows:
+        return _error('상품을 찾을 수 없습니다.', 404)
+    return FastJSONResponse((await aserialize_products(rows, nested=True))[0])
+
+
+# [F04] 여러 상품의 옵션 리스트를 한 번에 출력
+@csrf_exempt
+@versioned_cache
+@require_http_methods(['GET', 'POST'])
+async def deposit_product_options_batch(request):
+    if request.method == 'GET':
+        codes = [code for code in request.GET.get('fin_prdt_cd', '').split(',') if code]
+    else:
+        try:
+            codes = json.loads(request.body or b'{}').get('fin_prdt_cds')
+        except (ValueError, AttributeError):
+            codes = None
+        if not isinstance(codes, list) or not all(isinstance(code, str) for code in codes):
+            return _error('fin_prdt_cds 는 상품 코드 문자열 목록이어야 합니다.', 400)
+    if not codes:
+        return _error('상품 코드를 하나 이상 입력해 주세요.', 400)
+    if len(codes) > BATCH_LOOKUP_LIMIT:
+        return _error(f'한 번에 최대 {BATCH_LOOKUP_LIMIT}개까지 조회할 수 있습니다.', 400)
+
+    rows = [row async for row in product_values(DepositProducts.objects.filter(fin_prdt_cd__in=set(codes)))]
+    found = {product['fin_prdt_cd']: product for product in await aserialize_products(rows, nested=True)}
+    results = [
+        found[code] if code in found else { 'fin_prdt_cd': code, 'error': '상품을 찾을 수 없습니다.' }
+        for code in codes
+    ]
+    return FastJSONResponse({ 'results': results, 'missing': [code for code in codes if code not in found] })
+
+
+# [F05] 최고 금리 상품 조회
+@versioned_cache
+@require_GET
+async def top_rate_product(request):
+    params = request.GET
+    try:
+        save_trm = int(params.get('term') or ALL_TERMS)
+        n = int(params.get('n') or 1)
+    except ValueError:
+        return _error('term 과 n 은 정수여야 합니다.', 400)
+    # 순위표에는 상위 leaderboard_size() 개만 있으므로 그보다 큰 n 은 잘라 주지 않고 거절합니다.
+    if not 1 <= n <= leaderboard_size():
+        return _error(f'n 은 1 이상 {leaderboard_size()} 이하여야 합니다.', 400)
+    intr_rate_type = (params.get('type') or ALL_TYPES).upper()
+    if intr_rate_type not in (ALL_TYPES, 'S', 'M'):
+        return _error("type 은 'S' 또는 'M' 이어야 합니다.", 400)
+
+    top_options = await aget_leaderboard(save_trm, intr_rate_type, n)
+    if not top_options:
+        return FastJSONResponse({ 'message': '유효한 최고 금리 데이터를 찾을 수 없습니다.' }, status=404)
+    if not any(key in params for key in ('term', 'type', 'n')):
+        return FastJSONResponse(DepositProductOptionsSerializer(top_options[0]).data)
+    return FastJSONResponse(DepositProductOptionsSerializer(top_options, many=True).data)
@@ -0,0 +1,243 @@
+# finlife/bench.py
+# 벤치마크 / 테스트용 도구 모음입니다. (bench_finlife 관리 명령, tests.py 에서 사용)
+# - SyntheticPages      : 실제 API 스키마와 같은 합성 카탈로그 페이지를 시드 기반으로 생성
+# - StubFinlifeServer   : depositProductsSearch.json 을 흉내 내는 로컬 HTTP 서버
+# - QueryCounter / measure : 쿼리 수와 소요 시간 측정
+# - LatencyStats        : 동시 요청 부하 테스트의 처리량 / 지연 시간 분포
+
+import random
+import statistics
+import threading
+import time
+from collections.abc import Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.db import connection
+
+from .fastpath import dumps
+
+BANKS = (
+    '우리은행', '한국스탠다드차타드은행', '아이엠뱅크', '부산은행', '광주은행', '제주은행', '전북은행',
+    '경남은행', '중소기업은행', '한국산업은행', '국민은행', '신한은행', '농협은행주식회사', '하나은행',
+    '주식회사 케이뱅크', '수협은행', '주식회사 카카오뱅크', '토스뱅크 주식회사',
+)
+NAME_PREFIXES = ('WON', 'e-', '스마트', '청년', '시니어', '디지털', '쏠편한', 'Star', '아이사랑', '으쓱')
+NAME_SUFFIXES = ('정기예금', '플러스예금', '우대예금', '회전정기예금', '특판예금', '세이브예금')
+JOIN_WAYS = ('인터넷,스마트폰', '영업점,인터넷,스마트폰', '스마트폰', '영업점,인터넷,스마트폰,전화(텔레뱅킹)')
+JOIN_MEMBERS = ('실명의 개인', '개인(개인사업자 포함)', '만 19세~34세 청년', '만 60세 이상 개인', '제한없음')
+SPECIAL_CONDITIONS = (
+    '해당사항 없음',
+    '급여이체 실적 보유 시 우대금리 0.2%p',
+    '청년 고객 첫 거래 시 우대금리 0.3%p',
+    '마케팅 동의 및 자동이체 등록 시 우대금리 0.1%p',
+    '비대면 채널 가입 시 우대금리 0.15%p',
+)
+# 상품당 옵션 수는 최대 이 기간 수만큼 (상품 + 기간이 고유 키)
+TERMS = (1, 3, 6, 9, 12, 18, 24, 36, 48, 60)
+
+
+# ----------------------------------------------------
+# 1. 합성 카탈로그
+# ----------------------------------------------------
+class SyntheticPages(Mapping):
+    """
+    {(권역 코드, 페이지 번호): API result dict} 형태의 읽기 전용 매핑입니다.
+    페이지는 요청될 때마다 (seed, 권역, 페이지) 로 만든 난수로 생성하므로 메모리를 쓰지 않고, 항상 같은 내용입니다.
+    """
+
+    def __init__(self, products, options_per_product=4, groups=('020000',), page_size=100, seed=0):
+        self.groups = tuple(groups)
+        self.page_size = page_size
+        self.options_per_product = min(options_per_product, len(TERMS))
+        self.seed = seed
+        # 권역마다 상품을 고르게 나눕니다.
+        base, extra = divmod(products, len(self.groups))
+        self.group_sizes = {group: base + (index < extra) for index, group in enumerate(self.groups)}
+
+    def max_page_no(self, group):
+        return max(1, -(-self.group_sizes[group] // self.page_size))
+
+    def __iter__(self):
+        for group in self.groups:
+            for page_no in range(1, self.max_page_no(group) + 1):
+                yield group, page_no
+
+    def __len__(self):
+        return sum(self.max_page_no(group) for group in self.groups)
+
+    def __getitem__(self, key):
+        group, page_no = key
+        if group not in self.group_sizes or not 1 <= page_no <= self.max_page_no(group):
+            raise KeyError(key)
+        rng = random.Random(f'{self.seed}:{group}:{page_no}')
+        start = (page_no - 1) * self.page_size
+        base_list, option_list = [], []
+        for index in range(start, min(start + self.page_size, self.group_sizes[group])):
+            code = f'{group}{index:07d}'
+            base_list.append(self.product(rng, code))
+            option_list.extend(self.options(rng, code))
+        return {
+            'prdt_div': 'D', 'total_count': self.group_sizes[group], 'max_page_no': self.max_page_no(group),
+            'now_page_no': page_no, 'err_cd': '000', 'err_msg': '정상',
+            'baseList': base_list, 'optionList': option_list,
+        }
+
+    def product(self, rng, code):
+        return {
+            'dcls_month': '202401', 'fin_co_no': f'{rng.randrange(10 ** 7):07d}', 'fin_prdt_cd': code,
+            'kor_co_nm': rng.choice(BANKS),
+            'fin_prdt_nm': f'{rng.choice(NAME_PREFIXES)}{rng.choice(NAME_SUFFIXES)} {code[-4:]}',
+            'join_way': rng.choice(JOIN_WAYS), 'mtrt_int': '만기 후 1개월 이내: 기본금리의 50%',
+            'spcl_cnd': rng.choice(SPECIAL_CONDITIONS), 'join_deny': str(rng.choice((1, 1, 1, 2, 3))),
+            'join_member': rng.choice(JOIN_MEMBERS),
+            'etc_note': f'- 최소 가입금액: {rng.choice((1, 10, 100))}만원 이상\n- 만기 자동해지 가능',
+            'max_limit': rng.choice((None, None, 100000000, 500000000)),
+        }
+
+    def options(self, rng, code):
+        options = []
+        for save_trm in sorted(rng.sample(TERMS, self.options_per_product)):
+            rate_type = 'M' if rng.random() < 0.2 else 'S'
+            intr_rate = round(rng.uniform(1.5, 4.0), 2)
+            options.append({
+                'dcls_month': '202401', 'fin_prdt_cd': code,
+                'intr_rate_type': rate_type, 'intr_rate_type_nm': '복리' if rate_type == 'M' else '단리',
+                'save_trm': str(save_trm), 'intr_rate': intr_rate,
+                # 실제 API 처럼 우대금리가 비어 있는 옵션도 섞습니다.
+                'intr_rate2': None if rng.random() < 0.05 else round(intr_rate + rng.uniform(0, 1), 2),
+            })
+        return options
+
+
+# ----------------------------------------------------
+# 2. 로컬 스텁 서버 (depositProductsSearch.json 흉내)
+# ----------------------------------------------------
+class StubFinlifeServer:
+    """
+    pages 는 {(topFinGrpNo, pageNo): result dict} 매핑입니다. (dict 또는 SyntheticPages)
+    with 블록 안에서 self.url 로 요청할 수 있고, 받은 요청은 self.requests 에 쌓입니다.
+    """
+
+    def __init__(self, pages, fail_first=0, delay=0):
+        stub = self
+        self.pages = pages
+        self.requests = []
+        # 처음 fail_first 번의 요청은 503 으로 응답합니다. (재시도 테스트용)
+        self.fail_first = fail_first
+        # 응답마다 delay 초 기다립니다. (실제 API 의 응답 지연 흉내, 부하 테스트용)
+        self.delay = delay
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                key = (query['topFinGrpNo'][0], int(query['pageNo'][0]))
+                with stub._lock:
+                    stub.requests.append(key)
+                    failing = len(stub.requests) <= stub.fail_first
+                if stub.delay:
+                    time.sleep(stub.delay)
+                if failing:
+                    self.send_response(503)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                result = stub.pages.get(key)
+                body = dumps({'result': result} if result else {})
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/depositProductsSearch.json'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# ----------------------------------------------------
+# 3. 측정
+# ----------------------------------------------------
+class QueryCounter:
+    """connection.execute_wrapper 로 실행된 SQL 문 수를 셉니다. (executemany 는 1번)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(func, repeat=5, before=None):
+    """
+    func 를 repeat 번 실행해 소요 시간(초)의 min / median / max 와 마지막 실행의 쿼리 수를 돌려줍니다.
+    before 는 매 실행 전에 (측정 밖에서) 호출됩니다. 예: 캐시 비우기
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        if before:
+            before()
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+    return {
+        'seconds': {
+            'min': round(min(timings), 6),
+            'median': round(statistics.median(timings), 6),
+            'max': round(max(timings), 6),
+        },
+        'queries': counter.count,
+    }, result
+
+
+class LatencyStats:
+    """여러 스레드 / task 에서 요청 결과를 모아 처리량과 지연 시간 분위수를 냅니다."""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.lock_errors = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds, ok, locked=False):
+        with self._lock:
+            self.latencies.append(seconds)
+            self.errors += not ok
+            self.lock_errors += locked
+
+    def summary(self, elapsed):
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return {'requests': 0, 'errors': self.errors, 'lock_errors': self.lock_errors}
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 3)
+
+        return {
+            'requests': len(latencies),
+            'seconds': round(elapsed, 3),
+            'requests_per_second': round(len(latencies) / elapsed, 1),
+            'latency_ms': {
+                'median': round(statistics.median(latencies) * 1000, 3),
+                'p95': percentile(0.95),
+                'p99': percentile(0.99),
+                'max': round(latencies[-1] * 1000, 3),
+            },
+            'errors': self.errors,
+            'lock_errors': self.lock_errors,
+        }
@@ -0,0 +1,168 @@
+# finlife/cache.py
+# finlife 읽기 API 의 응답 캐시입니다.
+# 데이터는 동기화가 커밋될 때만 바뀌므로, 캐시 키에 카탈로그 버전 번호를 넣어 두면
+# 버전이 올라가는 순간 이전 응답은 자연히 쓰이지 않게 됩니다. (명시적인 무효화 불필요)
+#
+# 캐시 백엔드는 Django CACHES 설정의 별칭(FINLIFE_CACHE_ALIAS)으로 고릅니다.
+# - 개발: LocMemCache (프로세스 내부 LRU)
+# - 운영(멀티 워커): Redis / Memcached 처럼 워커끼리 공유하는 백엔드
+
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+
+from .models import CatalogVersion
+
+VERSION_KEY = 'finlife:catalog-version'
+# 프로세스 내부 캐시는 다른 워커의 버전 변경을 알 수 없으므로, 버전 번호만은 짧게 캐시합니다.
+DEFAULT_VERSION_TIMEOUT = 5
+DEFAULT_RESPONSE_TIMEOUT = 60 * 60
+
+
+def get_cache():
+    return caches[getattr(settings, 'FINLIFE_CACHE_ALIAS', 'default')]
+
+
+def _version_timeout():
+    return getattr(settings, 'FINLIFE_CACHE_VERSION_TIMEOUT', DEFAULT_VERSION_TIMEOUT)
+
+
+# ----------------------------------------------------
+# 1. 카탈로그 버전
+# ----------------------------------------------------
+def get_catalog_version():
+    """현재 카탈로그 버전. 캐시에 있으면 DB 를 조회하지 않습니다."""
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = CatalogVersion.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+        cache.set(VERSION_KEY, version, _version_timeout())
+    return version
+
+
+async def aget_catalog_version():
+    """get_catalog_version 의 async 버전 (async ORM)"""
+    cache = get_cache()
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        version = await CatalogVersion.objects.filter(pk=1).values_list('version', flat=True).afirst() or 0
+        await cache.aset(VERSION_KEY, version, _version_timeout())
+    return version
+
+
+def bump_catalog_version():
+    """
+    카탈로그 버전을 1 올립니다. 데이터를 바꾼 트랜잭션 안에서 호출해야 하며,
+    새 버전 번호는 그 트랜잭션이 커밋된 뒤에야 캐시에 알려집니다.
+    """
+    with transaction.atomic():
+        updated = CatalogVersion.objects.filter(pk=1).update(
+            version=F('version') + 1, updated_at=timezone.now(),
+        )
+        if not updated:
+            CatalogVersion.objects.create(pk=1, version=1)
+        version = CatalogVersion.objects.values_list('version', flat=True).get(pk=1)
+
+    transaction.on_commit(lambda: get_cache().set(VERSION_KEY, version, _version_timeout()))
+    return version
+
+
+# ----------------------------------------------------
+# 2. 응답 캐시 데코레이터
+# ----------------------------------------------------
+def _response_key(request, version):
+    vary = f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}"
+    return f"finlife:response:{version}:{hashlib.blake2b(vary.encode(), digest_size=16).hexdigest()}"
+
+
+def _to_cached(response, version):
+    """
+    캐시에 넣을 (본문, Content-Type, ETag). JSON 이 아닌 응답이면 None 을 돌려줍니다.
+
+    브라우저블 API(HTML) 응답에는 CSRF 토큰과 로그인한 사용자 이름이 들어 있으므로,
+    캐시 키에 사용자가 없는 이 캐시로 다른 사용자에게 돌려주면 안 됩니다.
+    """
+    # DRF Response 는 아직 렌더링 전이고, 빠른 경로의 HttpResponse 는 이미 본문이 있습니다.
+    if hasattr(response, 'render'):
+        response.render()
+    if response['Content-Type'].split(';')[0].strip() != 'application/json':
+        return None
+    content = response.content
+    etag = f'"{version}-{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+    return (content, response['Content-Type'], etag)
+
+
+def _cache_timeout():
+    return getattr(settings, 'FINLIFE_CACHE_TIMEOUT', DEFAULT_RESPONSE_TIMEOUT)
+
+
+def _from_cached(request, cached):
+    content, content_type, etag = cached
+    if etag in [tag.strip() for tag in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type=content_type)
+    response['ETag'] = etag
+    # 매번 ETag 로 재검증하도록 합니다. (동기화 직후에도 오래된 응답을 쓰지 않게)
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def versioned_cache(view):
+    """
+    @api_view 로 만든 GET 뷰의 200 JSON 응답을 (카탈로그 버전, 경로, Accept) 단위로 캐시합니다.
+    브라우저블 API 의 HTML 처럼 JSON 이 아닌 응답은 캐시하지 않고 매번 뷰를 거칩니다.
+
+    응답 본문의 해시로 강한 ETag 를 붙이고, If-None-Match 가 일치하면 304 를 돌려줍니다.
+    캐시 적중 시에는 뷰도, ORM 도 거치지 않습니다. GET 이외의 요청은 그대로 통과시킵니다.
+    async 뷰(finlife/async_views.py)에 붙이면 같은 캐시를 async API 로 읽고 씁니다.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view(request, *args, **kwargs)
+
+            cache = get_cache()
+            version = await aget_catalog_version()
+            key = _response_key(request, version)
+            cached = await cache.aget(key)
+            if cached is None:
+                response = await view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                cached = _to_cached(response, version)
+                if cached is None:
+                    return response
+                await cache.aset(key, cached, _cache_timeout())
+            return _from_cached(request, cached)
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+
+        cache = get_cache()
+        version = get_catalog_version()
+        key = _response_key(request, version)
+        cached = cache.get(key)
+        if cached is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cached = _to_cached(response, version)
+            if cached is None:
+                return response
+            cache.set(key, cached, _cache_timeout())
+        return _from_cached(request, cached)
+
+    return wrapper
@@ -0,0 +1,141 @@
+# finlife/calculator.py
+# 만기 수령액 계산기입니다. "X원을 N개월 맡기면 어느 상품이 가장 많이 주나?" 에 답합니다.
+#
+# 모든 옵션의 금리를 NumPy 배열(열 단위)로 한 번 읽어 두고, 요청이 오면 금액 x 옵션 행렬을
+# 한 번의 벡터 연산으로 계산한 뒤 상위 k개만 고릅니다. 배열은 카탈로그 버전이 바뀔 때만 다시 읽습니다.
+# FINLIFE_SNAPSHOT 이 켜져 있으면 따로 읽지 않고 카탈로그 스냅샷(finlife/snapshot.py)의 옵션 열을 그대로 씁니다.
+#
+# 계산식 (정기예금, 원금 P 를 만기까지 예치)
+#   단리(S)   : 이자 = P * r * n / 12
+#   월복리(M) : 이자 = P * ((1 + r / 12) ** n - 1)
+#   세후 수령액 = P + 이자 * (1 - 세율)
+
+import threading
+
+import numpy as np
+
+from .cache import get_catalog_version
+from .models import DepositOptions
+
+# 이자소득세 (일반과세 15.4%, 세금우대 9.5%, 비과세 0%)
+TAX_RATES = {
+    'general': 0.154,
+    'preferential': 0.095,
+    'exempt': 0.0,
+}
+DEFAULT_TAX = 'general'
+RATE_FIELDS = ('intr_rate2', 'intr_rate')
+
+_lock = threading.Lock()
+_columns = None
+
+
+# ----------------------------------------------------
+# 1. 옵션 금리 열(column) 배열
+# ----------------------------------------------------
+class RateColumns:
+    """
+    옵션 전체의 계산용 열 배열입니다. i 번째 원소는 모두 같은 옵션을 가리킵니다.
+    (스냅샷의 OptionColumns 와 같은 이름의 열을 가지므로 top_payouts 는 둘 중 무엇이든 받습니다)
+    """
+
+    def __init__(self, rows):
+        option_id, save_trm, intr_rate, intr_rate2, intr_rate_type, max_limit = zip(*rows) if rows else ((),) * 6
+        self.id = np.array(option_id, dtype=np.int64)
+        self.save_trm = np.array(save_trm, dtype=np.int32)
+        self.intr_rate = np.array(intr_rate, dtype=np.float64)
+        self.intr_rate2 = np.array(intr_rate2, dtype=np.float64)
+        self.is_monthly = np.array([rate_type == 'M' for rate_type in intr_rate_type], dtype=bool)
+        # 최고 한도가 없는 상품은 무한대로 둡니다.
+        self.max_limit = np.array([limit if limit else np.inf for limit in max_limit], dtype=np.float64)
+
+    @classmethod
+    def load(cls):
+        rows = list(
+            DepositOptions.objects
+            .order_by('id')
+            .values_list('id', 'save_trm', 'intr_rate', 'intr_rate2', 'intr_rate_type', 'product__max_limit')
+        )
+        return cls(rows)
+
+
+def get_columns():
+    """현재 카탈로그 버전의 열 배열. 버전이 그대로면 DB 를 다시 읽지 않습니다."""
+    global _columns
+    version = get_catalog_version()
+    columns = _columns
+    if columns is None or columns[0] != version:
+        with _lock:
+            if _columns is None or _columns[0] != version:
+                _columns = (version, RateColumns.load())
+            columns = _columns
+    return columns[1]
+
+
+def clear_columns():
+    # 다음 계산 때 DB 에서 다시 읽도록 합니다. (테스트처럼 같은 버전 번호가 다른 데이터를 가리킬 수 있는 경우)
+    global _columns
+    with _lock:
+        _columns = None
+
+
+# ----------------------------------------------------
+# 2. 벡터 계산
+# ----------------------------------------------------
+def payouts(amounts, term, rates, is_monthly, tax_rate):
+    """
+    amounts(길이 A) x 옵션(길이 O) 의 (세전 이자, 세금, 세후 수령액) 을 (A, O) 배열로 돌려줍니다.
+    rates 는 연이율(%) 배열입니다.
+    """
+    principal = np.asarray(amounts, dtype=np.float64)[:, None]
+    annual = rates[None, :] / 100
+    simple = annual * term / 12
+    compound = (1 + annual / 12) ** term - 1
+    interest = principal * np.where(is_monthly[None, :], compound, simple)
+    tax = interest * tax_rate
+    return interest, tax, principal + interest - tax
+
+
+def top_payouts(queries, k=10, rate_field='intr_rate2', tax_rate=TAX_RATES[DEFAULT_TAX], columns=None):
+    """
+    queries: [(amount, term), ...]
+    각 질의마다 저축 기간이 term 인 옵션 중 세후 수령액 상위 k개를
+    [(option_id, rate, interest, tax, payout), ...] 로 질의 순서대로 돌려줍니다.
+
+    같은 기간의 질의는 묶어서 한 번에 계산합니다. columns 를 생략하면 get_columns() 의 열을 씁니다.
+    """
+    columns = get_columns() if columns is None else columns
+    all_rates = getattr(columns, rate_field)
+    results = [None] * len(queries)
+
+    by_term = {}
+    for index, (amount, term) in enumerate(queries):
+        by_term.setdefault(term, []).append(index)
+
+    for term, indexes in by_term.items():
+        # 해당 기간 옵션 중 금리가 있는(-1 이 아닌) 옵션만 계산합니다.
+        candidates = np.flatnonzero((columns.save_trm == term) & (all_rates >= 0))
+        amounts = np.array([queries[index][0] for index in indexes], dtype=np.float64)
+        rates = all_rates[candidates]
+        interest, tax, payout = payouts(amounts, term, rates, columns.is_monthly[candidates], tax_rate)
+        # 금액이 상품의 최고 한도를 넘으면 가입할 수 없습니다.
+        payout = np.where(amounts[:, None] <= columns.max_limit[candidates][None, :], payout, -np.inf)
+
+        top = min(k, len(candidates))
+        for row, index in enumerate(indexes):
+            if top == 0:
+                results[index] = []
+                continue
+            # 전체 정렬 대신 k 번째 수령액 이상인 옵션만 골라 (수령액 내림차순, 옵션 id 순) 으로 정렬합니다.
+            # k 번째와 같은 수령액이 여럿이면 모두 후보에 넣으므로, 어느 옵션이 남을지는 id 로만 정해집니다.
+            threshold = -np.partition(-payout[row], top - 1)[top - 1]
+            picked = np.flatnonzero(payout[row] >= threshold)
+            picked = picked[np.lexsort((columns.id[candidates[picked]], -payout[row][picked]))][:top]
+            results[index] = [
+                (
+                    int(columns.id[candidates[col]]), float(rates[col]),
+                    float(interest[row, col]), float(tax[row, col]), float(payout[row, col]),
+                )
+                for col in picked if np.isfinite(payout[row, col])
+            ]
+    return results
@@ -0,0 +1,31 @@
+# finlife/changes.py
+# 카탈로그 변경 피드(change data capture)입니다.
+# 적재 엔진(finlife/ingest.py)은 상품 / 옵션을 바꾸는 트랜잭션 안에서 변경 하나마다 CatalogChange 를 한 행씩 남기므로,
+# 변경 기록은 카탈로그와 항상 함께 커밋되거나 함께 롤백됩니다. 소비자는 전체 목록을 다시 받아 비교하는 대신
+# "마지막으로 읽은 커서 이후의 변경" 만 받아 갑니다.
+#
+# 커서는 CatalogChange 의 id 입니다. SQLite 는 쓰기 트랜잭션이 한 번에 하나뿐이고 id 가 AUTOINCREMENT 이므로
+# 커밋 순서와 id 순서가 같아, 커서 이후를 읽으면 빠지는 변경이 없습니다.
+# (쓰기 트랜잭션이 동시에 커밋되는 DB 로 옮기면 늦게 커밋된 작은 id 를 건너뛸 수 있으므로 이 가정을 다시 확인해야 합니다)
+
+from .models import CatalogChange
+
+KINDS = tuple(kind for kind, _ in CatalogChange.KIND_CHOICES)
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+
+
+def read_changes(cursor=0, limit=DEFAULT_LIMIT, kinds=None):
+    """
+    cursor 이후의 변경을 id 순으로 최대 limit 개 읽어 (변경 목록, 다음 커서, 더 있는지) 를 돌려줍니다.
+    읽은 변경이 없으면 다음 커서는 cursor 그대로입니다.
+    """
+    changes = CatalogChange.objects.filter(id__gt=cursor)
+    if kinds:
+        changes = changes.filter(kind__in=kinds)
+    rows = list(
+        changes.order_by('id').values('id', 'kind', 'fin_prdt_cd', 'save_trm', 'changes', 'recorded_at')[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, (rows[-1]['id'] if rows else cursor), has_more
@@ -0,0 +1,342 @@
+# finlife/client.py
+# 금융감독원 API 호출용 공용 HTTP 클라이언트입니다.
+# - requests.Session + HTTPAdapter 로 커넥션 풀을 재사용
+# - 요청마다 (connect, read) 타임아웃 적용
+# - 지수 백오프 + 지터(full jitter) 재시도
+# - 연속 실패 시 일정 시간 호출을 차단하는 서킷 브레이커
+# - 호출별 지연 시간 / 응답 바이트 집계
+# ASGI 경로(async 수집)에서는 같은 규칙을 httpx.AsyncClient 로 구현한 AsyncFinlifeClient 를 씁니다.
+
+import asyncio
+import random
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .metrics import observe_upstream
+
+DEFAULT_TIMEOUT = (3.05, 10)     # (connect, read) 초
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5       # 첫 재시도 대기 상한 (초)
+DEFAULT_BACKOFF_MAX = 8.0
+DEFAULT_POOL_SIZE = 16
+DEFAULT_FAILURE_THRESHOLD = 5    # 연속 실패 횟수가 이 값에 도달하면 서킷을 엽니다.
+DEFAULT_RESET_TIMEOUT = 30.0     # 서킷이 열린 뒤 시험 호출을 허용하기까지의 시간 (초)
+
+# 재시도할 HTTP 상태 코드 (요청 과다 / 일시적인 서버 오류)
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class FinlifeAPIError(Exception):
+    """API 응답에 result 가 없거나 오류 코드가 내려온 경우"""
+
+
+class CircuitOpenError(FinlifeAPIError):
+    """서킷 브레이커가 열려 있어 호출하지 않은 경우"""
+
+
+# ----------------------------------------------------
+# 1. 서킷 브레이커
+# ----------------------------------------------------
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout=DEFAULT_RESET_TIMEOUT, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        # half-open 상태에서 시험 호출을 내보낸 시각. 시험 호출은 한 번에 하나만 허용합니다.
+        self.probe_started_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self):
+        with self._lock:
+            state = self.state
+            if state == self.HALF_OPEN:
+                # 시험 호출의 결과가 기록되기 전까지 다른 호출은 열린 상태처럼 막습니다.
+                # (결과가 기록되지 않은 채 reset_timeout 이 지나면 다음 호출을 새 시험 호출로 내보냅니다)
+                now = self.clock()
+                if self.probe_started_at is None or now - self.probe_started_at >= self.reset_timeout:
+                    self.probe_started_at = now
+                    return
+            if state != self.CLOSED:
+                raise CircuitOpenError('금융감독원 API 서킷이 열려 있어 호출을 건너뜁니다.')
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probe_started_at = None
+            # half-open 상태의 시험 호출이 실패하면 곧바로 다시 엽니다.
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = self.clock()
+
+
+# ----------------------------------------------------
+# 2. 호출 통계
+# ----------------------------------------------------
+class ClientStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_bytes = 0
+
+    def record(self, seconds, num_bytes, ok):
+        with self._lock:
+            self.calls += 1
+            self.failures += 0 if ok else 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self.total_bytes += num_bytes
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'failures': self.failures,
+                'retries': self.retries,
+                'total_seconds': round(self.total_seconds, 6),
+                'max_seconds': round(self.max_seconds, 6),
+                'total_bytes': self.total_bytes,
+            }
+
+
+# ----------------------------------------------------
+# 3. 클라이언트
+# ----------------------------------------------------
+def _raise_for_status(response):
+    # 오류 응답의 본문은 읽지 않으므로, 예외를 올리기 전에 연결을 풀에 돌려줍니다. (stream=True 인 경우)
+    if response.status_code >= 400:
+        response.close()
+        response.raise_for_status()
+
+
+class FinlifeClient:
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_base=DEFAULT_BACKOFF_BASE, backoff_max=DEFAULT_BACKOFF_MAX,
+                 pool_size=DEFAULT_POOL_SIZE, breaker=None, sleep=time.sleep):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = ClientStats()
+        self.sleep = sleep
+        # 호출이 끝날 때마다 (url, seconds, num_bytes, ok) 로 불리는 콜백 목록
+        self.listeners = []
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def backoff(self, attempt):
+        # full jitter: 0 ~ min(max, base * 2^attempt) 사이에서 무작위로 대기
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _send(self, url, params, stream=False):
+        start = time.perf_counter()
+        num_bytes, ok = 0, False
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout, stream=stream)
+            # 스트리밍 응답은 본문을 아직 읽지 않았으므로 Content-Length 로 대신 셉니다.
+            if stream:
+                num_bytes = int(response.headers.get('Content-Length') or 0)
+            else:
+                num_bytes = len(response.content)
+            ok = response.status_code < 400
+            return response
+        finally:
+            seconds = time.perf_counter() - start
+            self.stats.record(seconds, num_bytes, ok)
+            for listener in self.listeners:
+                listener(url, seconds, num_bytes, ok)
+
+    def get(self, url, params=None, stream=False):
+        """
+        서킷 확인 → 요청 → 실패 시 백오프 후 재시도. 성공한 Response 를 돌려줍니다.
+
+        stream=True 이면 본문을 읽지 않은 Response 를 돌려주므로 호출한 쪽에서 닫아야 합니다.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            try:
+                response = self._send(url, params, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    # 4xx 는 재시도해도 결과가 같으므로 그대로 예외로 올립니다.
+                    self.breaker.record_success()
+                    _raise_for_status(response)
+                    return response
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    _raise_for_status(response)
+                response.close()
+
+            self.stats.record_retry()
+            self.sleep(self.backoff(attempt))
+
+    def get_json(self, url, params=None):
+        return self.get(url, params=params).json()
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """프로세스 전체에서 공유하는 클라이언트 (커넥션 풀 재사용)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = FinlifeClient(**getattr(settings, 'FINLIFE_CLIENT', {}))
+            # 호출 시간 / 응답 크기를 /finlife/metrics/ 지표로 내보냅니다.
+            _client.listeners.append(observe_upstream)
+        return _client
+
+
+# ----------------------------------------------------
+# 4. async 클라이언트 (ASGI 경로)
+# ----------------------------------------------------
+class AsyncFinlifeClient:
+    """
+    FinlifeClient 와 같은 타임아웃 / 재시도 / 서킷 브레이커 규칙을 이벤트 루프 위에서 적용합니다.
+    여러 페이지를 스레드 없이 동시에 await 할 수 있습니다. (finlife.crawler.aiter_deposit_pages)
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_base=DEFAULT_BACKOFF_BASE, backoff_max=DEFAULT_BACKOFF_MAX,
+                 pool_size=DEFAULT_POOL_SIZE, breaker=None, sleep=asyncio.sleep):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = ClientStats()
+        self.sleep = sleep
+        self.listeners = []
+        # get_async_client 가 만든 경우, 루프가 끝날 때 이 클라이언트를 닫는 task
+        self.closer = None
+
+        connect, read = timeout
+        self.session = httpx.AsyncClient(
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    backoff = FinlifeClient.backoff
+
+    async def _send(self, url, params):
+        start = time.perf_counter()
+        num_bytes, ok = 0, False
+        try:
+            response = await self.session.get(url, params=params)
+            num_bytes = len(response.content)
+            ok = response.status_code < 400
+            return response
+        finally:
+            seconds = time.perf_counter() - start
+            self.stats.record(seconds, num_bytes, ok)
+            for listener in self.listeners:
+                listener(url, seconds, num_bytes, ok)
+
+    async def get(self, url, params=None):
+        """서킷 확인 → 요청 → 실패 시 백오프 후 재시도. 본문까지 읽은 httpx.Response 를 돌려줍니다."""
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            try:
+                response = await self._send(url, params)
+            except (httpx.ConnectError, httpx.TimeoutException):
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    self.breaker.record_success()
+                    response.raise_for_status()
+                    return response
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+
+            self.stats.record_retry()
+            await self.sleep(self.backoff(attempt))
+
+    async def get_json(self, url, params=None):
+        return (await self.get(url, params=params)).json()
+
+    async def aclose(self):
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+# httpx.AsyncClient 는 만들어진 이벤트 루프에서만 쓸 수 있으므로 루프마다 하나씩 둡니다.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+async def _close_with_loop(loop, client):
+    # asyncio.run (uvicorn, asgiref 의 async_to_sync 포함) 은 루프를 닫기 전에 남은 task 를 취소하고
+    # 끝날 때까지 기다리므로, 이 task 의 finally 에서 루프의 클라이언트 연결을 닫습니다.
+    try:
+        await loop.create_future()
+    finally:
+        _async_clients.pop(loop, None)
+        await client.aclose()
+
+
+def get_async_client():
+    """현재 이벤트 루프에서 공유하는 async 클라이언트. 서킷 브레이커는 동기 클라이언트와 함께 씁니다."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncFinlifeClient(
+            **{**getattr(settings, 'FINLIFE_CLIENT', {}), 'breaker': get_client().breaker},
+        )
+        client.listeners.append(observe_upstream)
+        # 루프는 task 를 약하게만 참조하므로 클라이언트가 task 를 잡아 둡니다.
+        client.closer = loop.create_task(_close_with_loop(loop, client))
+    return client
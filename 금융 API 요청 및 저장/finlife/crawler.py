@@ -0,0 +1,185 @@
+# finlife/crawler.py
+# 금융감독원 depositProductsSearch API 를 권역(topFinGrpNo)·페이지 단위로 병렬 수집합니다.
+# 각 권역의 1페이지를 먼저 읽어 max_page_no 를 확인한 뒤,
+# 나머지 페이지를 제한된 크기의 스레드 풀에서 동시에 요청합니다.
+# 응답 본문은 스트리밍으로 파싱하고, 페이지는 받는 대로 하나씩 넘겨 주므로
+# 동시에 메모리에 올라가는 페이지 수는 전체 카탈로그 크기와 무관하게 max_workers 개 안팎입니다.
+#
+# aiter_deposit_pages 는 같은 순서 / 창(window) 규칙을 스레드 대신 이벤트 루프의 task 로 실행하는 async 버전입니다.
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .client import FinlifeAPIError, get_async_client, get_client
+from .streaming import ResultItemStream
+
+BASE_URL = 'http://finlife.fss.or.kr/finlifeapi'
+PRODUCTS_SEARCH_URL = f'{BASE_URL}/depositProductsSearch.json'
+
+# 권역 코드 (020000:은행, 030200:여신전문, 030300:저축은행, 050000:보험, 060000:금융투자)
+DEFAULT_FIN_GROUPS = ('020000', '030200', '030300', '050000', '060000')
+DEFAULT_MAX_WORKERS = 8
+# async 수집에서 동시에 기다리는 최대 요청 수
+DEFAULT_MAX_CONCURRENCY = 16
+# 응답 본문을 읽는 단위 (바이트)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def get_fin_groups():
+    return tuple(getattr(settings, 'FINLIFE_FIN_GROUPS', DEFAULT_FIN_GROUPS))
+
+
+def get_products_search_url():
+    # 부하 테스트처럼 스텁 서버로 돌릴 때는 FINLIFE_API_URL 설정으로 바꿉니다.
+    return getattr(settings, 'FINLIFE_API_URL', None) or PRODUCTS_SEARCH_URL
+
+
+def _page_params(auth, group, page_no):
+    return {
+        'auth': auth,
+        'topFinGrpNo': group,
+        'pageNo': page_no,
+    }
+
+
+def _read_result(chunks, group, page_no):
+    lists = {'baseList': [], 'optionList': []}
+    stream = ResultItemStream(chunks)
+    for name, item in stream:
+        lists[name].append(item)
+
+    if not stream.has_result:
+        raise FinlifeAPIError(f'{group} 권역 {page_no} 페이지 응답에 result 가 없습니다.')
+    result = {**stream.meta, **lists}
+    # err_cd '000' 이 정상 응답입니다.
+    if result.get('err_cd', '000') != '000':
+        raise FinlifeAPIError(f"{group} 권역 {page_no} 페이지 오류: {result.get('err_msg')}")
+    return result
+
+
+def fetch_page(url, auth, group, page_no):
+    """한 권역의 한 페이지를 요청하고 result dict 를 돌려줍니다."""
+    # 커넥션 풀 / 타임아웃 / 재시도 / 서킷 브레이커는 공용 클라이언트가 처리합니다.
+    # 본문 전체를 문자열로 받은 뒤 json.loads 하지 않고, 청크 단위로 읽으면서 원소를 꺼냅니다.
+    with get_client().get(url, params=_page_params(auth, group, page_no), stream=True) as response:
+        return _read_result(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), group, page_no)
+
+
+async def afetch_page(url, auth, group, page_no):
+    """fetch_page 의 async 버전. 응답을 기다리는 동안 이벤트 루프는 다른 요청을 처리합니다."""
+    response = await get_async_client().get(url, params=_page_params(auth, group, page_no))
+    return _read_result([response.content], group, page_no)
+
+
+def iter_deposit_pages(url=None, auth=None, groups=None,
+                       max_workers=DEFAULT_MAX_WORKERS, fetch=fetch_page, progress=None):
+    """
+    모든 권역의 모든 페이지 result 를 권역 → 페이지 순서로 하나씩 yield 합니다.
+
+    fetch 는 (url, auth, group, page_no) -> result dict 형태의 함수이며, 테스트에서 교체할 수 있습니다.
+    progress 를 넘기면 전체 페이지 수가 정해진 뒤, 그리고 남은 페이지를 하나 받을 때마다
+    progress(fetched, total) 로 호출합니다. (호출 스레드에서 순서대로 불립니다)
+    """
+    url = get_products_search_url() if url is None else url
+    auth = settings.API_KEY if auth is None else auth
+    groups = get_fin_groups() if groups is None else tuple(groups)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 1. 권역별 첫 페이지를 동시에 요청해 전체 페이지 수를 확인
+        first_pages = list(executor.map(lambda group: fetch(url, auth, group, 1), groups))
+        total = sum(int(first.get('max_page_no') or 1) for first in first_pages)
+        fetched = len(first_pages)
+        if progress:
+            progress(fetched, total)
+
+        # 2. 남은 페이지는 최대 max_workers 개까지만 미리 요청해 두고, 하나를 넘길 때마다 하나를 더 요청
+        remaining = iter([
+            (group, page_no)
+            for group, first in zip(groups, first_pages)
+            for page_no in range(2, int(first.get('max_page_no') or 1) + 1)
+        ])
+        window = deque()
+
+        def refill():
+            while len(window) < max_workers:
+                task = next(remaining, None)
+                if task is None:
+                    return
+                window.append((task[0], executor.submit(fetch, url, auth, *task)))
+
+        refill()
+        for index, group in enumerate(groups):
+            first, first_pages[index] = first_pages[index], None
+            yield first
+            while window and window[0][0] == group:
+                _, future = window.popleft()
+                refill()
+                result = future.result()
+                fetched += 1
+                if progress:
+                    progress(fetched, total)
+                yield result
+
+
+async def aiter_deposit_pages(url=None, auth=None, groups=None,
+                              max_concurrency=DEFAULT_MAX_CONCURRENCY, fetch=afetch_page, progress=None):
+    """
+    iter_deposit_pages 의 async 버전입니다. 페이지를 같은 순서로 내놓는 async generator 입니다.
+
+    fetch 는 (url, auth, group, page_no) 를 받는 async 함수, progress 는 progress(fetched, total) 형태의 async 함수입니다.
+    중간에 예외가 나거나 소비를 멈추면 아직 기다리던 요청은 취소합니다.
+    """
+    url = get_products_search_url() if url is None else url
+    auth = settings.API_KEY if auth is None else auth
+    groups = get_fin_groups() if groups is None else tuple(groups)
+
+    # 1. 권역별 첫 페이지를 동시에 요청해 전체 페이지 수를 확인
+    first_pages = list(await asyncio.gather(*(fetch(url, auth, group, 1) for group in groups)))
+    total = sum(int(first.get('max_page_no') or 1) for first in first_pages)
+    fetched = len(first_pages)
+    if progress:
+        await progress(fetched, total)
+
+    # 2. 남은 페이지는 최대 max_concurrency 개까지만 미리 요청해 두고, 하나를 넘길 때마다 하나를 더 요청
+    remaining = iter([
+        (group, page_no)
+        for group, first in zip(groups, first_pages)
+        for page_no in range(2, int(first.get('max_page_no') or 1) + 1)
+    ])
+    window = deque()
+
+    def refill():
+        while len(window) < max_concurrency:
+            task = next(remaining, None)
+            if task is None:
+                return
+            window.append((task[0], asyncio.ensure_future(fetch(url, auth, *task))))
+
+    try:
+        refill()
+        for index, group in enumerate(groups):
+            first, first_pages[index] = first_pages[index], None
+            yield first
+            while window and window[0][0] == group:
+                _, future = window.popleft()
+                refill()
+                result = await future
+                fetched += 1
+                if progress:
+                    await progress(fetched, total)
+                yield result
+    finally:
+        for _, future in window:
+            future.cancel()
+
+
+def crawl_deposit_products(progress=None, **kwargs):
+    """모든 페이지를 하나의 {'baseList': [...], 'optionList': [...]} payload 로 합칩니다."""
+    payload = {'baseList': [], 'optionList': []}
+    for result in iter_deposit_pages(progress=progress, **kwargs):
+        payload['baseList'].extend(result.get('baseList') or [])
+        payload['optionList'].extend(result.get('optionList') or [])
+    return payload
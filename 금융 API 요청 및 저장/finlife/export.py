@@ -0,0 +1,101 @@
+# finlife/export.py
+# 상품 카탈로그를 (상품 × 옵션) 평면 표로 내보냅니다. (CSV / NDJSON, 선택적으로 gzip)
+# 분석 쪽에서 deposit-products/ 를 페이지마다 읽고 상품마다 deposit-product-options/ 를 다시 호출하던 것을
+# 요청 한 번으로 대신합니다.
+#
+# 상품은 id 순서로 batch_size 개씩(keyset) 읽고, 그 상품들의 옵션은 쿼리 1번으로 읽어 바로 인코딩해 내보냅니다.
+# 메모리에는 한 배치만 올라가므로 카탈로그 크기와 무관하고, 첫 배치를 읽는 즉시 첫 바이트가 나갑니다.
+# 배치마다 따로 읽으므로 내보내는 도중에 동기화가 커밋되면 뒤쪽 배치에는 새 데이터가 보일 수 있습니다.
+
+import csv
+import io
+import zlib
+
+from .fastpath import dumps
+from .models import DepositOptions, DepositProducts
+from .utils import iter_by_id
+
+FORMATS = ('csv', 'ndjson')
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+EXPORT_BATCH_SIZE = 1000
+
+PRODUCT_COLUMNS = (
+    'fin_prdt_cd', 'kor_co_nm', 'fin_prdt_nm', 'join_way', 'join_member',
+    'join_deny', 'max_limit', 'etc_note', 'spcl_cnd',
+)
+OPTION_COLUMNS = ('save_trm', 'intr_rate', 'intr_rate2', 'intr_rate_type', 'intr_rate_type_nm')
+COLUMNS = PRODUCT_COLUMNS + OPTION_COLUMNS
+
+
+# ----------------------------------------------------
+# 1. 행 읽기
+# ----------------------------------------------------
+def iter_row_batches(products=None, batch_size=EXPORT_BATCH_SIZE):
+    """
+    (상품 × 옵션) 행(COLUMNS 순서의 튜플) 목록을 상품 batch_size 개 단위로 내놓습니다.
+    옵션이 없는 상품도 옵션 칸을 비운 한 행으로 내보냅니다. (LEFT JOIN)
+    """
+    products = DepositProducts.objects.all() if products is None else products
+    empty_option = (None,) * len(OPTION_COLUMNS)
+    for rows in iter_by_id(products, PRODUCT_COLUMNS, batch_size):
+        options = {}
+        option_rows = (
+            DepositOptions.objects
+            .filter(product_id__in=[row[0] for row in rows])
+            .order_by('product_id', 'save_trm')
+            .values_list('product_id', *OPTION_COLUMNS)
+        )
+        for product_id, *values in option_rows:
+            options.setdefault(product_id, []).append(tuple(values))
+
+        batch = []
+        for product_id, *values in rows:
+            for option in options.get(product_id) or [empty_option]:
+                batch.append((*values, *option))
+        yield batch
+
+
+# ----------------------------------------------------
+# 2. 인코딩
+# ----------------------------------------------------
+def _encode_csv(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def take():
+        value = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    # 머리글은 첫 쿼리를 기다리지 않고 바로 내보냅니다.
+    writer.writerow(COLUMNS)
+    yield take()
+    for batch in batches:
+        writer.writerows(batch)
+        yield take()
+
+
+def _encode_ndjson(batches):
+    for batch in batches:
+        yield b''.join(dumps(dict(zip(COLUMNS, row))) + b'\n' for row in batch)
+
+
+def gzip_chunks(chunks, level=6):
+    """바이트 청크를 gzip 으로 압축하며 내보냅니다. 청크마다 flush 하므로 받는 쪽은 바로 풀 수 있습니다."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_chunks(fmt='csv', products=None, batch_size=EXPORT_BATCH_SIZE, gzip=False):
+    """내보낼 바이트 청크를 차례로 돌려주는 generator 입니다. (StreamingHttpResponse / 파일 쓰기 공용)"""
+    encode = _encode_ndjson if fmt == 'ndjson' else _encode_csv
+    chunks = encode(iter_row_batches(products, batch_size))
+    return gzip_chunks(chunks) if gzip else chunks
@@ -0,0 +1,102 @@
+# finlife/fastpath.py
+# 목록 API 용 읽기 전용 빠른 직렬화 경로입니다.
+# ModelSerializer 는 행마다 모델 객체를 만들고 필드마다 to_representation 을 호출하기 때문에
+# 큰 목록에서는 CPU 시간 대부분을 차지합니다. 여기서는 .values() 로 dict 를 바로 받아
+# Serializer 와 같은 스키마(필드 이름 / 순서 / 타입)로 옮긴 뒤, orjson(설치된 경우)으로 인코딩합니다.
+
+import json
+
+from django.http import HttpResponse
+
+from .models import DepositOptions
+from .serializers import DepositOptionsNestedSerializer, DepositProductsSerializer
+
+try:
+    import orjson
+except ImportError:  # requirements.txt 에 있지만, 없어도 표준 json 으로 같은 바이트를 만듭니다.
+    orjson = None
+
+PRODUCT_FIELDS = DepositProductsSerializer.Meta.fields
+OPTION_FIELDS = DepositOptionsNestedSerializer.Meta.fields
+
+# SQLite 바인딩 변수 제한을 넘지 않도록 IN 절을 나누는 크기
+IN_CHUNK_SIZE = 500
+
+
+def dumps(data):
+    """DRF JSONRenderer 와 같은 형식(UTF-8, 공백 없는 구분자)의 bytes 를 돌려줍니다."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class FastJSONResponse(HttpResponse):
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(dumps(data), **kwargs)
+
+
+def product_values(queryset):
+    """페이지네이션(id 기준 커서)에 넘길 수 있도록 id 를 포함한 dict queryset 으로 바꿉니다."""
+    return queryset.values('id', *PRODUCT_FIELDS)
+
+
+def _options_by_product(product_ids):
+    options = {}
+    for start in range(0, len(product_ids), IN_CHUNK_SIZE):
+        rows = (
+            DepositOptions.objects
+            .filter(product_id__in=product_ids[start:start + IN_CHUNK_SIZE])
+            .order_by('product_id', 'id')
+            .values_list('product_id', *OPTION_FIELDS)
+        )
+        for product_id, *values in rows:
+            options.setdefault(product_id, []).append(dict(zip(OPTION_FIELDS, values)))
+    return options
+
+
+def serialize_products(rows, nested=False):
+    """
+    product_values() 로 읽은 행을 DepositProductsSerializer
+    (nested=True 이면 DepositProductsWithOptionsSerializer) 와 같은 모양으로 바꿉니다.
+    옵션은 상품 id 묶음마다 쿼리 1번으로 읽습니다.
+    """
+    results = [{field: row[field] for field in PRODUCT_FIELDS} for row in rows]
+    if nested:
+        options = _options_by_product([row['id'] for row in rows])
+        for row, result in zip(rows, results):
+            result['options'] = options.get(row['id'], [])
+    return results
+
+
+async def _aoptions_by_product(product_ids):
+    options = {}
+    for start in range(0, len(product_ids), IN_CHUNK_SIZE):
+        rows = (
+            DepositOptions.objects
+            .filter(product_id__in=product_ids[start:start + IN_CHUNK_SIZE])
+            .order_by('product_id', 'id')
+            .values_list('product_id', *OPTION_FIELDS)
+        )
+        async for product_id, *values in rows:
+            options.setdefault(product_id, []).append(dict(zip(OPTION_FIELDS, values)))
+    return options
+
+
+async def aserialize_products(rows, nested=False):
+    """serialize_products 의 async 버전 (옵션은 async ORM 으로 읽습니다)"""
+    results = [{field: row[field] for field in PRODUCT_FIELDS} for row in rows]
+    if nested:
+        options = await _aoptions_by_product([row['id'] for row in rows])
+        for row, result in zip(rows, results):
+            result['options'] = options.get(row['id'], [])
+    return results
+
+
+def paginated_response(paginator, results):
+    # DRF CursorPagination.get_paginated_response 와 같은 모양
+    return FastJSONResponse({
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+        'results': results,
+    })
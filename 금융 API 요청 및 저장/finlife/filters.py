@@ -0,0 +1,99 @@
+# finlife/filters.py
+# 목록 API 의 서버 측 필터 / 정렬 파라미터를 queryset 조건으로 바꿉니다.
+# 지원하는 조합은 모두 models.py 에 정의한 복합 인덱스를 타도록 맞춰져 있습니다. (tests.py 의 쿼리 플랜 테스트 참고)
+#
+# deposit-products/  : kor_co_nm, join_deny, save_trm, intr_rate_type, min/max_intr_rate(2), sort
+# deposit-options/   : save_trm, intr_rate_type, min/max_intr_rate(2), sort
+
+from rest_framework.exceptions import ValidationError
+
+from .models import DepositOptions
+
+# 정렬 파라미터 → 커서 페이지네이션 ordering
+# 같은 값이 여러 행에 있어도 순서가 고정되도록 id 를 두 번째 키로 두고,
+# 커서에는 (정렬 값, id) 를 함께 넣어 같은 값이 몇 행이든 이어서 읽습니다. (finlife/pagination.py)
+# (SQLite 인덱스 안에서 같은 키의 행은 rowid 오름차순이므로, 방향을 인덱스 스캔 순서에 맞춥니다)
+PRODUCT_SORTS = {
+    'id': ('id',),
+    'kor_co_nm': ('kor_co_nm', 'id'),
+    '-kor_co_nm': ('-kor_co_nm', '-id'),
+}
+OPTION_SORTS = {
+    '-intr_rate2': ('-intr_rate2', 'id'),
+    'intr_rate2': ('intr_rate2', '-id'),
+    '-intr_rate': ('-intr_rate', 'id'),
+    'intr_rate': ('intr_rate', '-id'),
+}
+
+RATE_TYPES = ('S', 'M')
+OPTION_FILTER_PARAMS = (
+    'save_trm', 'intr_rate_type',
+    'min_intr_rate', 'max_intr_rate', 'min_intr_rate2', 'max_intr_rate2',
+)
+
+
+def _int(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: '정수여야 합니다.'})
+
+
+def _float(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValidationError({name: '숫자여야 합니다.'})
+
+
+def get_ordering(params, sorts, default):
+    sort = params.get('sort') or default
+    if sort not in sorts:
+        raise ValidationError({'sort': f"다음 중 하나여야 합니다: {', '.join(sorts)}"})
+    return sorts[sort]
+
+
+def filter_options(queryset, params):
+    """옵션 조건: save_trm, intr_rate_type, min_intr_rate, max_intr_rate, min_intr_rate2, max_intr_rate2"""
+    save_trm = _int(params, 'save_trm')
+    if save_trm is not None:
+        queryset = queryset.filter(save_trm=save_trm)
+
+    intr_rate_type = params.get('intr_rate_type')
+    if intr_rate_type:
+        if intr_rate_type.upper() not in RATE_TYPES:
+            raise ValidationError({'intr_rate_type': "'S' 또는 'M' 이어야 합니다."})
+        queryset = queryset.filter(intr_rate_type=intr_rate_type.upper())
+
+    for field in ('intr_rate', 'intr_rate2'):
+        low, high = _float(params, f'min_{field}'), _float(params, f'max_{field}')
+        if low is not None:
+            queryset = queryset.filter(**{f'{field}__gte': low})
+        if high is not None:
+            queryset = queryset.filter(**{f'{field}__lte': high})
+    return queryset
+
+
+def filter_products(queryset, params):
+    """
+    상품 조건: kor_co_nm, join_deny
+    옵션 조건(filter_options 와 같음)을 주면 그 조건을 만족하는 옵션이 하나라도 있는 상품만 남깁니다.
+    """
+    kor_co_nm = params.get('kor_co_nm')
+    if kor_co_nm:
+        queryset = queryset.filter(kor_co_nm=kor_co_nm)
+
+    join_deny = _int(params, 'join_deny')
+    if join_deny is not None:
+        queryset = queryset.filter(join_deny=join_deny)
+
+    if any(params.get(name) not in (None, '') for name in OPTION_FILTER_PARAMS):
+        matching = filter_options(DepositOptions.objects.all(), params).values('product_id')
+        queryset = queryset.filter(id__in=matching)
+    return queryset
@@ -0,0 +1,203 @@
+# finlife/fixtures.py
+# 상품 카탈로그 fixture 의 빠른 적재 / 스트리밍 덤프입니다.
+# loaddata 처럼 객체를 하나씩 역직렬화해 save() 하지 않고, 파일을 스트리밍으로 읽으며
+# batch_size 개 단위로 bulk upsert 합니다. 덤프도 id 순서로 청크씩 읽어 바로 써 내려가므로
+# 카탈로그 전체를 메모리에 올리지 않습니다.
+#
+# 지원 형식
+# - json   : Django fixture 형식 ([{"model", "pk", "fields"}, ...], finlife/fixtures/deposit_products.json 과 같음)
+# - ndjson : 한 줄에 상품 하나, 옵션은 "options" 배열로 중첩한 압축 형식
+#
+# 상품 / 옵션은 pk 가 아니라 자연 키(fin_prdt_cd, (상품, save_trm))로 upsert 하므로
+# 이미 데이터가 있는 DB 에 적재해도 중복이 생기지 않습니다.
+
+import json
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_catalog_version
+from .ingest import CHUNK_SIZE, OPTION_FIELDS, PRODUCT_FIELDS, _upsert_options, _upsert_products, option_row, product_row
+from .leaderboard import refresh_leaderboards
+from .models import DepositOptions, DepositProducts
+from .streaming import iter_json_array
+from .utils import iter_by_id
+
+FORMATS = ('json', 'ndjson')
+PRODUCT_MODEL = 'finlife.depositproducts'
+OPTION_MODEL = 'finlife.depositoptions'
+# 파일 읽기 단위 (바이트)
+READ_SIZE = 1 << 16
+
+
+def guess_format(path):
+    return 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'json'
+
+
+# ----------------------------------------------------
+# 1. 읽기
+# ----------------------------------------------------
+def _file_chunks(fp):
+    while True:
+        chunk = fp.read(READ_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_records(fp, fmt='json'):
+    """바이너리 파일 객체에서 fixture 레코드(dict)를 하나씩 읽습니다."""
+    if fmt == 'ndjson':
+        for line in fp:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        yield from iter_json_array(_file_chunks(fp))
+
+
+class FixtureLoader:
+    """
+    fixture 레코드를 받아 batch_size 개씩 모아 기록합니다.
+
+    Django fixture 의 옵션은 상품을 pk 로 참조하므로 (fixture pk → fin_prdt_cd) 표를,
+    기록한 상품은 (fin_prdt_cd → DB id) 표를 유지합니다. 둘 다 상품 수만큼의 작은 dict 입니다.
+    """
+
+    def __init__(self, batch_size=CHUNK_SIZE):
+        self.batch_size = batch_size
+        self.recorded_at = timezone.now()
+        self.products = {}
+        self.options = {}
+        self.pk_codes = {}
+        self.product_ids = {}
+        self.scopes = set()
+        self.counts = {'products': 0, 'options': {'inserted': 0, 'updated': 0, 'unchanged': 0}}
+
+    def add(self, record):
+        if 'model' not in record:
+            # ndjson: 상품 하나 + 중첩 옵션
+            record = dict(record)
+            options = record.pop('options', None) or []
+            self._add_product(product_row(record))
+            for option_data in options:
+                self._add_option(option_row({**option_data, 'fin_prdt_cd': record['fin_prdt_cd']}))
+        elif record['model'] == PRODUCT_MODEL:
+            row = product_row(record['fields'])
+            self.pk_codes[record.get('pk')] = row['fin_prdt_cd']
+            self._add_product(row)
+        elif record['model'] == OPTION_MODEL:
+            fields = record['fields']
+            try:
+                code = self.pk_codes[fields['product']]
+            except KeyError:
+                raise ValueError(f"옵션 pk={record.get('pk')} 이 fixture 에 없는 상품 pk={fields['product']} 를 참조합니다.")
+            self._add_option(option_row({**fields, 'fin_prdt_cd': code}))
+        else:
+            raise ValueError(f"지원하지 않는 모델입니다: {record['model']}")
+
+    def _add_product(self, row):
+        # 옵션을 다 읽기 전이라 내용 해시를 알 수 없으므로 비워 둡니다. (다음 동기화 때 다시 계산)
+        row['content_hash'] = ''
+        self.products[row['fin_prdt_cd']] = row
+        if len(self.products) >= self.batch_size:
+            self._flush_products()
+
+    def _add_option(self, row):
+        self.options[(row['fin_prdt_cd'], row['save_trm'])] = row
+        if len(self.options) >= self.batch_size:
+            self._flush_options()
+
+    def _flush_products(self):
+        if not self.products:
+            return
+        # 동기화와 같은 경로로 기록하므로 추가 / 변경된 상품은 카탈로그 변경 기록에도 남습니다.
+        # 해시가 비어 있어 비교할 수 없으므로 모든 상품을 다시 씁니다.
+        counts, product_ids, _ = _upsert_products(self.products, self.batch_size, self.recorded_at, compare_hash=False)
+        self.product_ids.update(product_ids)
+        self.counts['products'] += counts['inserted'] + counts['updated'] + counts['unchanged']
+        self.products = {}
+
+    def _flush_options(self):
+        if not self.options:
+            return
+        # 옵션이 참조하는 상품이 먼저 기록되어 있어야 합니다.
+        self._flush_products()
+        # 한 상품의 옵션이 여러 배치로 나뉘어 올 수 있으므로, 배치에 없는 기존 옵션을 지우지 않습니다.
+        counts, scopes = _upsert_options(
+            self.options, self.product_ids, {code for code, _ in self.options}, self.batch_size, self.recorded_at,
+            remove_missing=False,
+        )
+        for key, value in counts.items():
+            self.counts['options'][key] += value
+        self.scopes |= scopes
+        self.options = {}
+
+    def finish(self):
+        self._flush_products()
+        self._flush_options()
+        if self.counts['products'] or self.counts['options']['inserted'] or self.counts['options']['updated']:
+            refresh_leaderboards(self.scopes)
+            bump_catalog_version()
+        return self.counts
+
+
+def load_fixture(fp, fmt='json', batch_size=CHUNK_SIZE):
+    """
+    fixture 파일을 한 트랜잭션으로 적재하고 {'products': 기록한 상품 수, 'options': {...}} 를 돌려줍니다.
+    금리 순위표 / 검색 색인 / 금리 변경 이력 / 카탈로그 버전도 동기화와 같은 규칙으로 갱신합니다.
+    """
+    with transaction.atomic():
+        loader = FixtureLoader(batch_size)
+        for record in iter_records(fp, fmt):
+            loader.add(record)
+        return loader.finish()
+
+
+# ----------------------------------------------------
+# 2. 쓰기
+# ----------------------------------------------------
+FIXTURE_PRODUCT_FIELDS = ('fin_prdt_cd', *PRODUCT_FIELDS)
+FIXTURE_OPTION_FIELDS = ('save_trm', *OPTION_FIELDS)
+
+
+def _dump_json(out, batch_size):
+    # dumpdata --indent 4 와 같은 모양으로 씁니다. (loaddata 로도 읽을 수 있습니다)
+    first = True
+    sources = (
+        (PRODUCT_MODEL, DepositProducts.objects.all(), FIXTURE_PRODUCT_FIELDS),
+        (OPTION_MODEL, DepositOptions.objects.all(), ('product_id', *FIXTURE_OPTION_FIELDS)),
+    )
+    out.write('[\n')
+    for model, queryset, fields in sources:
+        names = ['product' if field == 'product_id' else field for field in fields]
+        for rows in iter_by_id(queryset, fields, batch_size):
+            for pk, *values in rows:
+                record = {'model': model, 'pk': pk, 'fields': dict(zip(names, values))}
+                out.write(('' if first else ',\n') + json.dumps(record, ensure_ascii=False, indent=4))
+                first = False
+    out.write('\n]\n')
+
+
+def _dump_ndjson(out, batch_size):
+    for rows in iter_by_id(DepositProducts.objects.all(), FIXTURE_PRODUCT_FIELDS, batch_size):
+        options = {}
+        option_rows = (
+            DepositOptions.objects
+            .filter(product_id__in=[row[0] for row in rows])
+            .order_by('product_id', 'id')
+            .values_list('product_id', *FIXTURE_OPTION_FIELDS)
+        )
+        for product_id, *values in option_rows:
+            options.setdefault(product_id, []).append(dict(zip(FIXTURE_OPTION_FIELDS, values)))
+        for pk, *values in rows:
+            record = dict(zip(FIXTURE_PRODUCT_FIELDS, values))
+            record['options'] = options.get(pk, [])
+            out.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def dump_fixture(out, fmt='json', batch_size=CHUNK_SIZE):
+    """현재 카탈로그를 텍스트 파일 객체 out 에 씁니다."""
+    if fmt == 'ndjson':
+        _dump_ndjson(out, batch_size)
+    else:
+        _dump_json(out, batch_size)
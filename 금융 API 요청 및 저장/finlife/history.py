@@ -0,0 +1,81 @@
+# finlife/history.py
+# 금리 변경 이력(RateHistory) 조회입니다.
+# 이력은 금리가 바뀔 때만 한 행씩 쌓이므로(변경분 인코딩), 어떤 시점의 금리는 "그 시점 이전의 마지막 행"이고
+# 기간 안에 금리가 움직인 옵션은 "기간 안에 행이 있는 옵션"뿐입니다.
+
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Abs
+
+from .models import DepositOptions, RateHistory
+
+RATE_FIELDS = ('intr_rate', 'intr_rate2')
+
+
+def rate_series(product, save_trm=None, since=None, until=None):
+    """
+    상품의 기간(save_trm)별 금리 시계열을 돌려줍니다.
+    [{'save_trm': 12, 'points': [{'recorded_at', 'intr_rate', 'intr_rate2'}, ...]}, ...]
+
+    since 를 주면 그 시점에 유효했던 금리(직전 행)를 첫 점으로 포함합니다.
+    """
+    history = RateHistory.objects.filter(product=product)
+    if save_trm is not None:
+        history = history.filter(save_trm=save_trm)
+
+    series = {}
+    if since is not None:
+        # 기간(save_trm)마다 since 직전 행 하나 ((product, save_trm, recorded_at) 인덱스를 거꾸로 탐색)
+        for trm in history.values_list('save_trm', flat=True).distinct():
+            previous = (
+                history.filter(save_trm=trm, recorded_at__lte=since)
+                .order_by('-recorded_at', '-id')
+                .values('save_trm', 'recorded_at', *RATE_FIELDS)
+                .first()
+            )
+            if previous is not None:
+                series[trm] = [previous]
+        history = history.filter(recorded_at__gt=since)
+    if until is not None:
+        history = history.filter(recorded_at__lte=until)
+
+    for row in history.order_by('save_trm', 'recorded_at', 'id').values('save_trm', 'recorded_at', *RATE_FIELDS):
+        series.setdefault(row['save_trm'], []).append(row)
+
+    return [
+        {
+            'save_trm': trm,
+            'points': [{key: point[key] for key in ('recorded_at', *RATE_FIELDS)} for point in points],
+        }
+        for trm, points in sorted(series.items())
+    ]
+
+
+def biggest_movers(since, n=10, field='intr_rate2', save_trm=None):
+    """
+    since 이후 금리(field)가 가장 크게 변한 옵션 n개를 변동폭 절댓값이 큰 순서로 돌려줍니다.
+    각 옵션에는 since 시점의 금리(previous_rate)와 변동폭(change)이 붙습니다.
+
+    since 이후에 새로 생긴 옵션은 비교할 이전 금리가 없으므로 제외합니다.
+    """
+    if field not in RATE_FIELDS:
+        raise ValueError(f'field 는 {RATE_FIELDS} 중 하나여야 합니다.')
+
+    # 기간 안에 변경 행이 있는 옵션만 후보가 됩니다.
+    # 옵션마다 이력을 확인하지 않고, 기간 안의 이력 행(recorded_at 인덱스 범위)에서 시작해 옵션으로 조인합니다.
+    moved = RateHistory.objects.filter(recorded_at__gt=since)
+    if save_trm is not None:
+        moved = moved.filter(save_trm=save_trm)
+    moved_options = moved.filter(product__options__save_trm=F('save_trm')).values('product__options')
+    options = DepositOptions.objects.filter(id__in=moved_options)
+
+    series = RateHistory.objects.filter(product=OuterRef('product'), save_trm=OuterRef('save_trm'))
+    previous_rate = series.filter(recorded_at__lte=since).order_by('-recorded_at', '-id').values(field)[:1]
+    return list(
+        options
+        .annotate(previous_rate=Subquery(previous_rate))
+        .filter(previous_rate__isnull=False)
+        .annotate(change=F(field) - F('previous_rate'))
+        .exclude(change=0)
+        .select_related('product')
+        .order_by(Abs('change').desc(), 'id')[:n]
+    )
@@ -0,0 +1,457 @@
+# finlife/ingest.py
+# 금융감독원 API 응답(baseList / optionList)을 DB에 반영하는 적재 엔진입니다.
+# 행마다 update_or_create 를 호출하던 기존 방식 대신, 전체 응답을 메모리에 스테이징한 뒤
+# 하나의 트랜잭션 안에서 청크 단위 bulk upsert 로 기록합니다.
+# 페이지 단위로 흘러 들어오는 응답은 ingest_pages 가 고정 크기 배치로 나눠 같은 엔진에 넘깁니다.
+# (async 수집에서는 aingest_pages 가 같은 배치를 DB 스레드로 넘깁니다)
+# 바뀐 상품 / 옵션은 같은 트랜잭션 안에서 카탈로그 변경 기록(CatalogChange)에도 남깁니다. (finlife/changes.py)
+
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import bump_catalog_version
+from .leaderboard import refresh_leaderboards, scopes_for
+from .models import CatalogChange, DepositProducts, DepositOptions, RateHistory
+from .search import index_products
+
+# SQLite 의 바인딩 변수 제한(기본 999~32766)을 넘지 않도록 한 번에 처리할 행 수
+CHUNK_SIZE = 500
+
+PRODUCT_FIELDS = (
+    'kor_co_nm', 'fin_prdt_nm', 'join_way', 'join_member',
+    'join_deny', 'max_limit', 'etc_note', 'spcl_cnd',
+)
+OPTION_FIELDS = (
+    'intr_rate', 'intr_rate2', 'intr_rate_type', 'intr_rate_type_nm',
+)
+UPSERT_PRODUCT_FIELDS = ('fin_prdt_cd', *PRODUCT_FIELDS, 'content_hash')
+# 이 필드가 바뀔 때만 금리 변경 이력(RateHistory)을 남깁니다.
+HISTORY_FIELDS = ('intr_rate', 'intr_rate2')
+CHANGE_FIELDS = ('kind', 'fin_prdt_cd', 'save_trm', 'changes', 'recorded_at')
+# 상품 추가 / 삭제 변경 기록에 담는 필드
+CHANGE_SUMMARY_FIELDS = ('kor_co_nm', 'fin_prdt_nm')
+# remove_missing_products 가 이번 응답의 상품 코드를 담아 두는 임시 테이블
+SEEN_CODES_TABLE = 'finlife_seen_codes'
+
+
+def _bulk_write(model, fields, rows, unique_fields=()):
+    """
+    값 튜플 rows 를 executemany 한 번으로 INSERT 합니다.
+    unique_fields 를 주면 충돌한 행은 나머지 필드로 갱신합니다. (INSERT ... ON CONFLICT DO UPDATE)
+
+    bulk_create 는 행마다 모델 객체를 만들고 값마다 필드 변환을 거쳐 SQL 을 조립하는데,
+    적재할 값은 이미 DB 타입으로 정리되어 있으므로 그 과정을 건너뜁니다.
+    """
+    if not rows:
+        return
+    quote = connection.ops.quote_name
+    columns = [model._meta.get_field(field).column for field in fields]
+    sql = (
+        f"INSERT INTO {quote(model._meta.db_table)} ({', '.join(map(quote, columns))}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+    if unique_fields:
+        conflict = [model._meta.get_field(field).column for field in unique_fields]
+        sql += (
+            f" ON CONFLICT ({', '.join(map(quote, conflict))}) DO UPDATE SET "
+            + ', '.join(f'{quote(column)} = excluded.{quote(column)}' for column in columns if column not in conflict)
+        )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _empty_counts():
+    return {'inserted': 0, 'updated': 0, 'unchanged': 0}
+
+
+def _change(kind, fin_prdt_cd, save_trm, old, new, fields, recorded_at):
+    """CatalogChange 한 행의 값 튜플. old / new 중 한쪽이 None 이면 추가 / 삭제입니다."""
+    changes = {
+        field: [None if old is None else old[field], None if new is None else new[field]]
+        for field in fields
+        if old is None or new is None or old[field] != new[field]
+    }
+    encoded = json.dumps(changes, ensure_ascii=False, separators=(',', ':'))
+    return (kind, fin_prdt_cd, save_trm, encoded, recorded_at)
+
+
+def content_hash(product, options):
+    """상품 필드와 (save_trm 순으로 정렬한) 옵션 필드를 묶어 안정적인 해시를 만듭니다."""
+    material = [
+        [product[field] for field in PRODUCT_FIELDS],
+        sorted([option['save_trm']] + [option[field] for field in OPTION_FIELDS] for option in options),
+    ]
+    encoded = json.dumps(material, ensure_ascii=False, separators=(',', ':')).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+# ----------------------------------------------------
+# 1. API 응답 → 저장용 dict 변환
+# ----------------------------------------------------
+def product_row(product_data):
+    # 기존 save_deposit_products 뷰와 동일한 기본값 규칙을 사용합니다.
+    return {
+        'fin_prdt_cd': product_data['fin_prdt_cd'],
+        'kor_co_nm': product_data['kor_co_nm'],
+        'fin_prdt_nm': product_data['fin_prdt_nm'],
+        'join_way': product_data.get('join_way') or '',
+        'join_member': product_data.get('join_member') or '',
+        'join_deny': int(product_data.get('join_deny') or 1),
+        'max_limit': product_data.get('max_limit'),
+        'etc_note': product_data.get('etc_note') or '',
+        'spcl_cnd': product_data.get('spcl_cnd') or '',
+    }
+
+
+def option_row(option_data):
+    # intr_rate, intr_rate2가 None일 경우 -1로 처리 (요구사항 F01 반영)
+    intr_rate = option_data.get('intr_rate')
+    intr_rate2 = option_data.get('intr_rate2')
+    return {
+        'fin_prdt_cd': option_data['fin_prdt_cd'],
+        'save_trm': int(option_data['save_trm']),
+        'intr_rate': float(intr_rate) if intr_rate is not None else -1,
+        'intr_rate2': float(intr_rate2) if intr_rate2 is not None else -1,
+        'intr_rate_type': option_data['intr_rate_type'],
+        'intr_rate_type_nm': option_data['intr_rate_type_nm'],
+    }
+
+
+# ----------------------------------------------------
+# 2. 스테이징: 중복 제거 및 키 기준 정리
+# ----------------------------------------------------
+def stage_payload(product_list, options_list):
+    """
+    API 응답 목록을 키 기준 dict 로 정리합니다. 같은 키가 여러 번 오면 마지막 값이 이깁니다.
+
+    각 상품 row 에는 옵션까지 포함한 content_hash 가 채워집니다.
+    """
+    products = {}
+    for product_data in product_list or []:
+        row = product_row(product_data)
+        products[row['fin_prdt_cd']] = row
+
+    options = {}
+    for option_data in options_list or []:
+        row = option_row(option_data)
+        # 상품 정보가 없는 옵션은 외래키를 연결할 수 없으므로 버립니다.
+        if row['fin_prdt_cd'] in products:
+            options[(row['fin_prdt_cd'], row['save_trm'])] = row
+
+    options_by_product = {}
+    for (code, _), row in options.items():
+        options_by_product.setdefault(code, []).append(row)
+    for code, row in products.items():
+        row['content_hash'] = content_hash(row, options_by_product.get(code, []))
+    return products, options
+
+
+# ----------------------------------------------------
+# 3. bulk upsert
+# ----------------------------------------------------
+def _upsert_products(products, chunk_size, recorded_at, compare_hash=True):
+    """
+    상품을 upsert 하고 (건수, {fin_prdt_cd: id}, 내용이 바뀐 상품 코드 집합) 을 돌려줍니다.
+    추가되거나 상품 필드가 바뀐 상품은 카탈로그 변경 기록에 남깁니다.
+
+    저장된 content_hash 가 같은 상품은 옵션까지 포함해 변경이 없으므로 통째로 건너뜁니다.
+    compare_hash=False 이면 (옵션을 모르는 fixture 적재) 해시를 비교하지 않고 모든 상품을 다시 씁니다.
+    """
+    counts = _empty_counts()
+    counts['skipped'] = 0
+    codes = list(products)
+    product_ids = {}
+    changed_codes = set()
+    recorded_at = connection.ops.adapt_datetimefield_value(recorded_at)
+
+    for chunk in _chunks(codes, chunk_size):
+        existing = {
+            row['fin_prdt_cd']: row
+            for row in DepositProducts.objects.filter(fin_prdt_cd__in=chunk)
+                                              .values('id', 'fin_prdt_cd', 'content_hash', *PRODUCT_FIELDS)
+        }
+        to_write = []
+        changes = []
+        for code in chunk:
+            row = products[code]
+            current = existing.get(code)
+            if compare_hash and current is not None and current['content_hash'] == row['content_hash']:
+                counts['unchanged'] += 1
+                counts['skipped'] += 1
+                product_ids[code] = current['id']
+                continue
+
+            changed_codes.add(code)
+            if current is None:
+                counts['inserted'] += 1
+                changes.append(_change('product_added', code, None, None, row, CHANGE_SUMMARY_FIELDS, recorded_at))
+            elif all(current[field] == row[field] for field in PRODUCT_FIELDS):
+                # 상품 필드는 같고 옵션만 바뀐 경우에도 해시를 갱신하기 위해 다시 씁니다.
+                counts['unchanged'] += 1
+            else:
+                counts['updated'] += 1
+                changes.append(_change('product_updated', code, None, current, row, PRODUCT_FIELDS, recorded_at))
+            to_write.append(row)
+
+        if to_write:
+            _bulk_write(
+                DepositProducts, UPSERT_PRODUCT_FIELDS,
+                [tuple(row[field] for field in UPSERT_PRODUCT_FIELDS) for row in to_write],
+                unique_fields=['fin_prdt_cd'],
+            )
+            # upsert 는 pk 를 돌려주지 않으므로 청크 단위로 한 번 더 조회합니다.
+            written = dict(
+                DepositProducts.objects.filter(fin_prdt_cd__in=[row['fin_prdt_cd'] for row in to_write])
+                                       .values_list('fin_prdt_cd', 'id')
+            )
+            product_ids.update(written)
+            # 다시 쓴 상품만 검색 색인을 갱신합니다.
+            index_products(written.values())
+        _bulk_write(CatalogChange, CHANGE_FIELDS, changes)
+    return counts, product_ids, changed_codes
+
+
+def _upsert_options(options, product_ids, changed_codes, chunk_size, recorded_at, remove_missing=True):
+    """
+    옵션을 upsert 하고 (건수, 영향을 받은 금리 순위표 집합) 을 돌려줍니다.
+    금리가 새로 생기거나 바뀐 옵션은 recorded_at 시각으로 금리 변경 이력에 추가하고,
+    추가되거나 바뀐 옵션은 카탈로그 변경 기록에 남깁니다.
+
+    remove_missing 이 True 이면 changed_codes 상품의 기존 옵션 중 options 에 없는 옵션(응답에서 사라진 저축 기간)을
+    삭제하고 option_removed 로 남깁니다. options 에 그 상품들의 옵션이 모두 들어 있을 때만 켜야 합니다.
+    """
+    counts = _empty_counts()
+    if remove_missing:
+        counts['removed'] = 0
+    scopes = set()
+    recorded_at = connection.ops.adapt_datetimefield_value(recorded_at)
+    keys_by_code = {}
+    for key in options:
+        if key[0] in changed_codes:
+            keys_by_code.setdefault(key[0], []).append(key)
+    # 내용 해시가 같은 상품의 옵션은 비교할 필요도 없이 변경 없음으로 셉니다.
+    counts['unchanged'] = len(options) - sum(map(len, keys_by_code.values()))
+    # 옵션이 모두 사라진 상품에도 삭제할 옵션이 있으므로, 삭제할 때는 바뀐 상품을 모두 봅니다.
+    codes = [code for code in product_ids if code in changed_codes] if remove_missing else list(keys_by_code)
+
+    for chunk in _chunks(codes, chunk_size):
+        existing = {
+            (row['product_id'], row['save_trm']): row
+            for row in DepositOptions.objects.filter(product_id__in=[product_ids[code] for code in chunk])
+                                             .values('id', 'product_id', 'save_trm', *OPTION_FIELDS)
+        }
+        to_write = []
+        history = []
+        changes = []
+        for code in chunk:
+            product_id = product_ids[code]
+            for key in keys_by_code.get(code, ()):
+                save_trm = key[1]
+                row = options[key]
+                current = existing.pop((product_id, save_trm), None)
+                if current is None:
+                    counts['inserted'] += 1
+                    kind = 'option_added'
+                elif all(current[field] == row[field] for field in OPTION_FIELDS):
+                    counts['unchanged'] += 1
+                    continue
+                else:
+                    counts['updated'] += 1
+                    kind = 'option_updated'
+                    # 금리 유형이 바뀐 경우 이전 유형의 순위표에서도 빠져야 합니다.
+                    scopes |= scopes_for(save_trm, current['intr_rate_type'])
+                scopes |= scopes_for(save_trm, row['intr_rate_type'])
+                if current is None or any(current[field] != row[field] for field in HISTORY_FIELDS):
+                    history.append((product_id, save_trm, *(row[field] for field in HISTORY_FIELDS), recorded_at))
+                    if current is not None:
+                        kind = 'rate_changed'
+                to_write.append((product_id, save_trm, *(row[field] for field in OPTION_FIELDS)))
+                changes.append(_change(kind, code, save_trm, current, row, OPTION_FIELDS, recorded_at))
+
+        if remove_missing and existing:
+            # 짝이 맞지 않고 남은 기존 옵션은 이번 응답에서 사라진 옵션입니다. (순위표 항목은 CASCADE 로 함께 삭제)
+            codes_by_id = {product_ids[code]: code for code in chunk}
+            for (product_id, save_trm), current in existing.items():
+                counts['removed'] += 1
+                scopes |= scopes_for(save_trm, current['intr_rate_type'])
+                changes.append(_change(
+                    'option_removed', codes_by_id[product_id], save_trm, current, None, OPTION_FIELDS, recorded_at,
+                ))
+            DepositOptions.objects.filter(id__in=[current['id'] for current in existing.values()]).delete()
+        _bulk_write(DepositOptions, ('product', 'save_trm', *OPTION_FIELDS), to_write, unique_fields=['product', 'save_trm'])
+        _bulk_write(RateHistory, ('product', 'save_trm', *HISTORY_FIELDS, 'recorded_at'), history)
+        _bulk_write(CatalogChange, CHANGE_FIELDS, changes)
+    return counts, scopes
+
+
+def ingest_deposit_products(product_list, options_list, chunk_size=CHUNK_SIZE):
+    """
+    API 응답을 한 트랜잭션 안에서 청크 단위로 upsert 합니다.
+
+    상품은 fin_prdt_cd, 옵션은 (product, save_trm) 을 키로 사용하며,
+    반환값은 {'products': {...}, 'options': {...}} 형태의 inserted / updated / unchanged 건수입니다.
+    products 의 skipped 는 내용 해시가 같아 옵션 비교까지 건너뛴 상품 수, options 의 removed 는
+    바뀐 상품에서 응답에 없어 삭제한 옵션 수입니다. (상품의 옵션은 모두 같은 호출로 들어와야 합니다)
+    """
+    products, options = stage_payload(product_list, options_list)
+    recorded_at = timezone.now()
+
+    with transaction.atomic():
+        product_counts, product_ids, changed_codes = _upsert_products(products, chunk_size, recorded_at)
+        option_counts, scopes = _upsert_options(options, product_ids, changed_codes, chunk_size, recorded_at)
+        # 바뀐 옵션이 속한 금리 순위표만 다시 계산합니다.
+        refresh_leaderboards(scopes)
+        # 실제로 바뀐 행이 있을 때만 카탈로그 버전을 올려 읽기 API 캐시를 무효화합니다.
+        if any(counts['inserted'] or counts['updated'] or counts.get('removed') for counts in (product_counts, option_counts)):
+            bump_catalog_version()
+
+    return {'products': product_counts, 'options': option_counts}
+
+
+def remove_missing_products(seen_codes, chunk_size=CHUNK_SIZE):
+    """
+    seen_codes(이번 동기화 응답의 상품 코드)에 없는 상품을 한 트랜잭션으로 삭제하고 삭제한 상품 수를 돌려줍니다.
+
+    옵션 / 금리 변경 이력 / 순위표 항목도 함께 삭제되고, 삭제한 상품은 카탈로그 변경 기록에
+    product_removed 로 남습니다. 수집이 끝까지 성공한 동기화 뒤에만 호출해야 합니다.
+
+    seen_codes 는 임시 테이블에 적재한 뒤 SQL 안티 조인(NOT EXISTS)으로 삭제할 상품만 id 순으로 chunk_size 개씩 읽으므로,
+    카탈로그 전체를 파이썬으로 읽지 않습니다.
+    """
+    recorded_at = connection.ops.adapt_datetimefield_value(timezone.now())
+    quote = connection.ops.quote_name
+    fields = ('id', 'fin_prdt_cd', *CHANGE_SUMMARY_FIELDS)
+    columns = [DepositProducts._meta.get_field(field).column for field in fields]
+    code_column = quote(DepositProducts._meta.get_field('fin_prdt_cd').column)
+    select_missing = (
+        f"SELECT {', '.join(f'p.{quote(column)}' for column in columns)} "
+        f"FROM {quote(DepositProducts._meta.db_table)} p "
+        f"WHERE p.{quote(columns[0])} > %s "
+        f"AND NOT EXISTS (SELECT 1 FROM {SEEN_CODES_TABLE} s WHERE s.fin_prdt_cd = p.{code_column}) "
+        f"ORDER BY p.{quote(columns[0])} LIMIT %s"
+    )
+    removed = 0
+    scopes = set()
+    with transaction.atomic(), connection.cursor() as cursor:
+        # 임시 테이블은 이 연결에만 보이고, 트랜잭션이 롤백되면 만든 것도 함께 취소됩니다.
+        cursor.execute(f'CREATE TEMPORARY TABLE {SEEN_CODES_TABLE} (fin_prdt_cd VARCHAR(200) PRIMARY KEY)')
+        cursor.executemany(f'INSERT INTO {SEEN_CODES_TABLE} (fin_prdt_cd) VALUES (%s)', [(code,) for code in seen_codes])
+        last_id = 0
+        while True:
+            cursor.execute(select_missing, [last_id, chunk_size])
+            missing = [dict(zip(fields, row)) for row in cursor.fetchall()]
+            if not missing:
+                break
+            chunk = [row['id'] for row in missing]
+            options = DepositOptions.objects.filter(product_id__in=chunk).values_list('save_trm', 'intr_rate_type')
+            for save_trm, intr_rate_type in options.distinct():
+                scopes |= scopes_for(save_trm, intr_rate_type)
+            DepositProducts.objects.filter(id__in=chunk).delete()
+            # 삭제한 상품은 다시 색인되지 않으므로 색인에서 빠집니다.
+            index_products(chunk)
+            _bulk_write(CatalogChange, CHANGE_FIELDS, [
+                _change('product_removed', row['fin_prdt_cd'], None, row, None, CHANGE_SUMMARY_FIELDS, recorded_at)
+                for row in missing
+            ])
+            removed += len(missing)
+            last_id = chunk[-1]
+        cursor.execute(f'DROP TABLE {SEEN_CODES_TABLE}')
+        if removed:
+            refresh_leaderboards(scopes)
+            bump_catalog_version()
+    return removed
+
+
+def _add_counts(totals, counts):
+    for table, table_counts in counts.items():
+        for key, value in table_counts.items():
+            totals[table][key] = totals[table].get(key, 0) + value
+
+
+class _PageBatcher:
+    """
+    페이지 result 를 받아 상품 batch_size 개 단위의 (상품 목록, 옵션 목록) 배치로 자릅니다.
+
+    상품의 옵션은 같은 페이지의 optionList 에 들어 있으므로, 페이지를 다 읽은 뒤에 배치를 자릅니다.
+    메모리에는 아직 기록하지 않은 배치와 현재 페이지만 남습니다.
+    """
+
+    def __init__(self, batch_size, seen=None):
+        self.batch_size = batch_size
+        self.seen = seen
+        self.products = []
+        self.options = {}
+
+    def _take(self, batch):
+        batch_options = []
+        for product_data in batch:
+            batch_options.extend(self.options.pop(product_data['fin_prdt_cd'], ()))
+        return batch, batch_options
+
+    def add(self, page):
+        """페이지를 넣고, 기록할 준비가 된 배치 목록을 돌려줍니다."""
+        self.products.extend(page.get('baseList') or [])
+        if self.seen is not None:
+            self.seen.update(product_data['fin_prdt_cd'] for product_data in page.get('baseList') or [])
+        for option_data in page.get('optionList') or []:
+            self.options.setdefault(option_data['fin_prdt_cd'], []).append(option_data)
+        batches = []
+        while len(self.products) >= self.batch_size:
+            batches.append(self._take(self.products[:self.batch_size]))
+            del self.products[:self.batch_size]
+        # 대기 중인 상품이 없는 옵션은 외래키를 연결할 수 없으므로 버립니다.
+        pending = {product_data['fin_prdt_cd'] for product_data in self.products}
+        for code in [code for code in self.options if code not in pending]:
+            del self.options[code]
+        return batches
+
+    def finish(self):
+        """남은 상품을 마지막 배치로 돌려줍니다."""
+        if not self.products:
+            return []
+        batch, self.products = self.products, []
+        return [self._take(batch)]
+
+
+def ingest_pages(pages, batch_size=CHUNK_SIZE, seen=None):
+    """
+    페이지 result 를 하나씩 받아 상품 batch_size 개 단위로 ingest_deposit_products 에 넘깁니다.
+
+    배치마다 별도의 트랜잭션으로 기록하므로 쓰기 잠금을 오래 잡지 않습니다.
+    seen 에 set 을 넘기면 응답에 나온 상품 코드를 모읍니다. (remove_missing_products 용)
+    """
+    totals = {'products': {}, 'options': {}}
+    batcher = _PageBatcher(batch_size, seen)
+    for page in pages:
+        for batch, batch_options in batcher.add(page):
+            _add_counts(totals, ingest_deposit_products(batch, batch_options, chunk_size=batch_size))
+    for batch, batch_options in batcher.finish():
+        _add_counts(totals, ingest_deposit_products(batch, batch_options, chunk_size=batch_size))
+    return totals
+
+
+async def aingest_pages(pages, batch_size=CHUNK_SIZE, seen=None):
+    """
+    ingest_pages 의 async 버전입니다. pages 는 async iterable 입니다.
+
+    배치 기록(트랜잭션 하나)은 sync_to_async 로 DB 스레드에서 실행하고,
+    그동안 이벤트 루프는 다음 페이지 수신과 다른 요청 처리를 계속합니다.
+    """
+    totals = {'products': {}, 'options': {}}
+    batcher = _PageBatcher(batch_size, seen)
+    write = sync_to_async(ingest_deposit_products)
+    async for page in pages:
+        for batch, batch_options in batcher.add(page):
+            _add_counts(totals, await write(batch, batch_options, chunk_size=batch_size))
+    for batch, batch_options in batcher.finish():
+        _add_counts(totals, await write(batch, batch_options, chunk_size=batch_size))
+    return totals
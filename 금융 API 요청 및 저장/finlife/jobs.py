@@ -0,0 +1,161 @@
+# finlife/jobs.py
+# 동기화를 요청 처리 경로 밖에서 실행하기 위한 작업 큐입니다.
+# 작업 상태는 SyncRun 테이블에 저장되므로, 웹 프로세스의 백그라운드 스레드와
+# 관리 명령(sync_deposit_products) 어느 쪽이 실행하든 같은 방식으로 진행률을 조회할 수 있습니다.
+# ASGI 프로세스에서는 스레드 대신 이벤트 루프의 task 로 실행합니다. (aenqueue_sync)
+
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .crawler import aiter_deposit_pages, iter_deposit_pages
+from .models import SyncRun
+from .sync import arun_sync, run_sync
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('queued', 'running')
+# 이 시간(초) 동안 heartbeat(대기 중인 작업은 등록 시각)가 갱신되지 않은 작업은 죽은 것으로 봅니다.
+DEFAULT_STALE_SECONDS = 30 * 60
+
+# 동기화는 한 번에 하나씩만 실행되도록 워커 1개짜리 풀을 사용합니다.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='finlife-sync')
+
+
+def run_in_process():
+    # False 로 두면 웹 프로세스는 작업을 등록만 하고, 실행은 관리 명령 워커가 맡습니다.
+    return getattr(settings, 'FINLIFE_SYNC_IN_PROCESS', True)
+
+
+def stale_seconds():
+    return getattr(settings, 'FINLIFE_SYNC_STALE_SECONDS', DEFAULT_STALE_SECONDS)
+
+
+def fail_stale_runs(now=None):
+    """
+    실행하던 프로세스가 죽어 대기 / 진행 중으로 남은 작업을 failed 로 바꾸고, 바꾼 건수를 돌려줍니다.
+
+    진행 중인 작업은 heartbeat_at, 아직 실행되지 않은 작업은 started_at(등록 시각)을 기준으로 합니다.
+    """
+    now = timezone.now() if now is None else now
+    cutoff = now - timedelta(seconds=stale_seconds())
+    stale = SyncRun.objects.filter(status__in=ACTIVE_STATUSES).filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+    )
+    error = f'TimeoutError: {stale_seconds()}초 동안 진행 기록이 없어 중단된 것으로 처리했습니다.'
+    count = stale.update(status='failed', finished_at=now, error=error)
+    if count:
+        logger.warning('marked %d stale finlife sync job(s) as failed', count)
+    return count
+
+
+def enqueue_sync(trigger='api', in_process=None):
+    """
+    동기화 작업을 등록하고 SyncRun 을 돌려줍니다.
+
+    이미 대기 중이거나 진행 중인 작업이 있으면 새로 만들지 않고 그 작업을 돌려줍니다.
+    단, 오래 진행 기록이 없는 작업은 먼저 failed 로 정리하므로 재사용하지 않습니다. (fail_stale_runs)
+    in_process 가 참이면 이 프로세스의 백그라운드 스레드에서 바로 실행합니다. (기본값은 설정을 따름)
+    """
+    with transaction.atomic():
+        fail_stale_runs()
+        active = SyncRun.objects.filter(status__in=ACTIVE_STATUSES).order_by('pk').first()
+        if active is not None:
+            return active
+        sync_run = SyncRun.objects.create(status='queued', trigger=trigger)
+
+    if run_in_process() if in_process is None else in_process:
+        transaction.on_commit(lambda: _executor.submit(_execute_in_background, sync_run.pk))
+    return sync_run
+
+
+def claim(run_id):
+    """queued → running 으로 바꾸는 데 성공한 쪽만 작업을 실행합니다. (중복 실행 방지)"""
+    return SyncRun.objects.filter(pk=run_id, status='queued').update(
+        status='running', heartbeat_at=timezone.now(),
+    ) == 1
+
+
+def execute_sync(run_id, fetch_pages=iter_deposit_pages):
+    """등록된 작업 하나를 실행합니다. 실패는 SyncRun 에 기록되므로 예외를 올리지 않습니다."""
+    if not claim(run_id):
+        return None
+    sync_run = SyncRun.objects.get(pk=run_id)
+    try:
+        return run_sync(fetch_pages=fetch_pages, sync_run=sync_run)
+    except Exception:
+        # 예외 메시지 / traceback 에는 API 키가 든 URL 이 있으므로 요약(SyncRun.error)만 남깁니다.
+        logger.error('finlife sync job #%s failed: %s', run_id, sync_run.error)
+        return sync_run
+
+
+def drain_queue(fetch_pages=iter_deposit_pages):
+    """대기 중인 작업을 등록 순서대로 모두 실행하고, 실행한 SyncRun 목록을 돌려줍니다."""
+    finished = []
+    for run_id in SyncRun.objects.filter(status='queued').order_by('pk').values_list('pk', flat=True):
+        sync_run = execute_sync(run_id, fetch_pages=fetch_pages)
+        if sync_run is not None:
+            finished.append(sync_run)
+    return finished
+
+
+def _execute_in_background(run_id):
+    try:
+        execute_sync(run_id)
+    finally:
+        # 백그라운드 스레드가 연 DB 연결은 직접 닫아야 합니다.
+        connections.close_all()
+
+
+# ----------------------------------------------------
+# async (ASGI) 경로
+# ----------------------------------------------------
+# 실행 중인 task 가 가비지 컬렉션되지 않도록 참조를 잡아 둡니다.
+_background_tasks = set()
+
+
+async def aenqueue_sync(trigger='api', in_process=None):
+    """
+    enqueue_sync 의 async 버전입니다. 작업 등록 규칙(진행 중인 작업이 있으면 재사용)은 같고,
+    이 프로세스에서 실행할 때는 이벤트 루프의 task 로 수집 / 적재를 진행합니다.
+    """
+    sync_run = await sync_to_async(enqueue_sync)(trigger=trigger, in_process=False)
+    if (run_in_process() if in_process is None else in_process) and sync_run.status == 'queued':
+        # 요청의 컨텍스트(요청 전용 DB 스레드 포함)는 응답과 함께 정리되므로 빈 컨텍스트에서 실행합니다.
+        task = asyncio.get_running_loop().create_task(
+            _aexecute_in_background(sync_run.pk), context=contextvars.Context(),
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    return sync_run
+
+
+async def aexecute_sync(run_id, fetch_pages=aiter_deposit_pages):
+    """execute_sync 의 async 버전. 실패는 SyncRun 에 기록되므로 예외를 올리지 않습니다."""
+    claimed = await SyncRun.objects.filter(pk=run_id, status='queued').aupdate(
+        status='running', heartbeat_at=timezone.now(),
+    )
+    if claimed != 1:
+        return None
+    sync_run = await SyncRun.objects.aget(pk=run_id)
+    try:
+        return await arun_sync(fetch_pages=fetch_pages, sync_run=sync_run)
+    except Exception:
+        # 예외 메시지 / traceback 에는 API 키가 든 URL 이 있으므로 요약(SyncRun.error)만 남깁니다.
+        logger.error('finlife sync job #%s failed: %s', run_id, sync_run.error)
+        return sync_run
+
+
+async def _aexecute_in_background(run_id):
+    try:
+        await aexecute_sync(run_id)
+    finally:
+        await sync_to_async(connections.close_all)()
@@ -0,0 +1,86 @@
+# finlife/leaderboard.py
+# 기간(save_trm) / 금리 유형(intr_rate_type)별 최고 우대금리 순위표를 관리합니다.
+# 적재 엔진이 옵션을 바꿀 때마다 영향을 받은 순위표만 인덱스를 타는 쿼리로 다시 계산하고,
+# 조회 API 는 미리 계산된 행을 rank 순으로 N개만 읽습니다. (카탈로그 크기와 무관)
+
+from django.conf import settings
+
+from .models import DepositOptions, RateLeaderboard
+
+# 순위표마다 보관하는 최대 옵션 수
+DEFAULT_LEADERBOARD_SIZE = 50
+
+# "전체"를 나타내는 값
+ALL_TERMS = 0
+ALL_TYPES = ''
+
+
+def leaderboard_size():
+    return getattr(settings, 'FINLIFE_LEADERBOARD_SIZE', DEFAULT_LEADERBOARD_SIZE)
+
+
+def scopes_for(save_trm, intr_rate_type):
+    """옵션 하나가 속하는 순위표 4개: (기간, 유형), (기간, 전체), (전체, 유형), (전체, 전체)"""
+    return {
+        (save_trm, intr_rate_type),
+        (save_trm, ALL_TYPES),
+        (ALL_TERMS, intr_rate_type),
+        (ALL_TERMS, ALL_TYPES),
+    }
+
+
+def all_scopes():
+    scopes = set()
+    for save_trm, intr_rate_type in DepositOptions.objects.values_list('save_trm', 'intr_rate_type').distinct():
+        scopes |= scopes_for(save_trm, intr_rate_type)
+    return scopes
+
+
+def _ranked_options(save_trm, intr_rate_type):
+    # intr_rate2 가 -1 인 옵션은 API 에서 값이 내려오지 않은 경우이므로 순위에서 제외합니다.
+    options = DepositOptions.objects.filter(intr_rate2__gte=0)
+    if save_trm != ALL_TERMS:
+        options = options.filter(save_trm=save_trm)
+    if intr_rate_type != ALL_TYPES:
+        options = options.filter(intr_rate_type=intr_rate_type)
+    return options.order_by('-intr_rate2', 'id').values_list('id', 'intr_rate2')[:leaderboard_size()]
+
+
+def refresh_leaderboards(scopes=None):
+    """
+    주어진 순위표만 다시 계산합니다. scopes 가 None 이거나 순위표가 아직 비어 있으면 전체를 만듭니다.
+
+    적재 트랜잭션 안에서 호출되므로 순위표와 옵션은 항상 같은 시점의 데이터를 가리킵니다.
+    """
+    if scopes is None or not RateLeaderboard.objects.exists():
+        scopes = all_scopes()
+
+    for save_trm, intr_rate_type in scopes:
+        RateLeaderboard.objects.filter(save_trm=save_trm, intr_rate_type=intr_rate_type).delete()
+        RateLeaderboard.objects.bulk_create([
+            RateLeaderboard(
+                save_trm=save_trm, intr_rate_type=intr_rate_type,
+                rank=rank, option_id=option_id, intr_rate2=intr_rate2,
+            )
+            for rank, (option_id, intr_rate2) in enumerate(_ranked_options(save_trm, intr_rate_type), start=1)
+        ])
+
+
+def _leaderboard_entries(save_trm, intr_rate_type, n):
+    n = max(1, min(n, leaderboard_size()))
+    return (
+        RateLeaderboard.objects
+        .filter(save_trm=save_trm, intr_rate_type=intr_rate_type)
+        .order_by('rank')
+        .select_related('option__product')[:n]
+    )
+
+
+def get_leaderboard(save_trm=ALL_TERMS, intr_rate_type=ALL_TYPES, n=10):
+    """순위표 상위 n개 옵션을 (상품과 함께) rank 순으로 돌려줍니다."""
+    return [entry.option for entry in _leaderboard_entries(save_trm, intr_rate_type, n)]
+
+
+async def aget_leaderboard(save_trm=ALL_TERMS, intr_rate_type=ALL_TYPES, n=10):
+    """get_leaderboard 의 async 버전"""
+    return [entry.option async for entry in _leaderboard_entries(save_trm, intr_rate_type, n)]
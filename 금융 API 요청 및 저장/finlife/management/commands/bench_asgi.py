@@ -0,0 +1,191 @@
+# finlife/management/commands/bench_asgi.py
+# WSGI / ASGI 부하 테스트: 같은 데이터로 두 서버를 차례로 띄우고, 많은 동시 클라이언트로 읽기 API 를 요청합니다.
+# (1) 쓰기가 없을 때와 (2) 동기화가 진행 중일 때의 처리량 / 지연 시간을 비교합니다.
+#
+#   python manage.py bench_asgi --products 5000 --clients 64 --seconds 10 --upstream-delay 0.05
+#
+# - wsgi: runserver (요청마다 스레드), 동기 뷰 (/finlife/...), 동기화는 백그라운드 스레드
+# - asgi: uvicorn 워커 1개, async 뷰 (/finlife/async/...), 동기화는 이벤트 루프의 task
+# 서버는 임시 디렉터리의 벤치마크 전용 SQLite 파일(SQLITE_NAME)을 쓰고,
+# 금융감독원 API 대신 이 명령이 띄운 스텁 서버(FINLIFE_API_URL)에서 합성 카탈로그를 내려받습니다.
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from finlife.bench import LatencyStats, StubFinlifeServer, SyntheticPages
+from finlife.crawler import DEFAULT_FIN_GROUPS
+
+MODES = {
+    'wsgi': {
+        'command': lambda port: [sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{port}', '--noreload'],
+        'prefix': '/finlife/',
+    },
+    'asgi': {
+        'command': lambda port: [
+            sys.executable, '-m', 'uvicorn', 'config.asgi:application',
+            '--host', '127.0.0.1', '--port', str(port), '--workers', '1', '--log-level', 'warning',
+        ],
+        'prefix': '/finlife/async/',
+    },
+}
+# 클라이언트가 돌아가며 요청하는 경로 (prefix 뒤에 붙음)
+READ_PATHS = (
+    'deposit-products/?page_size=50',
+    'deposit-product-options/{code}/',
+    'deposit-product-options/?fin_prdt_cd={codes}',
+    'top-rate/?term=12&type=S&n=10',
+)
+FINISHED_STATUSES = ('success', 'failed')
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = 'WSGI(동기 뷰)와 ASGI(async 뷰) 서버의 동시 요청 처리량을 동기화 진행 중 / 아닐 때로 나눠 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=5000)
+        parser.add_argument('--options-per-product', type=int, default=4)
+        parser.add_argument('--clients', type=int, default=64, help='동시 클라이언트(연결) 수')
+        parser.add_argument('--seconds', type=float, default=10, help='기준(쓰기 없음) 구간 측정 시간')
+        parser.add_argument('--upstream-delay', type=float, default=0.05, help='스텁 API 의 페이지당 응답 지연 (초)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--modes', default='wsgi,asgi')
+        parser.add_argument('--with-cache', action='store_true', help='응답 캐시를 거치는 요청으로 측정')
+        parser.add_argument('--output', help='결과 JSON 파일 경로 (생략하면 표준 출력)')
+
+    def handle(self, *args, **options):
+        report = {'meta': {key: options[key] for key in (
+            'products', 'options_per_product', 'clients', 'seconds', 'upstream_delay', 'seed', 'with_cache',
+        )}, 'results': {}}
+
+        for mode in options['modes'].split(','):
+            pages = SyntheticPages(
+                options['products'], options['options_per_product'], groups=DEFAULT_FIN_GROUPS, seed=options['seed'],
+            )
+            with StubFinlifeServer(pages, delay=options['upstream_delay']) as stub, \
+                    tempfile.TemporaryDirectory() as directory:
+                env = {
+                    **os.environ,
+                    'SQLITE_NAME': os.path.join(directory, 'bench.sqlite3'),
+                    'FINLIFE_API_URL': stub.url,
+                    'API_KEY': os.environ.get('API_KEY') or 'bench',
+                }
+                subprocess.run(
+                    [sys.executable, 'manage.py', 'migrate', '--verbosity', '0'], cwd=settings.BASE_DIR, env=env, check=True,
+                )
+                port = _free_port()
+                server = subprocess.Popen(
+                    MODES[mode]['command'](port), cwd=settings.BASE_DIR, env=env,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                )
+                try:
+                    report['results'][mode] = asyncio.run(
+                        self.run_mode(f'http://127.0.0.1:{port}', MODES[mode]['prefix'], stub, options),
+                    )
+                finally:
+                    server.terminate()
+                    server.wait()
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as out:
+                out.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    async def run_mode(self, base_url, prefix, stub, options):
+        limits = httpx.Limits(max_connections=options['clients'], max_keepalive_connections=options['clients'])
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            await self.wait_ready(client, prefix)
+
+            # 1. 초기 적재 (측정하지 않음)
+            await self.sync(client, prefix)
+            products = (await client.get(f'{prefix}deposit-products/?page_size=20')).json()['results']
+            codes = [product['fin_prdt_cd'] for product in products]
+            paths = [
+                prefix + path.format(code=code, codes=','.join(codes[:10]))
+                for code in codes for path in READ_PATHS
+            ]
+
+            # 2. 기준: 쓰기 없이 읽기만
+            baseline = await self.load(client, paths, options, asyncio.sleep(options['seconds']))
+
+            # 3. 다른 seed 의 카탈로그로 동기화하는 동안 읽기
+            stub.pages = SyntheticPages(
+                options['products'], options['options_per_product'], groups=DEFAULT_FIN_GROUPS, seed=options['seed'] + 1,
+            )
+            sync_result = {}
+            during_sync = await self.load(client, paths, options, self.sync(client, prefix, sync_result))
+        return {'baseline': baseline, 'during_sync': during_sync, 'sync': sync_result}
+
+    async def wait_ready(self, client, prefix, timeout=30):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if (await client.get(f'{prefix}top-rate/')).status_code < 500:
+                    return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+            await asyncio.sleep(0.2)
+
+    async def sync(self, client, prefix, result=None):
+        """동기화 작업을 등록하고 끝날 때까지 기다립니다."""
+        started = time.perf_counter()
+        job_id = (await client.post(f'{prefix}save-products/')).json()['job_id']
+        while True:
+            job = (await client.get(f'{prefix}sync-jobs/{job_id}/')).json()
+            if job['status'] in FINISHED_STATUSES:
+                break
+            await asyncio.sleep(0.1)
+        if result is not None:
+            result.update({
+                'status': job['status'],
+                'seconds': round(time.perf_counter() - started, 3),
+                'options_updated': job['options_updated'],
+            })
+
+    async def load(self, client, paths, options, work):
+        """work 가 끝날 때까지 clients 개의 task 로 paths 를 돌아가며 요청하고 통계를 돌려줍니다."""
+        stats = LatencyStats()
+        stop = asyncio.Event()
+        counter = [0]
+
+        async def worker():
+            while not stop.is_set():
+                index = counter[0]
+                counter[0] += 1
+                path = paths[index % len(paths)]
+                if not options['with_cache']:
+                    # 응답 캐시 키가 매번 달라지도록 해서 모든 요청이 DB 를 읽게 합니다.
+                    path += ('&' if '?' in path else '?') + f'_={index}'
+                started = time.perf_counter()
+                try:
+                    ok = (await client.get(path)).status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                stats.add(time.perf_counter() - started, ok)
+
+        started = time.perf_counter()
+        workers = [asyncio.create_task(worker()) for _ in range(options['clients'])]
+        try:
+            await work
+        finally:
+            stop.set()
+            await asyncio.gather(*workers)
+        return stats.summary(time.perf_counter() - started)
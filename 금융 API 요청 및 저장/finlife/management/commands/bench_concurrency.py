@@ -0,0 +1,152 @@
+# finlife/management/commands/bench_concurrency.py
+# 동시성 벤치마크: 읽기 API 처리량을 (1) 쓰기가 없을 때와 (2) 동기화가 같은 DB 에 쓰는 동안 비교합니다.
+#
+#   SQLITE_NAME=/tmp/bench.sqlite3 python manage.py bench_concurrency --products 20000 --readers 4
+#   SQLITE_NAME=/tmp/bench-default.sqlite3 SQLITE_PROFILE=default python manage.py bench_concurrency ...
+#
+# bench_finlife 와 달리 동기화가 실제로 커밋되어야 읽기 스레드가 잠금을 만나므로 DB 에 데이터를 남깁니다.
+# 반드시 SQLITE_NAME 으로 벤치마크 전용 DB 파일을 지정해서 실행하세요. (마이그레이션은 명령이 직접 실행합니다)
+# 읽기 스레드와 동기화 스레드는 한 프로세스에서 돌지만, SQLite 는 쿼리 중 GIL 을 놓으므로 잠금 경합은 그대로 드러납니다.
+
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.test import Client, override_settings
+
+from finlife.bench import LatencyStats, StubFinlifeServer, SyntheticPages
+from finlife.crawler import DEFAULT_FIN_GROUPS, iter_deposit_pages
+from finlife.models import DepositProducts
+from finlife.sync import run_sync
+
+# 읽기 스레드가 돌아가며 요청하는 URL
+READ_URLS = (
+    '/finlife/deposit-products/?page_size=100',
+    '/finlife/deposit-options/?save_trm=12&sort=-intr_rate2&page_size=100',
+    '/finlife/deposit-product-options/{code}/',
+    '/finlife/top-rate/?term=12&type=S&n=10',
+)
+# 응답 캐시를 끄고 매 요청이 DB 를 읽게 합니다. (--with-cache 로 켤 수 있음)
+NO_CACHE = {
+    **settings.CACHES,
+    'finlife': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+def _reader(urls, stop, stats):
+    client = Client()
+    try:
+        index = 0
+        while not stop.is_set():
+            url = urls[index % len(urls)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                ok = client.get(url).status_code < 500
+                locked = False
+            except OperationalError as exc:
+                ok, locked = False, 'locked' in str(exc)
+            stats.add(time.perf_counter() - started, ok, locked)
+    finally:
+        # 스레드마다 열린 DB 연결을 닫습니다.
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = '동기화가 쓰는 동안의 읽기 API 처리량 / 지연 시간 / 잠금 오류를 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=20000)
+        parser.add_argument('--options-per-product', type=int, default=4)
+        parser.add_argument('--readers', type=int, default=4, help='동시에 요청하는 읽기 스레드 수')
+        parser.add_argument('--seconds', type=float, default=10, help='기준(쓰기 없음) 구간 측정 시간')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--with-cache', action='store_true', help='응답 캐시를 켠 채로 측정')
+        parser.add_argument('--force', action='store_true', help='상품이 이미 있는 DB 에서도 실행')
+        parser.add_argument('--output', help='결과 JSON 파일 경로 (생략하면 표준 출력)')
+
+    def handle(self, *args, **options):
+        call_command('migrate', verbosity=0)
+        if DepositProducts.objects.exists() and not options['force']:
+            raise CommandError('DB 에 이미 상품이 있습니다. SQLITE_NAME 으로 벤치마크 전용 DB 를 지정하거나 --force 를 주세요.')
+
+        database = settings.DATABASES['default']
+        report = {
+            'meta': {
+                'profile': settings.SQLITE_PROFILE,
+                'database': str(database['NAME']),
+                'init_command': database.get('OPTIONS', {}).get('init_command'),
+                'conn_max_age': database.get('CONN_MAX_AGE', 0),
+                'read_replica': 'finlife_read' in settings.DATABASES,
+                'products': options['products'],
+                'options_per_product': options['options_per_product'],
+                'readers': options['readers'],
+                'cache': options['with_cache'],
+                'seed': options['seed'],
+            },
+            'results': {},
+        }
+
+        caches = settings.CACHES if options['with_cache'] else NO_CACHE
+        with override_settings(ALLOWED_HOSTS=['testserver'], CACHES=caches):
+            # 1. 초기 적재 (측정하지 않음)
+            self.sync(options, options['seed'])
+            codes = list(DepositProducts.objects.order_by('id').values_list('fin_prdt_cd', flat=True)[:10])
+            urls = [url.format(code=code) for code in codes for url in READ_URLS]
+            connections.close_all()
+
+            # 2. 기준: 쓰기 없이 읽기만
+            report['results']['baseline'] = self.read_while(urls, options['readers'], lambda: time.sleep(options['seconds']))
+
+            # 3. 다른 seed 의 카탈로그로 동기화하는 동안 읽기 (모든 금리가 바뀌어 갱신 / 이력 기록이 일어남)
+            sync_result = {}
+
+            def concurrent_sync():
+                started = time.perf_counter()
+                try:
+                    sync_run = self.sync(options, options['seed'] + 1)
+                    sync_result.update({'status': sync_run.status, 'options_updated': sync_run.options_updated})
+                except OperationalError as exc:
+                    sync_result.update({'status': 'failed', 'error': str(exc)})
+                finally:
+                    sync_result['seconds'] = round(time.perf_counter() - started, 3)
+                    connections.close_all()
+
+            report['results']['during_sync'] = self.read_while(urls, options['readers'], concurrent_sync)
+            report['results']['sync'] = sync_result
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as out:
+                out.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def sync(self, options, seed):
+        pages = SyntheticPages(
+            options['products'], options['options_per_product'], groups=DEFAULT_FIN_GROUPS, seed=seed,
+        )
+        with StubFinlifeServer(pages) as stub:
+            return run_sync(fetch_pages=lambda progress: iter_deposit_pages(
+                url=stub.url, auth='bench', groups=pages.groups, progress=progress,
+            ))
+
+    def read_while(self, urls, readers, work):
+        """work() 가 끝날 때까지 readers 개의 스레드로 읽기 요청을 보내고 통계를 돌려줍니다."""
+        stop = threading.Event()
+        stats = LatencyStats()
+        threads = [threading.Thread(target=_reader, args=(urls, stop, stats)) for _ in range(readers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            work()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        return stats.summary(time.perf_counter() - started)
@@ -0,0 +1,161 @@
+# finlife/management/commands/bench_finlife.py
+# finlife API 벤치마크: 합성 카탈로그를 로컬 스텁 서버로 내려받아 적재한 뒤 주요 읽기 API 를 측정합니다.
+#
+#   python manage.py bench_finlife --products 100000 --options-per-product 10 --output bench.json
+#   python manage.py bench_finlife --snapshot ...   (읽기 API 를 카탈로그 스냅샷으로 답하게 하고 스냅샷 크기 / 생성 시간도 측정)
+#
+# 결과는 JSON 으로 출력되며, 같은 --seed 로 실행하면 같은 데이터로 측정하므로 커밋 간 비교에 쓸 수 있습니다.
+# 모든 작업은 트랜잭션 안에서 실행하고 끝나면 롤백하므로 DB 에는 아무것도 남지 않습니다.
+
+import itertools
+import json
+import platform
+import sqlite3
+import subprocess
+from urllib.parse import quote
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+
+from finlife.bench import StubFinlifeServer, SyntheticPages, measure
+from finlife.cache import get_cache
+from finlife.calculator import clear_columns
+from finlife.crawler import DEFAULT_FIN_GROUPS, iter_deposit_pages
+from finlife.models import DepositProducts, SyncRun
+from finlife.snapshot import CatalogSnapshot, clear_snapshot
+from finlife.sync import run_sync
+
+# (이름, URL) - URL 의 {code} / {codes} 는 적재된 상품 코드로 채웁니다.
+READ_CASES = (
+    ('list_products', '/finlife/deposit-products/?page_size=100'),
+    ('list_products_nested', '/finlife/deposit-products/?page_size=100&nested=1'),
+    ('list_products_filtered', '/finlife/deposit-products/?save_trm=12&min_intr_rate2=3.5&page_size=100'),
+    ('list_options', '/finlife/deposit-options/?save_trm=12&sort=-intr_rate2&page_size=100'),
+    ('product_options', '/finlife/deposit-product-options/{code}/'),
+    ('product_options_batch', '/finlife/deposit-product-options/?fin_prdt_cd={codes}'),
+    ('top_rate', '/finlife/top-rate/'),
+    ('top_rate_term', '/finlife/top-rate/?term=12&type=S&n=10'),
+    ('search', f"/finlife/search/?q={quote('청년 우대')}"),
+    ('calculator', '/finlife/calculator/?amount=10000000&term=12&k=10'),
+)
+
+
+def reset_caches():
+    get_cache().clear()
+    clear_columns()
+    clear_snapshot()
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = '합성 카탈로그로 적재 / 목록 / 옵션 조회 / 최고 금리 API 의 소요 시간과 쿼리 수를 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100000)
+        parser.add_argument('--options-per-product', type=int, default=10, help='상품당 옵션 수 (최대 10)')
+        parser.add_argument('--page-size', type=int, default=100, help='스텁 API 의 페이지당 상품 수')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=5, help='읽기 API 를 몇 번 반복 측정할지')
+        parser.add_argument('--snapshot', action='store_true', help='FINLIFE_SNAPSHOT 을 켜고 측정')
+        parser.add_argument('--output', help='결과 JSON 파일 경로 (생략하면 표준 출력)')
+
+    def handle(self, *args, **options):
+        pages = SyntheticPages(
+            options['products'], options['options_per_product'],
+            groups=DEFAULT_FIN_GROUPS, page_size=options['page_size'], seed=options['seed'],
+        )
+        report = {
+            'meta': {
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'products': options['products'],
+                'options_per_product': pages.options_per_product,
+                'pages': len(pages),
+                'seed': options['seed'],
+                'repeat': options['repeat'],
+                'snapshot': options['snapshot'],
+            },
+            'results': {},
+        }
+
+        # 테스트 클라이언트의 호스트(testserver)를 허용합니다.
+        with override_settings(ALLOWED_HOSTS=['testserver'], FINLIFE_SNAPSHOT=options['snapshot']), transaction.atomic():
+            with StubFinlifeServer(pages) as stub:
+                report['results'].update(self.bench_ingest(stub, pages))
+            if options['snapshot']:
+                report['results']['snapshot_build'] = self.bench_snapshot()
+            report['results'].update(self.bench_reads(options['repeat']))
+            transaction.set_rollback(True)
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as out:
+                out.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def bench_ingest(self, stub, pages):
+        def sync():
+            run_sync(fetch_pages=lambda progress: iter_deposit_pages(
+                url=stub.url, auth='bench', groups=pages.groups, progress=progress,
+            ))
+            return SyncRun.objects.latest('pk')
+
+        results = {}
+        # 빈 DB 에 처음 적재, 그리고 변경 없는 재동기화 (내용 해시로 건너뛰는 경로)
+        for name in ('ingest_initial', 'ingest_unchanged'):
+            result, sync_run = measure(sync, repeat=1)
+            result.update({
+                'status': sync_run.status,
+                'fetch_seconds': round(sync_run.fetch_seconds, 6),
+                'write_seconds': round(sync_run.write_seconds, 6),
+                'products_inserted': sync_run.products_inserted,
+                'products_skipped': sync_run.products_skipped,
+                'options_inserted': sync_run.options_inserted,
+            })
+            results[name] = result
+        return results
+
+    def bench_snapshot(self):
+        result, snapshot = measure(lambda: CatalogSnapshot.load(0), repeat=1)
+        result.update({
+            'bytes': snapshot.nbytes,
+            'products': len(snapshot.products.id),
+            'options': len(snapshot.options.id),
+        })
+        return result
+
+    def bench_reads(self, repeat):
+        client = Client()
+        codes = list(DepositProducts.objects.order_by('id').values_list('fin_prdt_cd', flat=True)[:50])
+        results = {}
+        for name, url in READ_CASES:
+            url = url.format(code=codes[0] if codes else '', codes=','.join(codes))
+            # cold: 응답 캐시 / 스냅샷을 비운 상태, uncached: 응답 캐시만 빗나감 (스냅샷 / 버전 번호는 그대로),
+            # warm: 응답 캐시 적중
+            cold, response = measure(lambda: client.get(url), repeat=repeat, before=reset_caches)
+            bust = itertools.count()
+            separator = '&' if '?' in url else '?'
+            uncached, _ = measure(lambda: client.get(f'{url}{separator}_={next(bust)}'), repeat=repeat)
+            warm, _ = measure(lambda: client.get(url), repeat=repeat)
+            results[name] = {
+                'url': url,
+                'status': response.status_code,
+                'bytes': len(response.content),
+                'cold': cold,
+                'uncached': uncached,
+                'warm': warm,
+            }
+        return results
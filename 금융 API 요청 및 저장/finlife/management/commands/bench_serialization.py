@@ -0,0 +1,89 @@
+# finlife/management/commands/bench_serialization.py
+# 목록 API 직렬화 경로 벤치마크: DRF ModelSerializer vs finlife.fastpath
+#
+#   python manage.py bench_serialization --products 100000 --options 1
+#
+# 합성 상품 / 옵션을 트랜잭션 안에서 만들고, 측정이 끝나면 롤백하므로 DB 에는 아무것도 남지 않습니다.
+
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from finlife.fastpath import dumps, orjson, product_values, serialize_products
+from finlife.models import DepositOptions, DepositProducts
+from finlife.serializers import DepositProductsSerializer, DepositProductsWithOptionsSerializer
+
+TERMS = (6, 12, 24, 36)
+
+
+class Command(BaseCommand):
+    help = '합성 카탈로그로 Serializer 경로와 빠른 직렬화 경로의 속도를 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100000)
+        parser.add_argument('--options', type=int, default=1, help='상품당 옵션 수 (최대 4)')
+        parser.add_argument('--repeat', type=int, default=3, help='각 경로를 몇 번 반복해 최솟값을 취할지')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.populate(options['products'], min(options['options'], len(TERMS)))
+            results = {
+                'products': options['products'],
+                'options_per_product': options['options'],
+                'encoder': 'orjson' if orjson else 'json',
+                'flat': self.compare(False, options['repeat']),
+                'nested': self.compare(True, options['repeat']),
+            }
+            transaction.set_rollback(True)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def populate(self, num_products, options_per_product):
+        DepositProducts.objects.bulk_create([
+            DepositProducts(
+                fin_prdt_cd=f'BENCH{i:07d}', kor_co_nm=f'벤치은행{i % 50}', fin_prdt_nm=f'벤치 정기예금 {i}',
+                join_way='인터넷,스마트폰', join_member='실명의 개인', join_deny=1,
+                etc_note='만기 후 이율은 기본금리의 50%', spcl_cnd='급여이체 시 우대금리 0.2%p',
+            )
+            for i in range(num_products)
+        ], batch_size=2000)
+        product_ids = DepositProducts.objects.filter(fin_prdt_cd__startswith='BENCH').values_list('id', flat=True)
+        DepositOptions.objects.bulk_create([
+            DepositOptions(
+                product_id=product_id, save_trm=term, intr_rate=2.5 + (product_id % 10) / 10,
+                intr_rate2=3.0 + (product_id % 10) / 10, intr_rate_type='S', intr_rate_type_nm='단리',
+            )
+            for product_id in product_ids
+            for term in TERMS[:options_per_product]
+        ], batch_size=2000)
+
+    def timed(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, body
+
+    def compare(self, nested, repeat):
+        serializer_class = DepositProductsWithOptionsSerializer if nested else DepositProductsSerializer
+        queryset = DepositProducts.objects.order_by('id')
+
+        def serializer_path():
+            products = queryset.prefetch_related('options') if nested else queryset
+            return JSONRenderer().render(serializer_class(products, many=True).data)
+
+        def fast_path():
+            return dumps(serialize_products(list(product_values(queryset)), nested=nested))
+
+        serializer_seconds, serializer_body = self.timed(serializer_path, repeat)
+        fast_seconds, fast_body = self.timed(fast_path, repeat)
+        return {
+            'serializer_seconds': round(serializer_seconds, 4),
+            'fast_seconds': round(fast_seconds, 4),
+            'speedup': round(serializer_seconds / fast_seconds, 2),
+            'identical_output': json.loads(serializer_body) == json.loads(fast_body),
+        }
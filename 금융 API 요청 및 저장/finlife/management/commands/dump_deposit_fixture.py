@@ -0,0 +1,34 @@
+# finlife/management/commands/dump_deposit_fixture.py
+# 현재 상품 카탈로그를 fixture 로 스트리밍 덤프합니다. (dumpdata 대체)
+#
+#   python manage.py dump_deposit_fixture finlife/fixtures/deposit_products.json
+#   python manage.py dump_deposit_fixture catalog.ndjson          # 한 줄에 상품 하나 (옵션 중첩)
+#   python manage.py dump_deposit_fixture - --format ndjson | gzip > catalog.ndjson.gz
+
+from django.core.management.base import BaseCommand, CommandError
+
+from finlife.fixtures import FORMATS, dump_fixture, guess_format
+from finlife.ingest import CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = '정기예금 상품 카탈로그를 fixture(json / ndjson)로 덤프합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="출력 파일 경로 ('-' 이면 표준 출력)")
+        parser.add_argument('--format', choices=FORMATS, help='생략하면 확장자로 판단합니다. (.ndjson / .jsonl → ndjson)')
+        parser.add_argument('--batch-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or guess_format(path)
+        if path == '-':
+            # OutputWrapper 가 write 마다 줄바꿈을 붙이지 않도록 합니다.
+            self.stdout.ending = ''
+            dump_fixture(self.stdout, fmt, options['batch_size'])
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as out:
+                dump_fixture(out, fmt, options['batch_size'])
+        except OSError as exc:
+            raise CommandError(f'fixture 를 쓰지 못했습니다: {exc}')
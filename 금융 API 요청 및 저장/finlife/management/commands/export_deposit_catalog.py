@@ -0,0 +1,46 @@
+# finlife/management/commands/export_deposit_catalog.py
+# 상품 카탈로그를 (상품 × 옵션) 평면 표로 내보냅니다. (export/ API 와 같은 내용)
+#
+#   python manage.py export_deposit_catalog catalog.csv
+#   python manage.py export_deposit_catalog catalog.ndjson.gz          # 확장자로 형식 / gzip 판단
+#   python manage.py export_deposit_catalog - --format ndjson > catalog.ndjson
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from finlife.export import EXPORT_BATCH_SIZE, FORMATS, export_chunks
+
+
+def guess_options(path):
+    """파일 이름으로 (형식, gzip 여부) 를 짐작합니다. 예: catalog.ndjson.gz → ('ndjson', True)"""
+    use_gzip = path.endswith('.gz')
+    stem = path[:-len('.gz')] if use_gzip else path
+    return ('ndjson' if stem.endswith(('.ndjson', '.jsonl')) else 'csv'), use_gzip
+
+
+class Command(BaseCommand):
+    help = '정기예금 상품 카탈로그를 상품 × 옵션 평면 표(CSV / NDJSON)로 내보냅니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="출력 파일 경로 ('-' 이면 표준 출력)")
+        parser.add_argument('--format', choices=FORMATS, help='생략하면 확장자로 판단합니다. (.ndjson / .jsonl → ndjson)')
+        parser.add_argument('--gzip', action='store_true', help='gzip 으로 압축 (.gz 확장자면 자동)')
+        parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt, use_gzip = guess_options(path)
+        fmt = options['format'] or fmt
+        chunks = export_chunks(fmt, batch_size=options['batch_size'], gzip=options['gzip'] or use_gzip)
+        if path == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+        try:
+            with open(path, 'wb') as out:
+                for chunk in chunks:
+                    out.write(chunk)
+        except OSError as exc:
+            raise CommandError(f'내보내기 파일을 쓰지 못했습니다: {exc}')
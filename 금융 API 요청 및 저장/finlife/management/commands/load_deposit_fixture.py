@@ -0,0 +1,43 @@
+# finlife/management/commands/load_deposit_fixture.py
+# 상품 카탈로그 fixture 를 스트리밍으로 읽어 bulk upsert 로 적재합니다. (loaddata 대체)
+#
+#   python manage.py load_deposit_fixture finlife/fixtures/deposit_products.json
+#   python manage.py load_deposit_fixture catalog.ndjson --batch-size 2000
+#   python manage.py load_deposit_fixture - --format ndjson < catalog.ndjson
+
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from finlife.fixtures import FORMATS, guess_format, load_fixture
+from finlife.ingest import CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = '정기예금 상품 fixture(json / ndjson)를 스트리밍으로 읽어 DB 에 적재합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="fixture 파일 경로 ('-' 이면 표준 입력)")
+        parser.add_argument('--format', choices=FORMATS, help='생략하면 확장자로 판단합니다. (.ndjson / .jsonl → ndjson)')
+        parser.add_argument('--batch-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or guess_format(path)
+        started = time.perf_counter()
+        try:
+            if path == '-':
+                counts = load_fixture(sys.stdin.buffer, fmt, options['batch_size'])
+            else:
+                with open(path, 'rb') as fp:
+                    counts = load_fixture(fp, fmt, options['batch_size'])
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f'fixture 를 적재하지 못했습니다: {exc}')
+
+        option_counts = counts['options']
+        self.stdout.write(self.style.SUCCESS(
+            f"상품 {counts['products']}건, 옵션 {option_counts['inserted']}건 추가 / "
+            f"{option_counts['updated']}건 갱신 / {option_counts['unchanged']}건 변경 없음 "
+            f"({time.perf_counter() - started:.2f}초)"
+        ))
@@ -0,0 +1,72 @@
+# finlife/management/commands/sync_deposit_products.py
+# 정기예금 상품 동기화를 웹 요청 밖에서 실행하는 관리 명령입니다.
+#
+#   python manage.py sync_deposit_products                 # 대기 작업 처리 후 1회 동기화
+#   python manage.py sync_deposit_products --queued-only   # save-products API 로 등록된 작업만 처리
+#   python manage.py sync_deposit_products --prune         # 응답에 없는 상품 삭제 (FINLIFE_SYNC_PRUNE 과 같음)
+#   python manage.py sync_deposit_products --interval 86400
+#       # 스케줄러로 상주: 대기 작업을 계속 처리하면서 interval 초마다 정기 동기화를 등록·실행
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from finlife.jobs import drain_queue, enqueue_sync
+from finlife.sync import run_sync
+
+POLL_SECONDS = 5
+
+
+class Command(BaseCommand):
+    help = '금융감독원 API 에서 정기예금 상품을 수집해 DB 에 반영합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queued-only', action='store_true',
+            help='새 동기화는 실행하지 않고 대기 중인 작업만 처리합니다.',
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='0 보다 크면 스케줄러로 상주하며 이 간격(초)마다 동기화를 실행합니다.',
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='이번 1회 동기화에서 응답에 없던 상품을 삭제합니다. (생략하면 FINLIFE_SYNC_PRUNE 설정)',
+        )
+
+    def handle(self, *args, **options):
+        if options['interval'] > 0:
+            return self.run_scheduler(options['interval'])
+
+        self.drain()
+        if not options['queued_only']:
+            try:
+                sync_run = run_sync(trigger='command', prune=options['prune'] or None)
+            except Exception as exc:
+                # 실패 내용은 SyncRun 에도 기록되어 있습니다.
+                raise CommandError(f'동기화에 실패했습니다: {exc}')
+            self.report(sync_run)
+
+    def drain(self):
+        for sync_run in drain_queue():
+            self.report(sync_run)
+
+    def run_scheduler(self, interval):
+        self.stdout.write(f'{interval}초 간격으로 동기화 스케줄러를 시작합니다.')
+        next_run = time.monotonic()
+        while True:
+            if time.monotonic() >= next_run:
+                enqueue_sync(trigger='schedule', in_process=False)
+                next_run = time.monotonic() + interval
+            self.drain()
+            time.sleep(POLL_SECONDS)
+
+    def report(self, sync_run):
+        if sync_run.status == 'success':
+            self.stdout.write(self.style.SUCCESS(
+                f'#{sync_run.pk} 완료: 상품 +{sync_run.products_inserted} ~{sync_run.products_updated} -{sync_run.products_removed} '
+                f'(건너뜀 {sync_run.products_skipped}), 옵션 +{sync_run.options_inserted} ~{sync_run.options_updated} -{sync_run.options_removed} '
+                f'[수집 {sync_run.fetch_seconds:.1f}s / 반영 {sync_run.write_seconds:.1f}s]'
+            ))
+        else:
+            self.stderr.write(self.style.ERROR(f'#{sync_run.pk} 실패: {sync_run.error}'))
@@ -0,0 +1,191 @@
+# finlife/metrics.py
+# 요청 / SQL / 금융감독원 API 호출 / 동기화 지표를 모아 Prometheus 텍스트 형식으로 내보냅니다.
+#
+# 지표는 프로세스 메모리에 쌓이므로 워커가 여러 개이면 워커마다 따로 집계됩니다.
+# (Prometheus 가 워커별로 긁어 가거나, 워커가 하나인 배포를 전제로 합니다)
+#
+#   finlife_http_requests_total{route, method, status}
+#   finlife_http_request_duration_seconds{route, method}      (histogram)
+#   finlife_http_response_size_bytes{route}                   (histogram)
+#   finlife_db_queries_per_request{route}                     (histogram)
+#   finlife_db_query_duration_seconds{route}                  (histogram, 요청 하나의 SQL 시간 합계)
+#   finlife_upstream_request_duration_seconds{endpoint, ok}   (histogram)
+#   finlife_upstream_response_bytes_total{endpoint}
+#   finlife_sync_duration_seconds{status}                     (histogram)
+#   finlife_snapshot_bytes / _version / _build_seconds        (gauge, 워커의 카탈로그 스냅샷)
+
+import threading
+from urllib.parse import urlparse
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1 << 10, 10 << 10, 100 << 10, 1 << 20, 10 << 20, 100 << 20)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+SYNC_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ----------------------------------------------------
+# 1. 지표 타입
+# ----------------------------------------------------
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value, *label_values):
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # {label 값: [버킷별 개수..., 합계, 전체 개수]}
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            values = {key: list(state) for key, state in self._values.items()}
+        for label_values, state in sorted(values.items()):
+            for bound, count in zip((*self.buckets, float('inf')), (*state[:-2], state[-1])):
+                yield f'{self.name}_bucket', _format_labels(self.labels, label_values, [('le', _format_number(bound))]), count
+            yield f'{self.name}_sum', _format_labels(self.labels, label_values), state[-2]
+            yield f'{self.name}_count', _format_labels(self.labels, label_values), state[-1]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def expose(self):
+        """Prometheus 텍스트 형식(0.0.4) 문자열"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+# ----------------------------------------------------
+# 2. finlife 지표
+# ----------------------------------------------------
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    'finlife_http_requests_total', 'HTTP 요청 수', ('route', 'method', 'status'),
+))
+http_duration = registry.register(Histogram(
+    'finlife_http_request_duration_seconds', 'HTTP 요청 처리 시간', ('route', 'method'),
+))
+http_response_size = registry.register(Histogram(
+    'finlife_http_response_size_bytes', 'HTTP 응답 본문 크기', ('route',), SIZE_BUCKETS,
+))
+db_queries = registry.register(Histogram(
+    'finlife_db_queries_per_request', '요청 하나에서 실행된 SQL 문 수', ('route',), QUERY_COUNT_BUCKETS,
+))
+db_duration = registry.register(Histogram(
+    'finlife_db_query_duration_seconds', '요청 하나에서 SQL 실행에 걸린 시간 합계', ('route',),
+))
+upstream_duration = registry.register(Histogram(
+    'finlife_upstream_request_duration_seconds', '금융감독원 API 호출 시간', ('endpoint', 'ok'),
+))
+upstream_bytes = registry.register(Counter(
+    'finlife_upstream_response_bytes_total', '금융감독원 API 응답 바이트', ('endpoint',),
+))
+sync_duration = registry.register(Histogram(
+    'finlife_sync_duration_seconds', '동기화 1회 소요 시간', ('status',), SYNC_BUCKETS,
+))
+snapshot_bytes = registry.register(Gauge(
+    'finlife_snapshot_bytes', '이 워커의 카탈로그 스냅샷 열 배열 크기',
+))
+snapshot_version = registry.register(Gauge(
+    'finlife_snapshot_version', '이 워커의 카탈로그 스냅샷 버전',
+))
+snapshot_build_seconds = registry.register(Gauge(
+    'finlife_snapshot_build_seconds', '마지막 카탈로그 스냅샷을 만드는 데 걸린 시간',
+))
+
+
+def observe_request(route, method, status, seconds, response_bytes, queries, query_seconds):
+    http_requests.inc(route, method, str(status))
+    http_duration.observe(seconds, route, method)
+    http_response_size.observe(response_bytes, route)
+    db_queries.observe(queries, route)
+    db_duration.observe(query_seconds, route)
+
+
+def observe_upstream(url, seconds, num_bytes, ok):
+    """FinlifeClient.listeners 에 등록하는 콜백 (url, seconds, num_bytes, ok)"""
+    endpoint = urlparse(url).path or url
+    upstream_duration.observe(seconds, endpoint, 'true' if ok else 'false')
+    upstream_bytes.inc(endpoint, amount=num_bytes)
+
+
+def observe_sync(status, seconds):
+    sync_duration.observe(seconds, status)
+
+
+def observe_snapshot(version, num_bytes, seconds):
+    snapshot_bytes.set(num_bytes)
+    snapshot_version.set(version)
+    snapshot_build_seconds.set(seconds)
@@ -0,0 +1,156 @@
+# finlife/middleware.py
+# 요청마다 URL 패턴(route) 기준으로 처리 시간 / SQL 수와 시간 / 응답 크기를 finlife.metrics 에 기록합니다.
+# FINLIFE_SLOW_REQUEST_SECONDS 를 넘긴 요청은 실행된 SQL 과 함께 finlife.slow_requests 로거에 남깁니다.
+#
+# 다른 미들웨어의 시간까지 포함하도록 MIDDLEWARE 의 맨 앞에 둡니다.
+# 동기 / async 양쪽을 지원하므로 ASGI 에서 async 뷰 앞에 있어도 요청을 스레드로 돌리지 않습니다.
+# 스트리밍 응답(내보내기 등)은 본문을 보내는 동안에도 SQL 이 실행되므로, 응답이 닫힐 때(본문을 다 보낸 뒤) 기록합니다.
+
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+logger = logging.getLogger('finlife.slow_requests')
+
+# 느린 요청 로그에 남길 SQL 최대 개수
+SLOW_LOG_MAX_QUERIES = 100
+UNMATCHED_ROUTE = '<unmatched>'
+# method 라벨 값. 이 밖의 임의 메서드는 라벨 수가 늘어나지 않도록 'other' 로 묶습니다.
+KNOWN_METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS', 'TRACE', 'CONNECT'})
+OTHER_METHOD = 'other'
+
+
+class _QueryRecorder:
+    """connection.execute_wrapper 로 SQL 수 / 시간을 재고, 필요하면 SQL 문도 모읍니다."""
+
+    def __init__(self, keep_sql):
+        self.count = 0
+        self.seconds = 0.0
+        self.keep_sql = keep_sql
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.seconds += elapsed
+            if self.keep_sql and len(self.queries) < SLOW_LOG_MAX_QUERIES:
+                self.queries.append((elapsed, sql))
+
+
+class _ClosingStream:
+    """
+    스트리밍 본문을 그대로 넘기면서 보낸 바이트 수를 세고, 응답이 닫힐 때 on_close(보낸 바이트 수) 를 한 번 부릅니다.
+    Django 는 streaming_content 의 close 를 응답의 close 에 묶어 두므로, 본문을 끝까지 보냈든 중간에 끊겼든 불립니다.
+    """
+
+    def __init__(self, content, on_close):
+        self.content = content
+        self.on_close = on_close
+        self.sent_bytes = 0
+
+    def close(self):
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close(self.sent_bytes)
+
+
+class _ClosingSyncStream(_ClosingStream):
+    def __iter__(self):
+        for chunk in self.content:
+            self.sent_bytes += len(chunk)
+            yield chunk
+
+
+class _ClosingAsyncStream(_ClosingStream):
+    async def __aiter__(self):
+        async for chunk in self.content:
+            self.sent_bytes += len(chunk)
+            yield chunk
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        recorder, stack = self._watch_queries()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            stack.close()
+            raise
+        return self._finish(request, response, recorder, stack, started)
+
+    async def __acall__(self, request):
+        # 연결은 요청의 DB 스레드에서 열리므로, execute_wrapper 도 그 스레드에서 겁니다.
+        recorder, stack = await sync_to_async(self._watch_queries)()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            await sync_to_async(stack.close)()
+            raise
+        if response.streaming:
+            # ASGI 핸들러는 response.close 를 요청의 DB 스레드에서 부르므로, 그때 execute_wrapper 를 풀면 됩니다.
+            return self._finish(request, response, recorder, stack, started)
+        await sync_to_async(stack.close)()
+        self._record(request, response, recorder, time.perf_counter() - started, len(response.content))
+        return response
+
+    def _finish(self, request, response, recorder, stack, started):
+        """일반 응답은 바로 기록하고, 스트리밍 응답은 본문을 다 보내고 닫힐 때 기록합니다."""
+        if not response.streaming:
+            stack.close()
+            self._record(request, response, recorder, time.perf_counter() - started, len(response.content))
+            return response
+
+        def on_close(sent_bytes):
+            stack.close()
+            self._record(request, response, recorder, time.perf_counter() - started, sent_bytes)
+
+        stream = _ClosingAsyncStream if response.is_async else _ClosingSyncStream
+        response.streaming_content = stream(response.streaming_content, on_close)
+        return response
+
+    def _watch_queries(self):
+        slow_seconds = getattr(settings, 'FINLIFE_SLOW_REQUEST_SECONDS', None)
+        recorder = _QueryRecorder(keep_sql=slow_seconds is not None)
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return recorder, stack
+
+    def _record(self, request, response, recorder, seconds, response_bytes):
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None and match.route else UNMATCHED_ROUTE
+        method = request.method if request.method in KNOWN_METHODS else OTHER_METHOD
+        metrics.observe_request(
+            route, method, response.status_code, seconds, response_bytes, recorder.count, recorder.seconds,
+        )
+
+        slow_seconds = getattr(settings, 'FINLIFE_SLOW_REQUEST_SECONDS', None)
+        if slow_seconds is not None and seconds >= slow_seconds:
+            logger.warning(
+                '느린 요청 %s %s (%s): %.3f초, SQL %d개 / %.3f초\n%s',
+                request.method, request.get_full_path(), route, seconds, recorder.count, recorder.seconds,
+                '\n'.join(f'  [{elapsed * 1000:.1f}ms] {sql}' for elapsed, sql in recorder.queries),
+            )
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0002_alter_depositoptions_product'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('running', '진행 중'), ('success', '성공'), ('failed', '실패')], default='running', max_length=10)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('fetch_seconds', models.FloatField(default=0)),
+                ('write_seconds', models.FloatField(default=0)),
+                ('products_inserted', models.IntegerField(default=0)),
+                ('products_updated', models.IntegerField(default=0)),
+                ('products_unchanged', models.IntegerField(default=0)),
+                ('products_skipped', models.IntegerField(default=0)),
+                ('options_inserted', models.IntegerField(default=0)),
+                ('options_updated', models.IntegerField(default=0)),
+                ('options_unchanged', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='depositproducts',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
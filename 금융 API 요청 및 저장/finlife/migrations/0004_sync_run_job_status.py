@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0003_sync_run_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncrun',
+            name='pages_fetched',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='syncrun',
+            name='pages_total',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='syncrun',
+            name='stage',
+            field=models.CharField(blank=True, choices=[('', '-'), ('fetching', 'API 수집'), ('writing', 'DB 반영')], default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='syncrun',
+            name='trigger',
+            field=models.CharField(choices=[('api', 'save-products API'), ('command', '관리 명령'), ('schedule', '스케줄러')], default='api', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='syncrun',
+            name='status',
+            field=models.CharField(choices=[('queued', '대기 중'), ('running', '진행 중'), ('success', '성공'), ('failed', '실패')], default='queued', max_length=10),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0005_catalog_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateLeaderboard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('save_trm', models.IntegerField()),
+                ('intr_rate_type', models.CharField(blank=True, max_length=1)),
+                ('rank', models.IntegerField()),
+                ('intr_rate2', models.FloatField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='depositoptions',
+            index=models.Index(fields=['save_trm', 'intr_rate_type', '-intr_rate2'], name='option_term_type_rate2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositoptions',
+            index=models.Index(fields=['save_trm', '-intr_rate2'], name='option_term_rate2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositoptions',
+            index=models.Index(fields=['intr_rate_type', '-intr_rate2'], name='option_type_rate2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositoptions',
+            index=models.Index(fields=['-intr_rate2'], name='option_rate2_idx'),
+        ),
+        migrations.AddField(
+            model_name='rateleaderboard',
+            name='option',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='finlife.depositoptions'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='rateleaderboard',
+            unique_together={('save_trm', 'intr_rate_type', 'rank')},
+        ),
+    ]
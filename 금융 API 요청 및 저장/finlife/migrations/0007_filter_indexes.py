@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0006_rate_leaderboard'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='depositoptions',
+            index=models.Index(fields=['save_trm', 'intr_rate_type', '-intr_rate'], name='option_term_type_rate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositoptions',
+            index=models.Index(fields=['save_trm', '-intr_rate'], name='option_term_rate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositoptions',
+            index=models.Index(fields=['intr_rate_type', '-intr_rate'], name='option_type_rate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositoptions',
+            index=models.Index(fields=['-intr_rate'], name='option_rate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositproducts',
+            index=models.Index(fields=['kor_co_nm'], name='product_co_nm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositproducts',
+            index=models.Index(fields=['join_deny'], name='product_deny_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositproducts',
+            index=models.Index(fields=['join_deny', 'kor_co_nm'], name='product_deny_co_nm_idx'),
+        ),
+    ]
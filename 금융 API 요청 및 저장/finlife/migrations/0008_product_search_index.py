@@ -0,0 +1,61 @@
+# 상품 전문 검색용 SQLite FTS5 가상 테이블 (finlife/search.py 참고)
+# 마이그레이션은 나중에 finlife/search.py 가 바뀌어도 처음과 같은 테이블을 만들어야 하므로,
+# 테이블 이름 / 필드 목록 / 토큰화는 이 시점의 것을 복사해 둡니다.
+
+import re
+
+from django.db import migrations
+
+FTS_TABLE = 'finlife_product_search'
+SEARCH_FIELDS = ('fin_prdt_nm', 'kor_co_nm', 'join_member', 'etc_note', 'spcl_cnd')
+
+_WORD = re.compile(r'\w+')
+_CJK = re.compile(r'[ᄀ-ᇿ㄰-㆏가-힣一-鿿]')
+
+
+def _word_tokens(word):
+    word = word.lower()
+    if len(word) > 1 and _CJK.search(word):
+        return [word[i:i + 2] for i in range(len(word) - 1)]
+    return [word]
+
+
+def to_index_text(text):
+    return ' '.join(token for word in _WORD.findall(text or '') for token in _word_tokens(word))
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    DepositProducts = apps.get_model('finlife', 'DepositProducts')
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({', '.join(SEARCH_FIELDS)}, tokenize='unicode61')"
+        )
+        # 이미 저장된 상품을 색인합니다.
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "
+            f"VALUES (%s, {', '.join(['%s'] * len(SEARCH_FIELDS))})",
+            [
+                (row[0], *(to_index_text(value) for value in row[1:]))
+                for row in DepositProducts.objects.values_list('id', *SEARCH_FIELDS).iterator()
+            ],
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0007_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
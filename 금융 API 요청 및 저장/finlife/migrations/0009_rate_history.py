@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def record_current_rates(apps, schema_editor):
+    # 이미 저장된 옵션의 현재 금리를 이력의 첫 행으로 남깁니다.
+    DepositOptions = apps.get_model('finlife', 'DepositOptions')
+    RateHistory = apps.get_model('finlife', 'RateHistory')
+    now = timezone.now()
+    RateHistory.objects.bulk_create(
+        (
+            RateHistory(product_id=product_id, save_trm=save_trm, intr_rate=intr_rate, intr_rate2=intr_rate2, recorded_at=now)
+            for product_id, save_trm, intr_rate, intr_rate2 in
+            DepositOptions.objects.values_list('product_id', 'save_trm', 'intr_rate', 'intr_rate2').iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0008_product_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('save_trm', models.IntegerField()),
+                ('intr_rate', models.FloatField()),
+                ('intr_rate2', models.FloatField()),
+                ('recorded_at', models.DateTimeField()),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rate_history', to='finlife.depositproducts')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'save_trm', 'recorded_at'], name='rate_history_series_idx'), models.Index(fields=['recorded_at'], name='rate_history_recorded_idx')],
+            },
+        ),
+        migrations.RunPython(record_current_rates, migrations.RunPython.noop),
+    ]
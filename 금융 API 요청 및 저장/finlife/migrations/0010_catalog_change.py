@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0009_rate_history'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncrun',
+            name='products_removed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='CatalogChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('product_added', '상품 추가'), ('product_updated', '상품 정보 변경'), ('product_removed', '상품 삭제'), ('option_added', '옵션 추가'), ('option_updated', '옵션 정보 변경'), ('rate_changed', '금리 변경')], max_length=20)),
+                ('fin_prdt_cd', models.CharField(max_length=200)),
+                ('save_trm', models.IntegerField(blank=True, null=True)),
+                ('changes', models.JSONField(default=dict)),
+                ('recorded_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'id'], name='catalog_change_kind_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0010_catalog_change'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncrun',
+            name='options_removed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='catalogchange',
+            name='kind',
+            field=models.CharField(choices=[('product_added', '상품 추가'), ('product_updated', '상품 정보 변경'), ('product_removed', '상품 삭제'), ('option_added', '옵션 추가'), ('option_updated', '옵션 정보 변경'), ('option_removed', '옵션 삭제'), ('rate_changed', '금리 변경')], max_length=20),
+        ),
+    ]
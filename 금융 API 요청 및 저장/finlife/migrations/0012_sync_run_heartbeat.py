@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0011_catalog_change_option_removed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncrun',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -21,6 +21,16 @@ class DepositProducts(models.Model):
     etc_note = models.TextField()
     # 우대 조건
     spcl_cnd = models.TextField()
+    # 상품 정보 + 옵션 목록 전체의 내용 해시 (변경 없는 상품은 동기화 시 건너뜁니다)
+    content_hash = models.CharField(max_length=32, blank=True, default='')
+
+    class Meta:
+        indexes = [
+            # 목록 API 필터 / 정렬용 (id 는 SQLite 인덱스에 rowid 로 함께 들어가므로 커서 정렬에도 쓰입니다)
+            models.Index(fields=['kor_co_nm'], name='product_co_nm_idx'),
+            models.Index(fields=['join_deny'], name='product_deny_idx'),
+            models.Index(fields=['join_deny', 'kor_co_nm'], name='product_deny_co_nm_idx'),
+        ]
 
     def __str__(self):
         return f'[{self.kor_co_nm}] {self.fin_prdt_nm}'
@@ -47,6 +57,164 @@ class DepositOptions(models.Model):
     class Meta:
         # 두 필드를 조합하여 중복을 방지합니다. (같은 상품에 같은 기간 옵션이 중복되지 않도록)
         unique_together = ('product', 'save_trm')
+        indexes = [
+            # 금리 순위표 재계산용: 기간 / 금리유형별 최고 우대금리 순 조회
+            models.Index(fields=['save_trm', 'intr_rate_type', '-intr_rate2'], name='option_term_type_rate2_idx'),
+            models.Index(fields=['save_trm', '-intr_rate2'], name='option_term_rate2_idx'),
+            models.Index(fields=['intr_rate_type', '-intr_rate2'], name='option_type_rate2_idx'),
+            models.Index(fields=['-intr_rate2'], name='option_rate2_idx'),
+            # 목록 API 의 기본금리(intr_rate) 필터 / 정렬용
+            models.Index(fields=['save_trm', 'intr_rate_type', '-intr_rate'], name='option_term_type_rate_idx'),
+            models.Index(fields=['save_trm', '-intr_rate'], name='option_term_rate_idx'),
+            models.Index(fields=['intr_rate_type', '-intr_rate'], name='option_type_rate_idx'),
+            models.Index(fields=['-intr_rate'], name='option_rate_idx'),
+        ]
     
     def __str__(self):
-        return f'{self.product.fin_prdt_nm} - {self.save_trm}개월 옵션'
\ No newline at end of file
+        # 목록에서 옵션마다 상품 쿼리가 나가지 않도록, 상품이 미리 로드된 경우에만 상품명을 씁니다.
+        if DepositOptions.product.is_cached(self):
+            return f'{self.product.fin_prdt_nm} - {self.save_trm}개월 옵션'
+        return f'상품 #{self.product_id} - {self.save_trm}개월 옵션'
+
+
+# 3. 동기화 실행 기록 모델 (SyncRun)
+# 동기화 1회(= 백그라운드 작업 1건)마다 진행 상태, 소요 시간, 반영 건수를 기록합니다.
+class SyncRun(models.Model):
+    STATUS_CHOICES = [
+        ('queued', '대기 중'),
+        ('running', '진행 중'),
+        ('success', '성공'),
+        ('failed', '실패'),
+    ]
+    STAGE_CHOICES = [
+        ('', '-'),
+        ('fetching', 'API 수집'),
+        ('writing', 'DB 반영'),
+    ]
+    TRIGGER_CHOICES = [
+        ('api', 'save-products API'),
+        ('command', '관리 명령'),
+        ('schedule', '스케줄러'),
+    ]
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    stage = models.CharField(max_length=10, choices=STAGE_CHOICES, blank=True, default='')
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES, default='api')
+    # started_at 은 작업이 등록된 시각, finished_at 은 성공/실패로 끝난 시각입니다.
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # 실행 중인 작업이 마지막으로 진행 상황을 기록한 시각. 오래 갱신되지 않으면 죽은 작업으로 봅니다. (jobs.fail_stale_runs)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    # 수집 진행률 (전체 페이지 수는 권역별 1페이지를 읽은 뒤에 정해집니다)
+    pages_total = models.IntegerField(default=0)
+    pages_fetched = models.IntegerField(default=0)
+    # API 수집 / DB 반영에 걸린 시간 (초)
+    fetch_seconds = models.FloatField(default=0)
+    write_seconds = models.FloatField(default=0)
+
+    # 상품 반영 건수 (skipped: 내용 해시가 같아 통째로 건너뛴 상품)
+    products_inserted = models.IntegerField(default=0)
+    products_updated = models.IntegerField(default=0)
+    products_unchanged = models.IntegerField(default=0)
+    products_skipped = models.IntegerField(default=0)
+    # 동기화 응답에 없어 삭제한 상품 (FINLIFE_SYNC_PRUNE 이 켜진 경우)
+    products_removed = models.IntegerField(default=0)
+    # 옵션 반영 건수
+    options_inserted = models.IntegerField(default=0)
+    options_updated = models.IntegerField(default=0)
+    options_unchanged = models.IntegerField(default=0)
+    # 바뀐 상품에서 동기화 응답에 없어 삭제한 옵션
+    options_removed = models.IntegerField(default=0)
+
+    # 실패한 경우 오류 메시지
+    error = models.TextField(blank=True, default='')
+
+    def __str__(self):
+        return f'SyncRun #{self.pk} ({self.status})'
+
+
+# 4. 카탈로그 버전 모델 (CatalogVersion)
+# 상품 / 옵션 데이터가 바뀌어 커밋될 때마다 1씩 올라가는 단일 행입니다.
+# 읽기 API 의 응답 캐시와 ETag 는 이 버전 번호를 기준으로 만들어집니다.
+class CatalogVersion(models.Model):
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'catalog v{self.version}'
+
+
+# 5. 금리 순위표 모델 (RateLeaderboard)
+# 저축 기간 / 금리 유형별 최고 우대금리(intr_rate2) 상위 N개 옵션을 미리 계산해 둔 표입니다.
+# save_trm=0 은 "전체 기간", intr_rate_type='' 은 "전체 유형"을 뜻합니다.
+class RateLeaderboard(models.Model):
+    save_trm = models.IntegerField()
+    intr_rate_type = models.CharField(max_length=1, blank=True)
+    # 1부터 시작하는 순위
+    rank = models.IntegerField()
+    option = models.ForeignKey(DepositOptions, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    # 정렬 기준 값 (조회 시 옵션을 다시 읽지 않아도 되도록 복사해 둡니다)
+    intr_rate2 = models.FloatField()
+
+    class Meta:
+        unique_together = ('save_trm', 'intr_rate_type', 'rank')
+
+    def __str__(self):
+        return f'{self.save_trm or "전체"}개월/{self.intr_rate_type or "전체"} #{self.rank}'
+
+
+# 6. 금리 변경 이력 모델 (RateHistory)
+# 동기화로 옵션 금리(intr_rate / intr_rate2)가 처음 생기거나 바뀔 때만 한 행씩 추가되는 append-only 표입니다.
+# 매일 동기화해도 금리가 그대로인 날은 기록하지 않으므로, 어떤 시점의 금리는
+# 그 시점 이전의 마지막 행으로 알 수 있습니다.
+class RateHistory(models.Model):
+    product = models.ForeignKey(DepositProducts, on_delete=models.CASCADE, related_name='rate_history')
+    save_trm = models.IntegerField()
+    intr_rate = models.FloatField()
+    intr_rate2 = models.FloatField()
+    # 변경이 반영된 동기화 시각
+    recorded_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # 상품 / 기간별 시계열 조회, 특정 시점 직전 금리 조회용
+            models.Index(fields=['product', 'save_trm', 'recorded_at'], name='rate_history_series_idx'),
+            # 기간 내 변경된 옵션 조회용 (금리 변동 순위)
+            models.Index(fields=['recorded_at'], name='rate_history_recorded_idx'),
+        ]
+
+    def __str__(self):
+        return f'상품 #{self.product_id} - {self.save_trm}개월 @ {self.recorded_at:%Y-%m-%d}'
+
+
+# 7. 카탈로그 변경 기록 모델 (CatalogChange)
+# 적재 엔진이 상품 / 옵션을 바꾼 트랜잭션 안에서 변경 하나마다 한 행씩 추가하는 append-only 표입니다.
+# id 가 변경 피드(/finlife/changes/)의 커서이며, 상품이 삭제되어도 기록은 남도록 외래키 대신 상품 코드를 저장합니다.
+class CatalogChange(models.Model):
+    KIND_CHOICES = [
+        ('product_added', '상품 추가'),
+        ('product_updated', '상품 정보 변경'),
+        ('product_removed', '상품 삭제'),
+        ('option_added', '옵션 추가'),
+        ('option_updated', '옵션 정보 변경'),
+        ('option_removed', '옵션 삭제'),
+        ('rate_changed', '금리 변경'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    fin_prdt_cd = models.CharField(max_length=200)
+    # 옵션 변경일 때만 저축 기간이 들어갑니다.
+    save_trm = models.IntegerField(null=True, blank=True)
+    # 바뀐 필드별 [이전 값, 새 값] (추가는 이전 값, 삭제는 새 값이 null)
+    changes = models.JSONField(default=dict)
+    # 변경이 반영된 동기화 시각
+    recorded_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # 종류별 피드 조회용 (?kind=rate_changed&cursor=N)
+            models.Index(fields=['kind', 'id'], name='catalog_change_kind_idx'),
+        ]
+
+    def __str__(self):
+        return f'#{self.pk} {self.kind} {self.fin_prdt_cd}'
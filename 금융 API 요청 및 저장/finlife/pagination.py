@@ -0,0 +1,160 @@
+# finlife/pagination.py
+# 목록 API 용 커서(keyset) 페이지네이션입니다.
+# OFFSET 대신 "마지막으로 본 행의 (정렬 값, id) 뒤에 오는 행" 조건으로 다음 페이지를 읽기 때문에
+# 몇 번째 페이지든 첫 페이지와 같은 비용(인덱스 범위 스캔)으로 조회됩니다.
+#
+# DRF CursorPagination 은 커서에 첫 번째 정렬 키만 넣고, 같은 값이 이어지면 OFFSET 으로 건너뛰는데
+# 그 OFFSET 이 offset_cutoff(1000) 에서 잘리므로 같은 값이 1000 행을 넘으면 행이 빠지거나 반복됩니다.
+# 여기서는 커서에 정렬 키 전체 (마지막 키는 항상 id) 를 넣으므로 같은 값이 몇 행이든 모든 행을 정확히 한 번씩 돌려줍니다.
+
+import json
+import math
+from base64 import b64decode, b64encode
+from binascii import Error as Base64Error
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+def _flip(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _field_value(row, field):
+    # product_values() 의 dict 행과 모델 객체를 모두 받습니다.
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+def _as_int(value):
+    # JSON 의 true / false 도 파이썬에서는 int 이므로 따로 막습니다.
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TypeError(value)
+    return value
+
+
+def _as_float(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise TypeError(value)
+    return float(value)
+
+
+def _as_str(value):
+    if not isinstance(value, str):
+        raise TypeError(value)
+    return value
+
+
+# 커서 값은 클라이언트가 보낸 것이므로, 정렬 필드 타입에 맞는 값인지 확인한 뒤에 쿼리에 넣습니다.
+_POSITION_TYPES = (
+    (models.IntegerField, _as_int),
+    (models.FloatField, _as_float),
+    (models.DecimalField, lambda value: Decimal(str(_as_float(value)))),
+    (models.CharField, _as_str),
+    (models.TextField, _as_str),
+)
+
+
+def _position_converter(model, name):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return lambda value: value
+    return next((convert for kind, convert in _POSITION_TYPES if isinstance(field, kind)), lambda value: value)
+
+
+class DepositProductsCursorPagination(CursorPagination):
+    # 기본키(id)는 유일하고 인덱스가 있으므로 안정적인 정렬 기준이 됩니다.
+    ordering = 'id'
+    page_size = 100
+    # ?page_size=50 처럼 요청마다 페이지 크기를 바꿀 수 있습니다. (최대 max_page_size)
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view):
+        ordering = (self.ordering,) if isinstance(self.ordering, str) else tuple(self.ordering)
+        # 마지막 키가 유일해야 커서 위치가 한 행을 가리킵니다.
+        if ordering[-1].lstrip('-') != 'id':
+            ordering += ('id',)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        position, reverse = self.decode_position(request, queryset.model)
+
+        # 이전 페이지는 정렬을 뒤집어 커서 앞쪽을 읽은 뒤 다시 뒤집습니다.
+        ordering = tuple(map(_flip, self.ordering)) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(ordering, position))
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = rows
+        return rows
+
+    @staticmethod
+    def after(ordering, position):
+        """
+        ordering 순서에서 position 뒤에 오는 행 조건.
+        (a, id) 다음 = a 가 뒤이거나, a 가 같고 id 가 뒤. 첫 키에는 범위 조건(a <= / >=)을 함께 걸어 인덱스 범위 스캔을 탑니다.
+        """
+        condition = None
+        for field, value in reversed(list(zip(ordering, position))):
+            name = field.lstrip('-')
+            strict = Q(**{f"{name}__{'lt' if field.startswith('-') else 'gt'}": value})
+            condition = strict if condition is None else strict | (Q(**{name: value}) & condition)
+        first, first_value = ordering[0], position[0]
+        bound = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": first_value})
+        return bound & condition
+
+    def encode_position(self, row, reverse):
+        token = {'p': [_field_value(row, field.lstrip('-')) for field in self.ordering]}
+        if reverse:
+            token['r'] = 1
+        encoded = b64encode(json.dumps(token, ensure_ascii=False, separators=(',', ':')).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_position(self, request, model):
+        """
+        ?cursor= 를 (정렬 키 값 목록, 이전 페이지 여부) 로 풉니다. 커서가 없으면 (None, False)
+        각 값은 model 의 정렬 필드 타입(int / float / Decimal / str)으로 바꾸며, 맞지 않으면 NotFound 입니다.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            token = json.loads(b64decode(encoded.encode()))
+            position = token['p']
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError(position)
+            position = [
+                _position_converter(model, field.lstrip('-'))(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (Base64Error, UnicodeError, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(token.get('r'))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_position(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_position(self.page[0], reverse=True)
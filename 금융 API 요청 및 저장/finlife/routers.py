@@ -0,0 +1,37 @@
+# finlife/routers.py
+# finlife 모델의 읽기는 읽기 전용 연결(finlife_read)로, 쓰기는 기본 DB(default)로 보냅니다.
+# 두 별칭은 같은 SQLite 파일을 가리키며(WAL), 읽기 전용 연결은 query_only 로 열려 쓰기 잠금을 잡지 않습니다.
+# 설정: config/settings.py 의 FINLIFE_READ_REPLICA
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+READ_ALIAS = 'finlife_read'
+APP_LABEL = 'finlife'
+
+
+class FinlifeReadRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != APP_LABEL:
+            return None
+        # 쓰기 트랜잭션 안에서는 아직 커밋하지 않은 자기 변경을 봐야 하므로 기본 DB 에서 읽습니다.
+        # (적재 엔진은 upsert 직후 id 를 다시 조회합니다)
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return READ_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label != APP_LABEL:
+            return None
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 두 별칭은 같은 DB 이므로 어느 쪽에서 읽은 객체끼리도 관계를 맺을 수 있습니다.
+        aliases = {DEFAULT_DB_ALIAS, READ_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == READ_ALIAS:
+            return False
+        return None
@@ -0,0 +1,146 @@
+# finlife/search.py
+# 상품명 / 가입 대상 / 유의사항 / 우대 조건 전문 검색입니다.
+# SQLite FTS5 가상 테이블(finlife_product_search)을 역색인으로 사용하며, rowid 는 상품 id 와 같습니다.
+#
+# 한글은 띄어쓰기 없이 붙여 쓰는 경우가 많아("청년우대적금") 단어 단위 토큰으로는 "우대" 같은
+# 부분 검색이 되지 않습니다. 그래서 한글 / 한자 단어는 겹치는 2글자(bigram) 토큰으로 나눠 색인하고,
+# 검색어도 같은 방식으로 나눠 연속된 bigram 구문(phrase)으로 찾습니다.
+#   "청년우대" → 청년 년우 우대
+#
+# SQLite 이외의 DB 에서는 색인을 만들지 않고 icontains 검색으로 대신합니다.
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import DepositProducts
+
+FTS_TABLE = 'finlife_product_search'
+# 색인 / 검색 대상 필드와 bm25 가중치 (상품명에 가장 큰 가중치)
+SEARCH_FIELDS = ('fin_prdt_nm', 'kor_co_nm', 'join_member', 'etc_note', 'spcl_cnd')
+FIELD_WEIGHTS = (5.0, 3.0, 1.0, 1.0, 2.0)
+
+SNIPPET_RADIUS = 30
+_WORD = re.compile(r'\w+')
+_CJK = re.compile(r'[ᄀ-ᇿ㄰-㆏가-힣一-鿿]')
+_IN_CHUNK_SIZE = 500
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+# ----------------------------------------------------
+# 1. 토큰화
+# ----------------------------------------------------
+def _word_tokens(word):
+    word = word.lower()
+    if len(word) > 1 and _CJK.search(word):
+        return [word[i:i + 2] for i in range(len(word) - 1)]
+    return [word]
+
+
+def to_index_text(text):
+    """원문을 FTS5(unicode61) 에 넣을 토큰 문자열로 바꿉니다."""
+    return ' '.join(token for word in _WORD.findall(text or '') for token in _word_tokens(word))
+
+
+def to_match_query(query):
+    """검색어를 FTS5 MATCH 식으로 바꿉니다. 모든 단어를 포함하는 상품만 찾습니다. (AND)"""
+    phrases = []
+    for word in _WORD.findall(query or ''):
+        tokens = _word_tokens(word)
+        if len(tokens) == 1:
+            # 한 글자 / 영문 / 숫자 단어는 접두어 검색
+            phrases.append(f'"{tokens[0]}"*')
+        else:
+            phrases.append('"' + ' '.join(tokens) + '"')
+    return ' '.join(phrases)
+
+
+# ----------------------------------------------------
+# 2. 색인 관리
+# ----------------------------------------------------
+def index_products(product_ids):
+    """
+    주어진 상품의 색인을 다시 만듭니다. 적재 엔진이 내용이 바뀐 상품에 대해서만 호출합니다.
+    (같은 트랜잭션 안에서 실행되므로 상품 데이터와 색인이 어긋나지 않습니다)
+    """
+    if not fts_available():
+        return
+    product_ids = list(product_ids)
+    with connection.cursor() as cursor:
+        for start in range(0, len(product_ids), _IN_CHUNK_SIZE):
+            chunk = product_ids[start:start + _IN_CHUNK_SIZE]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', chunk)
+            rows = DepositProducts.objects.filter(id__in=chunk).values_list('id', *SEARCH_FIELDS)
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "
+                f"VALUES (%s, {', '.join(['%s'] * len(SEARCH_FIELDS))})",
+                [(row[0], *(to_index_text(value) for value in row[1:])) for row in rows],
+            )
+
+
+# ----------------------------------------------------
+# 3. 검색
+# ----------------------------------------------------
+def highlight(text, terms, radius=SNIPPET_RADIUS):
+    """원문에서 처음 일치한 위치 앞뒤 radius 글자를 잘라 일치한 부분을 <mark> 로 감쌉니다."""
+    if not text:
+        return None
+    pattern = re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    first = pattern.search(text)
+    if first is None:
+        return None
+    start, end = max(0, first.start() - radius), min(len(text), first.end() + radius)
+    snippet = pattern.sub(lambda match: f'<mark>{match.group(0)}</mark>', text[start:end])
+    return ('…' if start > 0 else '') + snippet + ('…' if end < len(text) else '')
+
+
+def search_products(query, limit=20):
+    """
+    검색어와 관련도가 높은 순으로 상품을 돌려줍니다.
+    각 항목: {'fin_prdt_cd', 'kor_co_nm', 'fin_prdt_nm', 'score', 'highlights': {필드: 스니펫}}
+    """
+    terms = _WORD.findall(query or '')
+    if not terms:
+        return []
+
+    if fts_available():
+        with connection.cursor() as cursor:
+            weights = ', '.join(str(weight) for weight in FIELD_WEIGHTS)
+            # bm25() 는 관련도가 높을수록 작은(음수) 값을 돌려줍니다.
+            cursor.execute(
+                f'SELECT rowid, bm25({FTS_TABLE}, {weights}) AS score FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s ORDER BY score LIMIT %s',
+                [to_match_query(query), limit],
+            )
+            ranked = cursor.fetchall()
+        products = DepositProducts.objects.in_bulk([product_id for product_id, _ in ranked])
+        hits = [(products[product_id], -score) for product_id, score in ranked if product_id in products]
+    else:
+        queryset = DepositProducts.objects.all()
+        for term in terms:
+            condition = Q()
+            for field in SEARCH_FIELDS:
+                condition |= Q(**{f'{field}__icontains': term})
+            queryset = queryset.filter(condition)
+        hits = [(product, 0.0) for product in queryset.order_by('id')[:limit]]
+
+    results = []
+    for product, score in hits:
+        highlights = {}
+        for field in SEARCH_FIELDS:
+            snippet = highlight(getattr(product, field), terms)
+            if snippet:
+                highlights[field] = snippet
+        results.append({
+            'fin_prdt_cd': product.fin_prdt_cd,
+            'kor_co_nm': product.kor_co_nm,
+            'fin_prdt_nm': product.fin_prdt_nm,
+            'score': round(score, 4),
+            'highlights': highlights,
+        })
+    return results
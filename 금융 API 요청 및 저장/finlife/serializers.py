@@ -1,19 +1,13 @@
 # finlife/serializers.py
 
 from rest_framework import serializers
-from .models import DepositProducts, DepositOptions
+from .models import DepositProducts, DepositOptions, SyncRun
+from .calculator import DEFAULT_TAX, RATE_FIELDS, TAX_RATES
 
 # ----------------------------------------------------
 # 1. 상품 Serializer (메인 목록 조회용)
 # ----------------------------------------------------
 class DepositProductsSerializer(serializers.ModelSerializer):
-    # DepositProducts 모델에 Option 정보가 필요하므로,
-    # 역참조(`depositproductoptions_set`) 관계를 활용하여 옵션 데이터를 중첩합니다.
-    # 옵션이 여러 개일 수 있으므로 many=True 설정이 필요합니다.
-    # depositproductoptions_set = DepositProductOptionsSerializer(
-        # many=True, read_only=True
-    # )
-
     class Meta:
         model = DepositProducts
         # F05에서는 상품 정보만 깔끔하게 보이면 되므로, 옵션 리스트는 제외하고 명시
@@ -21,6 +15,34 @@ class DepositProductsSerializer(serializers.ModelSerializer):
             'fin_prdt_cd', 'kor_co_nm', 'fin_prdt_nm', 'join_way', 
             'join_member', 'etc_note', 'spcl_cnd',
         )
+
+
+class DepositProductsBulkItemSerializer(DepositProductsSerializer):
+    # 여러 상품을 한 번에 추가할 때(POST deposit-products/ 에 목록) 항목 하나를 검사합니다.
+    # fin_prdt_cd 중복 검사는 뷰에서 전체 코드를 쿼리 1번으로 확인하므로, 항목마다 쿼리하는 UniqueValidator 는 뺍니다.
+    class Meta(DepositProductsSerializer.Meta):
+        extra_kwargs = {'fin_prdt_cd': {'validators': []}}
+
+
+# ----------------------------------------------------
+# 1-1. 상품 + 옵션 목록 Serializer (상품 카드 / 비교 화면용)
+# ----------------------------------------------------
+class DepositOptionsNestedSerializer(serializers.ModelSerializer):
+    # 상품 아래에 중첩되므로 상품 정보(product)는 다시 넣지 않습니다.
+    class Meta:
+        model = DepositOptions
+        fields = ('save_trm', 'intr_rate', 'intr_rate2', 'intr_rate_type', 'intr_rate_type_nm')
+
+
+class DepositProductsWithOptionsSerializer(DepositProductsSerializer):
+    # 역참조(related_name='options') 관계를 활용하여 옵션 데이터를 중첩합니다.
+    # 반드시 prefetch_related('options') 된 queryset 과 함께 사용해야 상품마다 쿼리가 나가지 않습니다.
+    options = DepositOptionsNestedSerializer(many=True, read_only=True)
+
+    class Meta(DepositProductsSerializer.Meta):
+        fields = DepositProductsSerializer.Meta.fields + ('options',)
+
+
 # ----------------------------------------------------
 # 2. 옵션 Serializer (내부 중첩용)
 # ----------------------------------------------------
@@ -33,3 +55,39 @@ class DepositProductOptionsSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+# ----------------------------------------------------
+# 3. 동기화 실행 기록 Serializer
+# ----------------------------------------------------
+class SyncRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SyncRun
+        # 실패 원인(error)은 운영자용입니다. (관리 명령 출력 / 로그로 확인)
+        exclude = ('error',)
+
+
+# ----------------------------------------------------
+# 4. 금리 변동 Serializer (finlife/history.py 의 biggest_movers 결과용)
+# ----------------------------------------------------
+class RateMoverSerializer(DepositProductOptionsSerializer):
+    # 비교 시점의 금리와 현재 금리와의 차이
+    previous_rate = serializers.FloatField(read_only=True)
+    change = serializers.FloatField(read_only=True)
+
+
+# ----------------------------------------------------
+# 5. 만기 수령액 계산 요청 Serializer (finlife/calculator.py)
+# ----------------------------------------------------
+class PayoutQuerySerializer(serializers.Serializer):
+    # 예치 금액(원)과 저축 기간(개월)
+    amount = serializers.IntegerField(min_value=1)
+    term = serializers.IntegerField(min_value=1, max_value=120)
+
+
+class PayoutRequestSerializer(serializers.Serializer):
+    # 여러 (금액, 기간) 조합을 한 요청으로 계산합니다.
+    queries = PayoutQuerySerializer(many=True, allow_empty=False, max_length=100)
+    k = serializers.IntegerField(min_value=1, max_value=100, default=10)
+    # 계산에 쓸 금리: 최고 우대금리(intr_rate2) 또는 기본금리(intr_rate)
+    rate = serializers.ChoiceField(choices=RATE_FIELDS, default='intr_rate2')
+    # 과세 구분: general(15.4%), preferential(9.5%), exempt(0%)
+    tax = serializers.ChoiceField(choices=tuple(TAX_RATES), default=DEFAULT_TAX)
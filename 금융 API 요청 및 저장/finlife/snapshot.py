@@ -0,0 +1,267 @@
+# finlife/snapshot.py
+# 카탈로그(상품 + 옵션) 전체를 워커 프로세스 메모리에 열(column) 단위로 올려 둔 읽기 전용 스냅샷입니다.
+# FINLIFE_SNAPSHOT=true 이면 상품 옵션 조회 / 여러 상품 조회 / 최고 금리 / 수령액 계산 API 가 DB 를 읽지 않고 여기서 답합니다.
+# 설정이 꺼져 있으면 스냅샷은 만들어지지 않습니다. (수령액 계산기는 금리 열만 따로 읽습니다)
+#
+# - 숫자 열은 NumPy 배열입니다. 문자열 열은 서로 다른 값만 UTF-8 로 이어 붙인 bytes + 위치(offsets) 배열에 한 번 저장하고,
+#   행마다 값 번호(codes)만 둡니다. (금융회사명 / 금리유형처럼 반복되는 값은 한 번만 저장됩니다)
+# - fin_prdt_cd → 상품 행 번호는 정렬된 고정 길이 bytes 배열을 이진 탐색해서 찾습니다. (str 키 dict 보다 훨씬 작음)
+# - 스냅샷은 만든 뒤 바꾸지 않습니다. 새 카탈로그 버전이 보이면 새 스냅샷을 따로 만든 뒤 모듈 변수 하나만 바꿔 끼우므로,
+#   읽는 쪽은 잠금 없이 항상 한 버전 전체를 봅니다. 새로 만드는 동안 다른 스레드는 이전 스냅샷으로 답합니다.
+# - 새 버전 감지는 get_catalog_version() 으로 합니다. (버전 번호가 캐시에 있으면 DB 조회 없음)
+#
+# 상품과 옵션은 쿼리 2번으로 따로 읽으므로 그 사이에 동기화가 커밋되면 두 시점이 섞일 수 있지만,
+# 스냅샷에는 읽기 전에 본 버전 번호가 붙으므로 다음 버전 확인 때 바로 다시 만들어집니다.
+
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+from .cache import get_catalog_version
+from .fastpath import PRODUCT_FIELDS
+from .leaderboard import ALL_TERMS, ALL_TYPES, leaderboard_size
+from .metrics import observe_snapshot
+from .models import DepositOptions, DepositProducts
+
+OPTION_COLUMNS = ('id', 'product_id', 'save_trm', 'intr_rate', 'intr_rate2', 'intr_rate_type', 'intr_rate_type_nm')
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+def snapshot_enabled():
+    return getattr(settings, 'FINLIFE_SNAPSHOT', False)
+
+
+# ----------------------------------------------------
+# 1. 열(column) 타입
+# ----------------------------------------------------
+class StringColumn:
+    """사전 인코딩된 문자열 열입니다. column[i] 는 i 번째 행의 문자열입니다."""
+
+    def __init__(self, values):
+        distinct = {}
+        codes = [distinct.setdefault(value, len(distinct)) for value in values]
+        encoded = [value.encode() for value in distinct]
+        self.data = b''.join(encoded)
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        self.offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.min_scalar_type(len(self.data)))
+        self.codes = np.array(codes, dtype=np.min_scalar_type(max(len(encoded) - 1, 0)))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, row):
+        return self._value(int(self.codes[row]))
+
+    def _value(self, code):
+        return self.data[self.offsets[code]:self.offsets[code + 1]].decode()
+
+    def equals(self, value):
+        """값이 value 인 행을 가리키는 bool 배열"""
+        for code in range(len(self.offsets) - 1):
+            if self._value(code) == value:
+                return self.codes == code
+        return np.zeros(len(self.codes), dtype=bool)
+
+    @property
+    def nbytes(self):
+        return len(self.data) + self.offsets.nbytes + self.codes.nbytes
+
+
+class ProductColumns:
+    """상품 열 배열 (id 순). i 번째 원소는 모두 같은 상품을 가리킵니다."""
+
+    def __init__(self, rows):
+        product_id, max_limit, *texts = zip(*rows) if rows else ((),) * (len(PRODUCT_FIELDS) + 2)
+        self.id = np.array(product_id, dtype=np.int64)
+        # 최고 한도가 없는 상품은 무한대로 둡니다.
+        self.max_limit = np.array([limit if limit else np.inf for limit in max_limit], dtype=np.float64)
+        self.text = {field: StringColumn(values) for field, values in zip(PRODUCT_FIELDS, texts)}
+
+        codes = np.array([code.encode() for code in texts[PRODUCT_FIELDS.index('fin_prdt_cd')]], dtype=bytes)
+        self.code_order = np.argsort(codes, kind='stable').astype(np.int32)
+        self.sorted_codes = codes[self.code_order]
+
+    def find(self, fin_prdt_cd):
+        """상품 코드의 행 번호 (없으면 None)"""
+        key = fin_prdt_cd.encode()
+        if len(key) > self.sorted_codes.dtype.itemsize:
+            return None
+        index = int(np.searchsorted(self.sorted_codes, key))
+        if index < len(self.sorted_codes) and self.sorted_codes[index] == key:
+            return int(self.code_order[index])
+        return None
+
+    @property
+    def nbytes(self):
+        return (
+            self.id.nbytes + self.max_limit.nbytes + self.code_order.nbytes + self.sorted_codes.nbytes
+            + sum(column.nbytes for column in self.text.values())
+        )
+
+
+class OptionColumns:
+    """옵션 열 배열 (id 순). 수령액 계산기의 RateColumns 와 같은 이름의 열(id / save_trm / intr_rate / intr_rate2 / is_monthly / max_limit)을 가집니다."""
+
+    def __init__(self, rows, products):
+        option_id, product_id, save_trm, intr_rate, intr_rate2, intr_rate_type, intr_rate_type_nm = (
+            zip(*rows) if rows else ((),) * len(OPTION_COLUMNS)
+        )
+        product_id = np.array(product_id, dtype=np.int64)
+        # 상품 행 번호. 상품을 읽은 뒤에 추가된 상품의 옵션은 다음 스냅샷에 들어가도록 뺍니다.
+        product = np.minimum(np.searchsorted(products.id, product_id), max(len(products.id) - 1, 0))
+        keep = products.id[product] == product_id if len(products.id) else np.zeros(len(product_id), dtype=bool)
+
+        self.id = np.array(option_id, dtype=np.int64)[keep]
+        self.product = product[keep].astype(np.int32)
+        self.save_trm = np.array(save_trm, dtype=np.int32)[keep]
+        self.intr_rate = np.array(intr_rate, dtype=np.float64)[keep]
+        self.intr_rate2 = np.array(intr_rate2, dtype=np.float64)[keep]
+        self.intr_rate_type = StringColumn([value for value, kept in zip(intr_rate_type, keep) if kept])
+        self.intr_rate_type_nm = StringColumn([value for value, kept in zip(intr_rate_type_nm, keep) if kept])
+        self.is_monthly = self.intr_rate_type.equals('M')
+        self.max_limit = products.max_limit[self.product]
+
+        # by_product[starts[p]:starts[p + 1]] 가 p 번째 상품의 옵션 위치입니다. (옵션 id 순)
+        self.by_product = np.argsort(self.product, kind='stable').astype(np.int32)
+        counts = np.bincount(self.product, minlength=len(products.id))
+        self.starts = np.concatenate(([0], np.cumsum(counts))).astype(np.int32)
+
+    def find(self, option_id):
+        """옵션 id 의 위치 (없으면 None)"""
+        index = int(np.searchsorted(self.id, option_id))
+        if index < len(self.id) and self.id[index] == option_id:
+            return index
+        return None
+
+    @property
+    def nbytes(self):
+        arrays = (
+            self.id, self.product, self.save_trm, self.intr_rate, self.intr_rate2,
+            self.is_monthly, self.max_limit, self.by_product, self.starts,
+        )
+        return sum(array.nbytes for array in arrays) + self.intr_rate_type.nbytes + self.intr_rate_type_nm.nbytes
+
+
+# ----------------------------------------------------
+# 2. 스냅샷
+# ----------------------------------------------------
+class CatalogSnapshot:
+    """한 카탈로그 버전의 상품 / 옵션 열 배열입니다. 만든 뒤에는 바꾸지 않습니다."""
+
+    def __init__(self, version, product_rows, option_rows):
+        self.version = version
+        self.products = ProductColumns(product_rows)
+        self.options = OptionColumns(option_rows, self.products)
+
+    @classmethod
+    def load(cls, version):
+        product_rows = list(
+            DepositProducts.objects.order_by('id').values_list('id', 'max_limit', *PRODUCT_FIELDS)
+        )
+        option_rows = list(DepositOptions.objects.order_by('id').values_list(*OPTION_COLUMNS))
+        return cls(version, product_rows, option_rows)
+
+    @property
+    def nbytes(self):
+        """열 배열이 차지하는 메모리 (바이트)"""
+        return self.products.nbytes + self.options.nbytes
+
+    # 응답 모양은 finlife/serializers.py 의 같은 용도 Serializer 와 같습니다.
+    def find_product(self, fin_prdt_cd):
+        return self.products.find(fin_prdt_cd)
+
+    def product_data(self, row, nested=False):
+        """DepositProductsSerializer (nested=True 이면 DepositProductsWithOptionsSerializer) 모양"""
+        data = {field: self.products.text[field][row] for field in PRODUCT_FIELDS}
+        if nested:
+            positions = self.options.by_product[self.options.starts[row]:self.options.starts[row + 1]]
+            data['options'] = [self.option_data(index) for index in positions]
+        return data
+
+    def option_data(self, index):
+        """DepositOptionsNestedSerializer 모양"""
+        options = self.options
+        return {
+            'save_trm': int(options.save_trm[index]),
+            'intr_rate': float(options.intr_rate[index]),
+            'intr_rate2': float(options.intr_rate2[index]),
+            'intr_rate_type': options.intr_rate_type[index],
+            'intr_rate_type_nm': options.intr_rate_type_nm[index],
+        }
+
+    def option_with_product(self, index):
+        """DepositProductOptionsSerializer 모양"""
+        return {
+            'id': int(self.options.id[index]),
+            'product': self.product_data(int(self.options.product[index])),
+            **self.option_data(index),
+        }
+
+    def top_options(self, save_trm=ALL_TERMS, intr_rate_type=ALL_TYPES, n=10):
+        """금리 순위표(get_leaderboard)와 같은 규칙으로 상위 n개 옵션의 위치를 돌려줍니다."""
+        options = self.options
+        n = max(1, min(n, leaderboard_size()))
+        mask = options.intr_rate2 >= 0
+        if save_trm != ALL_TERMS:
+            mask &= options.save_trm == save_trm
+        if intr_rate_type != ALL_TYPES:
+            mask &= options.intr_rate_type.equals(intr_rate_type)
+        candidates = np.flatnonzero(mask)
+        if not len(candidates):
+            return []
+
+        # 전체 정렬 대신 n 번째 금리 이상인 옵션만 골라 (금리 내림차순, id 순) 으로 정렬합니다.
+        rates = options.intr_rate2[candidates]
+        top = min(n, len(candidates))
+        threshold = -np.partition(-rates, top - 1)[top - 1]
+        picked = candidates[rates >= threshold]
+        picked = picked[np.lexsort((options.id[picked], -options.intr_rate2[picked]))]
+        return [int(index) for index in picked[:top]]
+
+
+# ----------------------------------------------------
+# 3. 현재 스냅샷
+# ----------------------------------------------------
+def _install(version):
+    global _snapshot
+    started = time.perf_counter()
+    snapshot = CatalogSnapshot.load(version)
+    _snapshot = snapshot
+    observe_snapshot(version, snapshot.nbytes, time.perf_counter() - started)
+    return snapshot
+
+
+def get_snapshot():
+    """
+    현재 카탈로그 버전의 스냅샷. 버전이 그대로면 DB 를 읽지 않습니다.
+    이전 스냅샷이 있으면, 한 스레드가 새 버전을 만드는 동안 다른 스레드는 기다리지 않고 이전 스냅샷을 받습니다.
+    """
+    version = get_catalog_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    if not _lock.acquire(blocking=snapshot is None):
+        return snapshot
+    try:
+        if _snapshot is None or _snapshot.version != version:
+            return _install(version)
+        return _snapshot
+    finally:
+        _lock.release()
+
+
+def refresh_snapshot():
+    """동기화 직후 호출합니다. 이 프로세스에 스냅샷이 있으면 다음 요청을 기다리지 않고 새 버전으로 바꿔 둡니다."""
+    if _snapshot is not None:
+        get_snapshot()
+
+
+def clear_snapshot():
+    # 다음 요청 때 DB 에서 다시 읽도록 합니다. (테스트처럼 같은 버전 번호가 다른 데이터를 가리킬 수 있는 경우)
+    global _snapshot
+    with _lock:
+        _snapshot = None
@@ -0,0 +1,136 @@
+# finlife/streaming.py
+# 큰 JSON 응답을 한 번에 json.loads 하지 않고, 바이트 청크를 읽어 가며
+# 필요한 배열(baseList / optionList)의 원소를 하나씩 꺼내는 스트리밍 파서입니다.
+# 원소 하나하나(상품 / 옵션 dict)는 작기 때문에 json.JSONDecoder.raw_decode 로 통째로 디코딩하고,
+# 바깥쪽 객체 / 배열 구조만 직접 따라갑니다.
+# 최상위가 배열인 fixture 파일도 같은 방식으로 원소를 하나씩 읽습니다. (iter_json_array)
+
+import codecs
+import json
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    """바이트 청크 iterator 위에서 동작하는 최소한의 JSON 토큰 리더"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        if self._eof:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            text = self._utf8.decode(b'', final=True)
+        else:
+            text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        # 이미 읽은 앞부분은 버려서 버퍼가 응답 크기만큼 커지지 않게 합니다.
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """공백을 건너뛰고 다음 문자를 돌려줍니다. (입력 끝이면 '')"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def take(self, expected=None):
+        char = self.peek()
+        if expected is not None and char not in expected:
+            raise ValueError(f'JSON 형식 오류: {expected!r} 가 필요하지만 {char!r} 를 만났습니다.')
+        self._pos += 1
+        return char
+
+    def value(self):
+        """다음 JSON 값 하나를 통째로 디코딩합니다."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 버퍼 끝에서 끝난 숫자 / 리터럴은 잘렸을 수 있으므로 더 읽어 보고 다시 디코딩합니다.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+class ResultItemStream:
+    """
+    금융감독원 API 응답에서 result 아래 배열의 원소를 (배열 이름, 원소) 로 하나씩 돌려줍니다.
+
+    baseList / optionList 이외의 result 필드(max_page_no, err_cd 등)는 순회하면서 meta 에 모입니다.
+    응답 안에서 필드 순서가 바뀌어도 동작하지만, meta 는 순회가 끝난 뒤에야 완전합니다.
+    """
+
+    def __init__(self, chunks, list_names=('baseList', 'optionList')):
+        self._reader = _Reader(chunks)
+        self.list_names = frozenset(list_names)
+        self.meta = {}
+        self.has_result = False
+
+    def __iter__(self):
+        self._reader.take('{')
+        yield from self._object(())
+
+    def _object(self, path):
+        reader = self._reader
+        if reader.peek() == '}':
+            reader.take()
+            return
+        while True:
+            key = reader.value()
+            reader.take(':')
+            nxt = reader.peek()
+            if path == () and key == 'result' and nxt == '{':
+                self.has_result = True
+                reader.take()
+                yield from self._object(('result',))
+            elif path == ('result',) and key in self.list_names and nxt == '[':
+                reader.take()
+                yield from self._array(key)
+            else:
+                value = reader.value()
+                if path == ('result',):
+                    self.meta[key] = value
+            if reader.take(',}') == '}':
+                return
+
+    def _array(self, name):
+        reader = self._reader
+        if reader.peek() == ']':
+            reader.take()
+            return
+        while True:
+            yield name, reader.value()
+            if reader.take(',]') == ']':
+                return
+
+
+def iter_json_array(chunks):
+    """최상위가 배열인 JSON(예: Django fixture)의 원소를 하나씩 돌려줍니다."""
+    reader = _Reader(chunks)
+    reader.take('[')
+    if reader.peek() == ']':
+        reader.take()
+        return
+    while True:
+        yield reader.value()
+        if reader.take(',]') == ']':
+            return
@@ -0,0 +1,175 @@
+# finlife/sync.py
+# 수집(crawler) → 적재(ingest) 한 사이클을 실행하고 그 결과를 SyncRun 에 기록합니다.
+# arun_sync 는 같은 사이클을 이벤트 루프 위에서 실행하는 async 버전입니다. (ASGI 경로)
+
+import re
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from .crawler import aiter_deposit_pages, iter_deposit_pages
+from .ingest import aingest_pages, ingest_pages, remove_missing_products
+from .metrics import observe_sync
+from .models import SyncRun
+from .snapshot import refresh_snapshot
+
+# 진행률을 DB 에 기록하는 최소 간격 (초). 페이지마다 쓰기 잠금을 잡지 않기 위함입니다.
+PROGRESS_INTERVAL = 1.0
+# SyncRun.error 에 남기는 오류 요약의 최대 길이
+ERROR_MAX_LENGTH = 300
+# requests / httpx 오류 메시지에는 요청 URL 전체(auth=<API 키> 포함)가 들어 있으므로 쿼리 문자열을 지웁니다.
+_URL_QUERY = re.compile(r'(https?://[^\s?\'"]+)\?[^\s\'"]*')
+_AUTH_PARAM = re.compile(r'(auth=)[^&\s\'"]+')
+
+
+def _update(sync_run, **fields):
+    # 진행 상황을 기록할 때마다 heartbeat 도 함께 갱신합니다.
+    fields['heartbeat_at'] = timezone.now()
+    for name, value in fields.items():
+        setattr(sync_run, name, value)
+    SyncRun.objects.filter(pk=sync_run.pk).update(**fields)
+
+
+async def _aupdate(sync_run, **fields):
+    fields['heartbeat_at'] = timezone.now()
+    for name, value in fields.items():
+        setattr(sync_run, name, value)
+    await SyncRun.objects.filter(pk=sync_run.pk).aupdate(**fields)
+
+
+def _prune_enabled(prune):
+    return getattr(settings, 'FINLIFE_SYNC_PRUNE', False) if prune is None else prune
+
+
+def _should_report(last_report, fetched, total):
+    now = time.monotonic()
+    if fetched == total or now - last_report[0] >= PROGRESS_INTERVAL:
+        last_report[0] = now
+        return True
+    return False
+
+
+def error_summary(exc):
+    """SyncRun.error 와 로그에 남길 오류 요약. 예외 클래스 이름과, URL 의 쿼리 문자열을 지운 짧은 메시지입니다."""
+    message = _AUTH_PARAM.sub(r'\1***', _URL_QUERY.sub(r'\1', str(exc)))
+    return f'{type(exc).__name__}: {message}'[:ERROR_MAX_LENGTH]
+
+
+def _mark_failed(sync_run, exc, started):
+    sync_run.status = 'failed'
+    sync_run.error = error_summary(exc)
+    sync_run.finished_at = timezone.now()
+    observe_sync('failed', time.perf_counter() - started)
+
+
+def _mark_success(sync_run, counts, started, finished):
+    sync_run.status = 'success'
+    sync_run.stage = ''
+    sync_run.finished_at = timezone.now()
+    sync_run.write_seconds = finished - started - sync_run.fetch_seconds
+    for table in ('products', 'options'):
+        for key, value in counts[table].items():
+            setattr(sync_run, f'{table}_{key}', value)
+    observe_sync('success', finished - started)
+
+
+def run_sync(fetch_pages=iter_deposit_pages, sync_run=None, trigger='command', prune=None):
+    """
+    동기화를 1회 실행하고 완료된 SyncRun 을 돌려줍니다.
+
+    sync_run 을 넘기면 (이미 등록된 작업) 그 기록을 이어서 갱신하고, 없으면 새로 만듭니다.
+    fetch_pages 는 progress=(fetched, total) 콜백을 받아 페이지 result({'baseList', 'optionList'})를
+    하나씩 내놓는 iterable 을 돌려주는 함수입니다. 페이지는 받는 대로 배치 단위로 기록됩니다.
+    수집이나 적재 중 예외가 나면 SyncRun 을 failed 로 기록한 뒤 예외를 그대로 다시 올립니다.
+
+    prune 이 True 이면 (생략하면 FINLIFE_SYNC_PRUNE 설정) 수집이 끝까지 성공한 뒤
+    응답에 없던 상품을 삭제하고 products_removed 로 기록합니다.
+    """
+    if sync_run is None:
+        sync_run = SyncRun.objects.create(status='running', trigger=trigger)
+    last_report = [0.0]
+
+    def report_progress(fetched, total):
+        if _should_report(last_report, fetched, total):
+            _update(sync_run, pages_fetched=fetched, pages_total=total)
+
+    def timed_pages(pages):
+        # 수집과 기록이 번갈아 일어나므로, 다음 페이지를 기다린 시간만 수집 시간으로 셉니다.
+        iterator = iter(pages)
+        while True:
+            waited = time.perf_counter()
+            page = next(iterator, None)
+            if page is None:
+                # 수집이 끝나면 남은 마지막 배치만 기록하면 됩니다.
+                _update(sync_run, stage='writing', fetch_seconds=sync_run.fetch_seconds)
+                return
+            sync_run.fetch_seconds += time.perf_counter() - waited
+            yield page
+
+    started = time.perf_counter()
+    try:
+        sync_run.fetch_seconds = 0.0
+        _update(sync_run, status='running', stage='fetching')
+        seen = set() if _prune_enabled(prune) else None
+        counts = ingest_pages(timed_pages(fetch_pages(progress=report_progress)), seen=seen)
+        if seen is not None:
+            counts['products']['removed'] = remove_missing_products(seen)
+        finished = time.perf_counter()
+    except Exception as exc:
+        _mark_failed(sync_run, exc, started)
+        sync_run.save()
+        raise
+
+    _mark_success(sync_run, counts, started, finished)
+    sync_run.save()
+    # 이 프로세스의 카탈로그 스냅샷을 새 버전으로 바꿔 둡니다. (다른 워커는 다음 요청에서 버전을 보고 바꿉니다)
+    refresh_snapshot()
+    return sync_run
+
+
+async def arun_sync(fetch_pages=aiter_deposit_pages, sync_run=None, trigger='api', prune=None):
+    """
+    run_sync 의 async 버전입니다. fetch_pages 는 async progress 콜백을 받아 async iterable 을 돌려주는 함수입니다.
+
+    페이지 요청은 이벤트 루프에서 동시에 기다리고, 배치 기록은 DB 스레드에서 실행하며,
+    SyncRun 갱신은 async ORM 으로 합니다. 기록 규칙과 예외 처리는 run_sync 와 같습니다.
+    """
+    if sync_run is None:
+        sync_run = await SyncRun.objects.acreate(status='running', trigger=trigger)
+    last_report = [0.0]
+
+    async def report_progress(fetched, total):
+        if _should_report(last_report, fetched, total):
+            await _aupdate(sync_run, pages_fetched=fetched, pages_total=total)
+
+    async def timed_pages(pages):
+        iterator = aiter(pages)
+        while True:
+            waited = time.perf_counter()
+            page = await anext(iterator, None)
+            if page is None:
+                await _aupdate(sync_run, stage='writing', fetch_seconds=sync_run.fetch_seconds)
+                return
+            sync_run.fetch_seconds += time.perf_counter() - waited
+            yield page
+
+    started = time.perf_counter()
+    try:
+        sync_run.fetch_seconds = 0.0
+        await _aupdate(sync_run, status='running', stage='fetching')
+        seen = set() if _prune_enabled(prune) else None
+        counts = await aingest_pages(timed_pages(fetch_pages(progress=report_progress)), seen=seen)
+        if seen is not None:
+            counts['products']['removed'] = await sync_to_async(remove_missing_products)(seen)
+        finished = time.perf_counter()
+    except Exception as exc:
+        _mark_failed(sync_run, exc, started)
+        await sync_run.asave()
+        raise
+
+    _mark_success(sync_run, counts, started, finished)
+    await sync_run.asave()
+    await sync_to_async(refresh_snapshot)()
+    return sync_run
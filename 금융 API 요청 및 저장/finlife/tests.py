@@ -1,3 +1,1079 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import io
+import json
+import tempfile
+from base64 import b64encode
+from datetime import timedelta
 
-# Create your tests here.
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import fastpath, metrics
+from .bench import StubFinlifeServer, SyntheticPages
+from .cache import bump_catalog_version, get_cache
+from .calculator import RateColumns, clear_columns, top_payouts
+from .client import CircuitBreaker, CircuitOpenError, FinlifeClient, get_async_client
+from .crawler import aiter_deposit_pages, crawl_deposit_products, iter_deposit_pages
+from .export import COLUMNS as EXPORT_COLUMNS
+from .fastpath import product_values, serialize_products
+from .filters import OPTION_SORTS, PRODUCT_SORTS, filter_options, filter_products, get_ordering
+from .ingest import CHUNK_SIZE, ingest_deposit_products, ingest_pages
+from .jobs import drain_queue
+from .models import DepositOptions, DepositProducts, RateHistory, SyncRun
+from .serializers import DepositProductsSerializer, DepositProductsWithOptionsSerializer
+from .routers import READ_ALIAS, FinlifeReadRouter
+from .search import search_products
+from .snapshot import clear_snapshot, get_snapshot
+from .streaming import ResultItemStream
+from .sync import arun_sync, run_sync
+
+
+# ----------------------------------------------------
+# 스텁 서버 페이지 (depositProductsSearch.json 응답 result)
+# ----------------------------------------------------
+def make_stub_pages(groups, pages_per_group, products_per_page=3):
+    pages = {}
+    for group in groups:
+        for page_no in range(1, pages_per_group + 1):
+            base_list, option_list = [], []
+            for i in range(products_per_page):
+                code = f'{group}-{page_no}-{i}'
+                base_list.append({
+                    'fin_prdt_cd': code, 'kor_co_nm': f'{group}은행',
+                    'fin_prdt_nm': f'상품 {code}', 'join_deny': '1',
+                })
+                option_list.append({
+                    'fin_prdt_cd': code, 'save_trm': '12', 'intr_rate': 3.0,
+                    'intr_rate2': 3.5, 'intr_rate_type': 'S', 'intr_rate_type_nm': '단리',
+                })
+            pages[(group, page_no)] = {
+                'err_cd': '000', 'max_page_no': pages_per_group, 'now_page_no': page_no,
+                'baseList': base_list, 'optionList': option_list,
+            }
+    return pages
+
+
+class IngestTests(TestCase):
+    def payload(self, count):
+        products = [{'fin_prdt_cd': f'P{i:04d}', 'kor_co_nm': '은행', 'fin_prdt_nm': f'상품 {i}'} for i in range(count)]
+        options = [
+            {'fin_prdt_cd': product['fin_prdt_cd'], 'save_trm': save_trm, 'intr_rate': 3.0, 'intr_rate2': 3.5,
+             'intr_rate_type': 'S', 'intr_rate_type_nm': '단리'}
+            for product in products for save_trm in ('12', '24')
+        ]
+        return products, options
+
+    def test_counts_inserted_updated_and_unchanged(self):
+        products, options = self.payload(3)
+        counts = ingest_deposit_products(products, options)
+        self.assertEqual(counts['products'], {'inserted': 3, 'updated': 0, 'unchanged': 0, 'skipped': 0})
+        self.assertEqual(counts['options'], {'inserted': 6, 'updated': 0, 'unchanged': 0, 'removed': 0})
+
+        # 상품 필드 하나, 다른 상품의 옵션 금리 하나를 바꿉니다. 같은 키가 두 번 오면 마지막 값이 이깁니다.
+        products[0]['fin_prdt_nm'] = '이름 변경'
+        options[2]['intr_rate2'] = 4.0
+        options.append({**options[3], 'intr_rate': 2.0})
+        counts = ingest_deposit_products(products, options)
+        # 옵션만 바뀐 상품과 해시가 같아 건너뛴 상품은 모두 unchanged 로 셉니다.
+        self.assertEqual(counts['products'], {'inserted': 0, 'updated': 1, 'unchanged': 2, 'skipped': 1})
+        self.assertEqual(counts['options'], {'inserted': 0, 'updated': 2, 'unchanged': 4, 'removed': 0})
+        self.assertEqual(DepositProducts.objects.get(fin_prdt_cd='P0000').fin_prdt_nm, '이름 변경')
+        self.assertEqual(
+            list(DepositOptions.objects.filter(product__fin_prdt_cd='P0001').order_by('save_trm')
+                                       .values_list('intr_rate', 'intr_rate2')),
+            [(3.0, 4.0), (2.0, 3.5)],
+        )
+
+    def test_writes_across_chunk_boundaries(self):
+        products, options = self.payload(CHUNK_SIZE * 2 + 1)
+        counts = ingest_deposit_products(products, options)
+        self.assertEqual(counts['products']['inserted'], CHUNK_SIZE * 2 + 1)
+        self.assertEqual(counts['options']['inserted'], (CHUNK_SIZE * 2 + 1) * 2)
+        self.assertEqual(DepositProducts.objects.count(), CHUNK_SIZE * 2 + 1)
+        # 청크마다 따로 조회한 상품 id 로 옵션이 올바른 상품에 연결되어야 합니다.
+        linked = DepositProducts.objects.annotate(count=Count('options')).values_list('count', flat=True)
+        self.assertEqual(set(linked), {2})
+
+        # 청크 크기를 줄여도 결과는 같습니다.
+        products[-1]['kor_co_nm'] = '다른 은행'
+        counts = ingest_deposit_products(products, options, chunk_size=7)
+        self.assertEqual((counts['products']['updated'], counts['products']['unchanged']), (1, CHUNK_SIZE * 2))
+
+    def test_unchanged_payload_is_skipped_by_content_hash(self):
+        products, options = self.payload(5)
+        ingest_deposit_products(products, options)
+
+        with CaptureQueriesContext(connection) as queries:
+            counts = ingest_deposit_products(products, options)
+        self.assertEqual(counts['products']['skipped'], 5)
+        self.assertEqual(counts['options']['unchanged'], 10)
+        # 해시가 같으면 옵션을 읽지도, 아무것도 쓰지도 않습니다.
+        statements = [query['sql'].split()[0].upper() for query in queries]
+        self.assertNotIn('INSERT', statements)
+        self.assertNotIn('UPDATE', statements)
+        self.assertFalse(any('finlife_depositoptions' in query['sql'] for query in queries))
+
+
+class CrawlerTests(TestCase):
+    def test_crawls_every_page_of_every_group(self):
+        groups = ('020000', '030300')
+        with StubFinlifeServer(make_stub_pages(groups, pages_per_group=4)) as stub:
+            payload = crawl_deposit_products(url=stub.url, auth='test', groups=groups, max_workers=4)
+
+        self.assertEqual(sorted(stub.requests), [(g, p) for g in groups for p in range(1, 5)])
+        self.assertEqual(len(payload['baseList']), 2 * 4 * 3)
+        self.assertEqual(len(payload['optionList']), 2 * 4 * 3)
+        # 병합 결과는 권역 → 페이지 순서를 유지합니다.
+        self.assertEqual(payload['baseList'][0]['fin_prdt_cd'], '020000-1-0')
+        self.assertEqual(payload['baseList'][-1]['fin_prdt_cd'], '030300-4-2')
+
+
+class ClientTests(TestCase):
+    def test_retries_transient_errors_and_counts_calls(self):
+        pages = make_stub_pages(('020000',), pages_per_group=1)
+        client = FinlifeClient(max_retries=3, sleep=lambda seconds: None)
+        with StubFinlifeServer(pages, fail_first=2) as stub:
+            data = client.get_json(stub.url, params={'topFinGrpNo': '020000', 'pageNo': 1})
+
+        self.assertEqual(data['result']['now_page_no'], 1)
+        stats = client.stats.as_dict()
+        self.assertEqual((stats['calls'], stats['failures'], stats['retries']), (3, 2, 2))
+        self.assertGreater(stats['total_bytes'], 0)
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        # reset_timeout 이 지나면 시험 호출(half-open)을 허용합니다.
+        now[0] = 10
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        breaker.before_call()
+        # 시험 호출은 하나만 내보내고, 결과가 나올 때까지 다른 호출은 막습니다.
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.before_call()
+        breaker.before_call()
+
+    def test_final_error_response_is_closed_in_stream_mode(self):
+        client = FinlifeClient(max_retries=1, sleep=lambda seconds: None)
+        with StubFinlifeServer(make_stub_pages(('020000',), pages_per_group=1), fail_first=2) as stub:
+            with self.assertRaises(requests.HTTPError) as raised:
+                client.get(stub.url, params={'topFinGrpNo': '020000', 'pageNo': 1}, stream=True)
+        self.assertEqual(raised.exception.response.status_code, 503)
+        self.assertTrue(raised.exception.response.raw.closed)
+
+    def test_async_client_is_closed_with_its_loop(self):
+        async def shared_client():
+            client = get_async_client()
+            self.assertIs(get_async_client(), client)
+            return client
+
+        client = asyncio.run(shared_client())
+        self.assertTrue(client.session.is_closed)
+
+
+class SyncTests(TestCase):
+    def payload(self):
+        pages = make_stub_pages(('020000',), pages_per_group=2)
+        return {
+            'baseList': [item for page in pages.values() for item in page['baseList']],
+            'optionList': [item for page in pages.values() for item in page['optionList']],
+        }
+
+    def test_unchanged_products_are_skipped(self):
+        payload = self.payload()
+        first = run_sync(fetch_pages=lambda progress: [payload])
+        self.assertEqual((first.products_inserted, first.options_inserted), (6, 6))
+
+        # 옵션 금리 하나만 바뀌면 그 상품만 다시 쓰고 나머지는 해시 비교로 건너뜁니다.
+        payload['optionList'][0]['intr_rate'] = 4.0
+        second = run_sync(fetch_pages=lambda progress: [payload])
+        self.assertEqual(second.status, 'success')
+        self.assertEqual(second.products_skipped, 5)
+        self.assertEqual((second.options_updated, second.options_unchanged), (1, 5))
+        self.assertEqual(DepositOptions.objects.get(product__fin_prdt_cd='020000-1-0').intr_rate, 4.0)
+        self.assertEqual(SyncRun.objects.count(), 2)
+
+
+@override_settings(FINLIFE_SYNC_IN_PROCESS=False)
+class SyncJobTests(TestCase):
+    def test_endpoint_enqueues_and_reports_progress(self):
+        response = self.client.post('/finlife/save-products/')
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['job_id']
+        # 이미 등록된 작업이 있으면 같은 작업을 돌려줍니다.
+        self.assertEqual(self.client.post('/finlife/save-products/').json()['job_id'], job_id)
+        self.assertEqual(self.client.get(f'/finlife/sync-jobs/{job_id}/').json()['status'], 'queued')
+
+        pages = make_stub_pages(('020000',), pages_per_group=3)
+        with StubFinlifeServer(pages) as stub:
+            fetch = lambda progress: iter_deposit_pages(
+                url=stub.url, auth='test', groups=('020000',), progress=progress,
+            )
+            drain_queue(fetch_pages=fetch)
+
+        job = self.client.get(f'/finlife/sync-jobs/{job_id}/').json()
+        self.assertEqual(job['status'], 'success')
+        self.assertEqual((job['pages_fetched'], job['pages_total']), (3, 3))
+        self.assertEqual(job['products_inserted'], 9)
+
+    def test_failure_does_not_expose_api_key(self):
+        job_id = self.client.post('/finlife/save-products/').json()['job_id']
+        client = FinlifeClient(max_retries=0, sleep=lambda seconds: None)
+        with StubFinlifeServer(make_stub_pages(('020000',), pages_per_group=1), fail_first=1) as stub:
+            fetch = lambda progress: iter_deposit_pages(
+                url=stub.url, auth='SECRETKEY123', groups=('020000',), progress=progress,
+                fetch=lambda url, auth, group, page_no: client.get_json(
+                    url, params={'auth': auth, 'topFinGrpNo': group, 'pageNo': page_no},
+                ),
+            )
+            with self.assertLogs('finlife.jobs', 'ERROR') as logs:
+                drain_queue(fetch_pages=fetch)
+
+        response = self.client.get(f'/finlife/sync-jobs/{job_id}/')
+        self.assertEqual(response.json()['status'], 'failed')
+        self.assertNotIn('error', response.json())
+        self.assertNotIn('SECRETKEY123', response.content.decode())
+        # 운영자용 요약에는 예외 종류와 URL 경로만 남습니다.
+        error = SyncRun.objects.get(pk=job_id).error
+        self.assertTrue(error.startswith('HTTPError: 503'))
+        self.assertIn(stub.url, error)
+        self.assertNotIn('SECRETKEY123', error + ''.join(logs.output))
+
+    def test_stale_job_is_failed_instead_of_reused(self):
+        stale = timezone.now() - timedelta(seconds=settings.FINLIFE_SYNC_STALE_SECONDS + 60)
+        # 실행 중에 프로세스가 죽은 작업 (heartbeat 가 멈춤) 과, 실행되지 못한 채 남은 작업
+        running = SyncRun.objects.create(status='running', heartbeat_at=stale)
+        queued = SyncRun.objects.create(status='queued')
+        SyncRun.objects.filter(pk=queued.pk).update(started_at=stale)
+
+        with self.assertLogs('finlife.jobs', 'WARNING'):
+            job_id = self.client.post('/finlife/save-products/').json()['job_id']
+        self.assertNotIn(job_id, (running.pk, queued.pk))
+        for sync_run in SyncRun.objects.filter(pk__in=(running.pk, queued.pk)):
+            self.assertEqual(sync_run.status, 'failed')
+            self.assertTrue(sync_run.error.startswith('TimeoutError'))
+
+        # heartbeat 가 최근이면 오래 걸리는 작업이라도 그대로 재사용합니다.
+        SyncRun.objects.filter(pk=job_id).update(status='running', heartbeat_at=timezone.now(), started_at=stale)
+        self.assertEqual(self.client.post('/finlife/save-products/').json()['job_id'], job_id)
+
+
+class StreamingTests(TestCase):
+    def test_parses_items_across_chunk_boundaries(self):
+        result = make_stub_pages(('020000',), pages_per_group=1)[('020000', 1)]
+        body = json.dumps({'result': result}, ensure_ascii=False).encode()
+        # 한글(UTF-8 멀티바이트)과 숫자가 청크 경계에서 잘리도록 7바이트씩 나눕니다.
+        chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+
+        stream = ResultItemStream(chunks)
+        items = list(stream)
+        self.assertEqual([item for name, item in items if name == 'baseList'], result['baseList'])
+        self.assertEqual([item for name, item in items if name == 'optionList'], result['optionList'])
+        self.assertEqual(stream.meta['max_page_no'], 1)
+
+    def test_ingests_pages_in_fixed_size_batches(self):
+        pages = make_stub_pages(('020000',), pages_per_group=3).values()
+        counts = ingest_pages(iter(pages), batch_size=4)
+        self.assertEqual(counts['products']['inserted'], 9)
+        self.assertEqual(counts['options']['inserted'], 9)
+        self.assertEqual(DepositOptions.objects.count(), 9)
+
+
+class PaginationTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_pages_through_catalog_without_offset(self):
+        payload = {
+            'baseList': [
+                {'fin_prdt_cd': f'P{i:03d}', 'kor_co_nm': '은행', 'fin_prdt_nm': f'상품{i}'}
+                for i in range(25)
+            ],
+            'optionList': [],
+        }
+        run_sync(fetch_pages=lambda progress: [payload])
+
+        codes, url = [], '/finlife/deposit-products/?page_size=10'
+        with CaptureQueriesContext(connection) as queries:
+            while url:
+                page = self.client.get(url).json()
+                codes.extend(product['fin_prdt_cd'] for product in page['results'])
+                url = page['next']
+
+        self.assertEqual(codes, [f'P{i:03d}' for i in range(25)])
+        self.assertFalse(any('OFFSET' in query['sql'] for query in queries.captured_queries))
+
+    def follow(self, url):
+        rows, pages = [], 0
+        while url:
+            page = self.client.get(url).json()
+            rows.extend(page['results'])
+            url = page['next']
+            pages += 1
+            self.assertLess(pages, 100)
+        return rows, page
+
+    def test_ties_beyond_offset_cutoff_are_returned_once(self):
+        # DRF 커서는 같은 값이 1000 행(offset_cutoff)을 넘으면 행을 빠뜨리거나 반복합니다.
+        count = 1500
+        payload = {
+            'baseList': [
+                {'fin_prdt_cd': f'T{i:04d}', 'kor_co_nm': '같은은행', 'fin_prdt_nm': f'상품{i}'}
+                for i in range(count)
+            ],
+            'optionList': [
+                {'fin_prdt_cd': f'T{i:04d}', 'save_trm': 12, 'intr_rate': 3.0, 'intr_rate2': 3.5,
+                 'intr_rate_type': 'S', 'intr_rate_type_nm': '단리'}
+                for i in range(count)
+            ],
+        }
+        run_sync(fetch_pages=lambda progress: [payload])
+
+        for url in ('/finlife/deposit-products/?sort=kor_co_nm&page_size=100',
+                    '/finlife/deposit-products/?sort=-kor_co_nm&page_size=100'):
+            rows, _ = self.follow(url)
+            codes = [row['fin_prdt_cd'] for row in rows]
+            self.assertEqual(len(codes), count)
+            self.assertEqual(len(set(codes)), count)
+
+        rows, last = self.follow('/finlife/deposit-options/?sort=-intr_rate2&page_size=100')
+        ids = [row['id'] for row in rows]
+        self.assertEqual(len(ids), count)
+        self.assertEqual(ids, sorted(set(ids)))
+
+        # 이전 페이지 링크도 같은 커서로 거꾸로 이어집니다.
+        previous = self.client.get(last['previous']).json()
+        self.assertEqual([row['id'] for row in previous['results']], ids[-200:-100])
+
+    def test_cursor_values_must_match_ordering_field_types(self):
+        run_sync(fetch_pages=lambda progress: make_stub_pages(('020000',), pages_per_group=1).values())
+        cursor = lambda *position: b64encode(json.dumps({'p': list(position)}).encode()).decode()
+        bad = (
+            f"deposit-products/?cursor={cursor(['abc'])}",
+            f"deposit-products/?cursor={cursor(True)}",
+            f"deposit-products/?sort=kor_co_nm&cursor={cursor(1, 2)}",
+            f"deposit-options/?cursor={cursor([1], 2)}",
+            f"deposit-options/?cursor={cursor('3.5', 2)}",
+        )
+        for url in bad:
+            response = self.client.get(f'/finlife/{url}', HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 404, url)
+            self.assertEqual(response.json(), {'detail': 'Invalid cursor'}, url)
+
+        # 금리 커서에는 정수도 들어올 수 있습니다. (JSON 으로는 3 과 3.0 이 구분되지 않음)
+        response = self.client.get(f"/finlife/deposit-options/?cursor={cursor(4, 0)}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 3)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.payload = make_stub_pages(('020000',), pages_per_group=1)[('020000', 1)]
+        run_sync(fetch_pages=lambda progress: [self.payload])
+
+    def test_cache_hit_skips_orm_and_answers_304(self):
+        url = '/finlife/top-rate/'
+        first = self.client.get(url)
+        etag = first['ETag']
+        self.assertFalse(etag.startswith('W/'))
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_browsable_api_html_is_not_cached(self):
+        url = '/finlife/top-rate/'
+        first = self.client.get(url, HTTP_ACCEPT='text/html')
+        self.assertTrue(first['Content-Type'].startswith('text/html'))
+        self.assertNotIn('ETag', first)
+
+        # HTML 에는 CSRF 토큰 / 사용자 이름이 들어 있으므로 매번 뷰에서 다시 그립니다.
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, HTTP_ACCEPT='text/html')
+        self.assertGreater(len(queries), 0)
+
+    def test_sync_with_changes_bumps_version(self):
+        url = '/finlife/deposit-product-options/020000-1-0/'
+        etag = self.client.get(url)['ETag']
+        # 바뀐 것이 없는 동기화는 버전을 올리지 않습니다.
+        run_sync(fetch_pages=lambda progress: [self.payload])
+        # TestCase 안에서는 on_commit 이 실행되지 않으므로 캐시된 버전 번호를 직접 비웁니다.
+        get_cache().clear()
+        self.assertEqual(self.client.get(url)['ETag'], etag)
+
+        self.payload['baseList'][0]['fin_prdt_nm'] = '이름 변경'
+        run_sync(fetch_pages=lambda progress: [self.payload])
+        get_cache().clear()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['fin_prdt_nm'], '이름 변경')
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def option(self, code, save_trm, rate_type, rate2):
+        return {
+            'fin_prdt_cd': code, 'save_trm': save_trm, 'intr_rate': 1.0, 'intr_rate2': rate2,
+            'intr_rate_type': rate_type, 'intr_rate_type_nm': '단리' if rate_type == 'S' else '복리',
+        }
+
+    def test_leaderboards_are_refreshed_incrementally(self):
+        payload = {
+            'baseList': [{'fin_prdt_cd': code, 'kor_co_nm': '은행', 'fin_prdt_nm': code} for code in 'ABC'],
+            'optionList': [
+                self.option('A', 12, 'S', 3.0), self.option('A', 24, 'S', 3.5),
+                self.option('B', 12, 'M', 3.2), self.option('C', 12, 'S', None),
+            ],
+        }
+        run_sync(fetch_pages=lambda progress: [payload])
+
+        self.assertEqual(self.client.get('/finlife/top-rate/').json()['intr_rate2'], 3.5)
+        ranked = self.client.get('/finlife/top-rate/?term=12&n=5').json()
+        # intr_rate2 가 없는(-1) 옵션은 순위에서 빠집니다.
+        self.assertEqual([(o['product']['fin_prdt_cd'], o['intr_rate2']) for o in ranked], [('B', 3.2), ('A', 3.0)])
+
+        # C 의 12개월 옵션 금리만 바뀌면 그 옵션이 속한 순위표에 바로 반영됩니다.
+        payload['optionList'][3]['intr_rate2'] = 4.0
+        run_sync(fetch_pages=lambda progress: [payload])
+        get_cache().clear()
+        ranked = self.client.get('/finlife/top-rate/?term=12&type=S&n=5').json()
+        self.assertEqual([o['product']['fin_prdt_cd'] for o in ranked], ['C', 'A'])
+        self.assertEqual(self.client.get('/finlife/top-rate/').json()['intr_rate2'], 4.0)
+
+    @override_settings(FINLIFE_LEADERBOARD_SIZE=5)
+    def test_n_outside_leaderboard_size_is_rejected(self):
+        for n in ('0', '-1', '6'):
+            self.assertEqual(self.client.get(f'/finlife/top-rate/?n={n}').status_code, 400, n)
+            self.assertEqual(self.client.get(f'/finlife/async/top-rate/?n={n}').status_code, 400, n)
+
+
+class NestedListingTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        pages = make_stub_pages(('020000',), pages_per_group=20, products_per_page=5)
+        run_sync(fetch_pages=lambda progress: pages.values())
+
+    def test_nested_listing_uses_fixed_number_of_queries(self):
+        for page_size in (5, 100):
+            get_cache().clear()
+            # 카탈로그 버전 1 + 상품 페이지 1 + 옵션 prefetch 1
+            with self.assertNumQueries(3):
+                page = self.client.get(f'/finlife/deposit-products/?nested=1&page_size={page_size}').json()
+            self.assertEqual(len(page['results']), page_size)
+            self.assertEqual(page['results'][0]['options'][0]['save_trm'], 12)
+
+    def test_fast_path_matches_serializers(self):
+        products = DepositProducts.objects.prefetch_related('options').order_by('id')[:30]
+        for nested, serializer_class in ((False, DepositProductsSerializer), (True, DepositProductsWithOptionsSerializer)):
+            get_cache().clear()
+            url = f"/finlife/deposit-products/?page_size=30{'&nested=1' if nested else ''}"
+            expected = json.loads(json.dumps(serializer_class(products, many=True).data))
+            self.assertEqual(self.client.get(url).json()['results'], expected)
+
+    def test_json_fallback_matches_orjson_bytes(self):
+        data = serialize_products(list(product_values(DepositProducts.objects.order_by('id')[:10])), nested=True)
+        encoded = fastpath.dumps(data)
+        # orjson 이 설치되지 않은 환경에서도 응답 바이트가 같아야 ETag / 캐시가 환경마다 달라지지 않습니다.
+        installed, fastpath.orjson = fastpath.orjson, None
+        try:
+            self.assertEqual(fastpath.dumps(data), encoded)
+        finally:
+            fastpath.orjson = installed
+
+    def test_batch_lookup_uses_fixed_number_of_queries(self):
+        codes = list(DepositProducts.objects.order_by('id').values_list('fin_prdt_cd', flat=True)[:50])
+        for batch in (codes[:2], codes):
+            get_cache().clear()
+            # 상품 1 + 옵션 1 (POST 는 응답 캐시를 거치지 않습니다)
+            with self.assertNumQueries(2):
+                response = self.client.post(
+                    '/finlife/deposit-product-options/', {'fin_prdt_cds': [*batch, 'NOPE']}, content_type='application/json',
+                ).json()
+            self.assertEqual([item['fin_prdt_cd'] for item in response['results']], [*batch, 'NOPE'])
+            self.assertEqual(response['results'][0]['options'][0]['save_trm'], 12)
+            self.assertIn('error', response['results'][-1])
+            self.assertEqual(response['missing'], ['NOPE'])
+
+        response = self.client.get(f'/finlife/deposit-product-options/?fin_prdt_cd={codes[0]},{codes[1]}').json()
+        self.assertEqual(len(response['results']), 2)
+
+    def test_option_str_does_not_query_product(self):
+        options = list(DepositOptions.objects.all()[:10])
+        with self.assertNumQueries(0):
+            [str(option) for option in options]
+
+
+class FilterTests(TestCase):
+    PRODUCT_QUERIES = (
+        'kor_co_nm=은행', 'join_deny=1', 'kor_co_nm=은행&join_deny=1', 'join_deny=2&sort=kor_co_nm',
+        'kor_co_nm=은행&sort=-kor_co_nm', 'save_trm=12', 'save_trm=12&intr_rate_type=S&min_intr_rate2=3',
+    )
+    OPTION_QUERIES = (
+        'save_trm=12', 'intr_rate_type=S', 'min_intr_rate2=3', 'max_intr_rate=2&sort=intr_rate',
+        'save_trm=12&intr_rate_type=S', 'save_trm=12&min_intr_rate=2&sort=-intr_rate',
+        'intr_rate_type=M&sort=intr_rate2', 'save_trm=36&intr_rate_type=M&min_intr_rate2=3&sort=-intr_rate2',
+    )
+
+    def assert_uses_index(self, queryset, query):
+        plan = queryset.explain()
+        for line in plan.splitlines():
+            # 테이블에 접근하는 모든 단계가 인덱스(또는 기본키)를 써야 하고, 정렬용 임시 B-tree 가 없어야 합니다.
+            if ' finlife_' in line or ' U0 ' in line:
+                self.assertIn('USING', line, f'{query}: {plan}')
+        self.assertNotIn('TEMP B-TREE', plan, f'{query}: {plan}')
+
+    def test_supported_filter_combinations_use_indexes(self):
+        for query in self.PRODUCT_QUERIES:
+            params = QueryDict(query)
+            queryset = filter_products(DepositProducts.objects.all(), params)
+            self.assert_uses_index(queryset.order_by(*get_ordering(params, PRODUCT_SORTS, 'id'))[:100], query)
+
+        for query in self.OPTION_QUERIES:
+            params = QueryDict(query)
+            queryset = filter_options(DepositOptions.objects.all(), params)
+            self.assert_uses_index(queryset.order_by(*get_ordering(params, OPTION_SORTS, '-intr_rate2'))[:100], query)
+
+    def test_filters_and_sorts_through_the_api(self):
+        get_cache().clear()
+        run_sync(fetch_pages=lambda progress: make_stub_pages(('020000',), pages_per_group=2).values())
+        DepositOptions.objects.filter(product__fin_prdt_cd='020000-2-1').update(intr_rate2=5.0, intr_rate_type='M')
+
+        options = self.client.get('/finlife/deposit-options/?intr_rate_type=M&min_intr_rate2=4').json()['results']
+        self.assertEqual([o['product']['fin_prdt_cd'] for o in options], ['020000-2-1'])
+
+        products = self.client.get('/finlife/deposit-products/?min_intr_rate2=4').json()['results']
+        self.assertEqual([p['fin_prdt_cd'] for p in products], ['020000-2-1'])
+        self.assertEqual(self.client.get('/finlife/deposit-options/?sort=rate').status_code, 400)
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        base_list = [
+            {'fin_prdt_cd': 'A', 'kor_co_nm': '가나은행', 'fin_prdt_nm': '청년우대적금', 'join_member': '만 19~34세 청년'},
+            {'fin_prdt_cd': 'B', 'kor_co_nm': '다라은행', 'fin_prdt_nm': '정기예금', 'spcl_cnd': '청년 고객 급여이체 시 우대금리'},
+            {'fin_prdt_cd': 'C', 'kor_co_nm': '마바은행', 'fin_prdt_nm': '시니어예금', 'spcl_cnd': '우대금리 없음'},
+        ]
+        run_sync(fetch_pages=lambda progress: [{'baseList': base_list, 'optionList': []}])
+
+    def test_search_ranks_and_highlights_matches(self):
+        results = self.client.get('/finlife/search/', {'q': '청년 우대'}).json()
+        # 붙여 쓴 "청년우대" 도 찾고, 상품명에서 일치한 상품이 먼저 옵니다.
+        self.assertEqual([r['fin_prdt_cd'] for r in results], ['A', 'B'])
+        self.assertEqual(results[0]['highlights']['fin_prdt_nm'], '<mark>청년</mark><mark>우대</mark>적금')
+        self.assertIn('<mark>청년</mark>', results[1]['highlights']['spcl_cnd'])
+        self.assertEqual(self.client.get('/finlife/search/').status_code, 400)
+
+    def test_index_is_updated_by_ingestion(self):
+        base_list = [{'fin_prdt_cd': 'C', 'kor_co_nm': '마바은행', 'fin_prdt_nm': '청년도약예금'}]
+        run_sync(fetch_pages=lambda progress: [{'baseList': base_list, 'optionList': []}])
+        self.assertEqual([r['fin_prdt_cd'] for r in search_products('도약')], ['C'])
+        self.assertEqual([r['fin_prdt_cd'] for r in search_products('시니어')], [])
+
+
+class RateHistoryTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def sync(self, rates):
+        payload = {
+            'baseList': [{'fin_prdt_cd': code, 'kor_co_nm': '은행', 'fin_prdt_nm': code} for code in rates],
+            'optionList': [
+                {'fin_prdt_cd': code, 'save_trm': 12, 'intr_rate': 2.0, 'intr_rate2': rate2,
+                 'intr_rate_type': 'S', 'intr_rate_type_nm': '단리'}
+                for code, rate2 in rates.items()
+            ],
+        }
+        run_sync(fetch_pages=lambda progress: [payload])
+        get_cache().clear()
+
+    def test_history_records_changes_only(self):
+        self.sync({'A': 3.0, 'B': 3.0, 'C': 3.0})
+        self.sync({'A': 3.0, 'B': 3.0, 'C': 3.0})
+        self.assertEqual(RateHistory.objects.count(), 3)
+
+        # 첫 기록을 60일 전으로 옮기고, 그 뒤 A / B 의 금리가 바뀐 것으로 만듭니다.
+        past = timezone.now() - timedelta(days=60)
+        RateHistory.objects.update(recorded_at=past)
+        self.sync({'A': 3.2, 'B': 2.5, 'C': 3.0})
+        self.assertEqual(RateHistory.objects.count(), 5)
+
+        movers = self.client.get('/finlife/rate-movers/?days=30').json()
+        self.assertEqual([(m['product']['fin_prdt_cd'], round(m['change'], 2)) for m in movers], [('B', -0.5), ('A', 0.2)])
+        self.assertEqual(self.client.get('/finlife/rate-movers/?days=90').json(), [])
+        for days in ('0', '-5', '3651', '99999999999'):
+            self.assertEqual(self.client.get(f'/finlife/rate-movers/?days={days}').status_code, 400, days)
+
+        series = self.client.get('/finlife/rate-history/A/?term=12').json()['series']
+        self.assertEqual([point['intr_rate2'] for point in series[0]['points']], [3.0, 3.2])
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        series = self.client.get(f'/finlife/rate-history/A/?since={since}').json()['series']
+        # since 시점에 유효했던 금리가 첫 점으로 들어갑니다.
+        self.assertEqual([point['intr_rate2'] for point in series[0]['points']], [3.0, 3.2])
+
+
+class CalculatorTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        clear_columns()
+        clear_snapshot()
+        payload = {
+            'baseList': [
+                {'fin_prdt_cd': 'S', 'kor_co_nm': '은행', 'fin_prdt_nm': '단리예금'},
+                {'fin_prdt_cd': 'M', 'kor_co_nm': '은행', 'fin_prdt_nm': '복리예금'},
+                {'fin_prdt_cd': 'L', 'kor_co_nm': '은행', 'fin_prdt_nm': '한도예금', 'max_limit': 5000000},
+            ],
+            'optionList': [
+                {'fin_prdt_cd': 'S', 'save_trm': 12, 'intr_rate': 3.0, 'intr_rate2': 3.6, 'intr_rate_type': 'S', 'intr_rate_type_nm': '단리'},
+                {'fin_prdt_cd': 'M', 'save_trm': 12, 'intr_rate': 3.0, 'intr_rate2': 3.55, 'intr_rate_type': 'M', 'intr_rate_type_nm': '복리'},
+                {'fin_prdt_cd': 'M', 'save_trm': 24, 'intr_rate': 3.0, 'intr_rate2': 3.0, 'intr_rate_type': 'M', 'intr_rate_type_nm': '복리'},
+                {'fin_prdt_cd': 'L', 'save_trm': 12, 'intr_rate': 4.0, 'intr_rate2': 4.0, 'intr_rate_type': 'S', 'intr_rate_type_nm': '단리'},
+            ],
+        }
+        run_sync(fetch_pages=lambda progress: [payload])
+
+    def test_batch_ranks_after_tax_payout(self):
+        response = self.client.post('/finlife/calculator/', {
+            'queries': [{'amount': 10000000, 'term': 12}, {'amount': 1000000, 'term': 12}, {'amount': 1000000, 'term': 24}],
+            'k': 2,
+        }, content_type='application/json').json()
+
+        # 1,000만원은 한도(500만원) 상품에 가입할 수 없고, 월복리 3.55% 가 단리 3.6% 보다 많이 줍니다.
+        self.assertEqual([r['fin_prdt_cd'] for r in response[0]['results']], ['M', 'S'])
+        interest = 10000000 * ((1 + 0.0355 / 12) ** 12 - 1)
+        self.assertEqual(response[0]['results'][0]['payout'], round(10000000 + interest * (1 - 0.154)))
+        self.assertEqual(response[0]['results'][1]['interest'], 360000)
+        self.assertEqual([r['fin_prdt_cd'] for r in response[1]['results']], ['L', 'M'])
+        self.assertEqual([r['save_trm'] for r in response[2]['results']], [24])
+
+        single = self.client.get('/finlife/calculator/?amount=1000000&term=12&tax=exempt&k=1').json()
+        self.assertEqual(single[0]['results'][0]['payout'], 1040000)
+        self.assertEqual(self.client.get('/finlife/calculator/?amount=0&term=12').status_code, 400)
+
+    def test_snapshot_is_built_only_when_enabled(self):
+        from . import snapshot
+
+        url = '/finlife/calculator/?amount=1000000&term=12&k=3'
+        expected = self.client.get(url).json()
+        self.assertIsNone(snapshot._snapshot)
+        get_cache().clear()
+        with override_settings(FINLIFE_SNAPSHOT=True):
+            self.assertEqual(self.client.get(url).json(), expected)
+        self.assertIsNotNone(snapshot._snapshot)
+
+    def test_ties_at_kth_payout_are_broken_by_option_id(self):
+        # 같은 금리 옵션 20개 (id 순서를 섞어 둠) 중 3개만 고르면 항상 id 가 작은 순서로 나와야 합니다.
+        ids = [17, 4, 11, 20, 2, 9, 14, 6, 19, 1, 12, 8, 15, 3, 18, 10, 5, 16, 7, 13]
+        columns = RateColumns([(option_id, 12, 3.0, 3.5, 'S', None) for option_id in ids] + [(99, 12, 3.0, 4.0, 'S', None)])
+        results = top_payouts([(1000000, 12)], k=4, columns=columns)
+        self.assertEqual([option_id for option_id, *_ in results[0]], [99, 1, 2, 3])
+
+
+class FixtureTests(TestCase):
+    FIXTURE = settings.BASE_DIR / 'finlife' / 'fixtures' / 'deposit_products.json'
+
+    def setUp(self):
+        get_cache().clear()
+
+    def test_load_and_dump_round_trip(self):
+        with open(self.FIXTURE, 'rb') as fp:
+            records = json.load(fp)
+        call_command('load_deposit_fixture', str(self.FIXTURE), '--batch-size', '7', stdout=io.StringIO())
+        self.assertEqual(DepositProducts.objects.count(), sum(r['model'] == 'finlife.depositproducts' for r in records))
+        self.assertEqual(DepositOptions.objects.count(), sum(r['model'] == 'finlife.depositoptions' for r in records))
+        # 동기화와 같은 파생 데이터도 갱신됩니다.
+        self.assertEqual(RateHistory.objects.count(), DepositOptions.objects.count())
+        self.assertEqual(self.client.get('/finlife/top-rate/').status_code, 200)
+
+        dumped = io.StringIO()
+        call_command('dump_deposit_fixture', '-', '--format', 'json', '--batch-size', '7', stdout=dumped)
+        self.assertEqual(
+            [(r['model'], r['fields']) for r in json.loads(dumped.getvalue())],
+            [(r['model'], r['fields']) for r in records],
+        )
+
+        compact = io.StringIO()
+        call_command('dump_deposit_fixture', '-', '--format', 'ndjson', stdout=compact)
+        lines = compact.getvalue().splitlines()
+        self.assertEqual(len(lines), DepositProducts.objects.count())
+
+        DepositProducts.objects.all().delete()
+        from .fixtures import load_fixture
+        counts = load_fixture(io.BytesIO(compact.getvalue().encode()), 'ndjson', batch_size=10)
+        self.assertEqual(counts['products'], len(lines))
+        self.assertEqual(DepositOptions.objects.count(), counts['options']['inserted'])
+
+
+class BenchmarkTests(TestCase):
+    def test_synthetic_pages_are_deterministic(self):
+        pages = SyntheticPages(23, options_per_product=3, groups=('020000', '030300'), page_size=5, seed=7)
+        self.assertEqual(len(pages), 6)
+        self.assertEqual(pages[('030300', 3)], SyntheticPages(23, 3, ('020000', '030300'), 5, seed=7)[('030300', 3)])
+        codes = [item['fin_prdt_cd'] for page in pages.values() for item in page['baseList']]
+        self.assertEqual(len(set(codes)), 23)
+
+    def test_bench_command_emits_json_report(self):
+        output = io.StringIO()
+        call_command('bench_finlife', '--products', '30', '--options-per-product', '4', '--page-size', '4',
+                     '--repeat', '1', stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(report['results']['ingest_initial']['products_inserted'], 30)
+        self.assertEqual(report['results']['ingest_unchanged']['products_skipped'], 30)
+        for name in ('list_products', 'product_options', 'top_rate'):
+            self.assertEqual(report['results'][name]['status'], 200, name)
+            self.assertEqual(report['results'][name]['warm']['queries'], 0, name)
+        # 측정은 롤백되므로 DB 에 남지 않습니다.
+        self.assertFalse(DepositProducts.objects.exists())
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_requests_are_recorded_per_route(self):
+        self.client.get('/finlife/deposit-product-options/NOPE/')
+        with self.assertLogs('finlife.slow_requests', 'WARNING') as logs:
+            with override_settings(FINLIFE_SLOW_REQUEST_SECONDS=0):
+                self.client.get('/finlife/deposit-products/?page_size=5')
+        # 느린 요청 로그에는 실행된 SQL 이 함께 남습니다.
+        self.assertIn('finlife_depositproducts', logs.output[0])
+
+        response = self.client.get('/finlife/metrics/')
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        # 상품 코드가 아니라 URL 패턴 단위로 묶입니다.
+        self.assertIn(
+            'finlife_http_requests_total{route="finlife/deposit-product-options/<str:fin_prdt_cd>/",method="GET",status="404"}',
+            body,
+        )
+        self.assertIn('finlife_http_request_duration_seconds_bucket{route="finlife/deposit-products/",method="GET",le="+Inf"}', body)
+        self.assertIn('finlife_db_queries_per_request_count{route="finlife/deposit-products/"}', body)
+
+    def test_streaming_response_is_recorded_when_the_body_is_sent(self):
+        run_sync(fetch_pages=lambda progress: make_stub_pages(('020000',), pages_per_group=2).values())
+        route = ('finlife/export/',)
+        before = list(metrics.db_queries._values.get(route, [0, 0]))[-2:]
+
+        response = self.client.get('/finlife/export/')
+        # 본문을 보내기 전에는 아직 기록하지 않습니다.
+        self.assertEqual(list(metrics.db_queries._values.get(route, [0, 0]))[-2:], before)
+        body = b''.join(response.streaming_content)
+
+        queries, count = metrics.db_queries._values[route][-2:]
+        self.assertEqual(count, before[1] + 1)
+        # 본문을 만드는 동안 실행된 SQL (상품 / 옵션 배치 조회) 까지 셉니다.
+        self.assertGreater(queries - before[0], 0)
+        self.assertGreaterEqual(metrics.http_response_size._values[route][-2], len(body))
+
+    def test_unknown_methods_share_one_label(self):
+        self.client.generic('BREW', '/finlife/top-rate/')
+        self.assertIn(
+            'finlife_http_requests_total{route="finlife/top-rate/",method="other",status="405"}',
+            self.client.get('/finlife/metrics/').content.decode(),
+        )
+
+
+class DatabaseRouterTests(TestCase):
+    def test_reads_go_to_read_alias_outside_write_transactions(self):
+        router = FinlifeReadRouter()
+        # 테스트는 트랜잭션 안에서 돌므로, 아직 커밋하지 않은 변경을 보도록 기본 DB 에서 읽습니다.
+        self.assertEqual(router.db_for_read(DepositProducts), 'default')
+        connection.in_atomic_block = False
+        try:
+            self.assertEqual(router.db_for_read(DepositProducts), READ_ALIAS)
+        finally:
+            connection.in_atomic_block = True
+        self.assertEqual(router.db_for_write(DepositProducts), 'default')
+        # finlife 외의 앱은 라우터가 관여하지 않습니다.
+        self.assertIsNone(router.db_for_read(ContentType))
+        self.assertFalse(router.allow_migrate(READ_ALIAS, 'finlife'))
+        self.assertIsNone(router.allow_migrate('default', 'finlife'))
+
+
+class AsyncPathTests(TestCase):
+    async def test_async_sync_fetches_pages_concurrently(self):
+        groups = ('020000', '030300')
+        with StubFinlifeServer(make_stub_pages(groups, pages_per_group=3)) as stub:
+            sync_run = await arun_sync(fetch_pages=lambda progress: aiter_deposit_pages(
+                url=stub.url, auth='test', groups=groups, max_concurrency=4, progress=progress,
+            ))
+
+        self.assertEqual(sync_run.status, 'success')
+        self.assertEqual((sync_run.pages_fetched, sync_run.pages_total), (6, 6))
+        self.assertEqual(sorted(stub.requests), [(g, p) for g in groups for p in range(1, 4)])
+        self.assertEqual(await DepositProducts.objects.acount(), 2 * 3 * 3)
+
+    async def test_async_views_match_sync_views(self):
+        await sync_to_async(run_sync)(fetch_pages=lambda progress: make_stub_pages(('020000',), pages_per_group=2).values())
+        await get_cache().aclear()
+        urls = (
+            'deposit-products/?page_size=4&nested=1',
+            'deposit-product-options/020000-1-0/',
+            'deposit-product-options/?fin_prdt_cd=020000-2-1,NOPE',
+            'top-rate/?term=12&n=3',
+            'top-rate/',
+        )
+        for url in urls:
+            expected = await sync_to_async(self.client.get)(f'/finlife/{url}', HTTP_ACCEPT='application/json')
+            response = await self.async_client.get(f'/finlife/async/{url}')
+            self.assertEqual(response.status_code, 200, url)
+            # 다음 페이지 링크만 async/ 경로를 가리킵니다.
+            body = response.content.decode().replace('/finlife/async/', '/finlife/')
+            self.assertEqual(json.loads(body), expected.json(), url)
+
+        response = await self.async_client.get('/finlife/async/deposit-product-options/NOPE/')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_async_products_reject_bad_parameters_like_sync_view(self):
+        for query, status in (('sort=bad', 400), ('join_deny=abc', 400), ('cursor=zzz', 404)):
+            expected = await sync_to_async(self.client.get)(f'/finlife/deposit-products/?{query}', HTTP_ACCEPT='application/json')
+            response = await self.async_client.get(f'/finlife/async/deposit-products/?{query}')
+            self.assertEqual((response.status_code, response['Content-Type']), (status, 'application/json'), query)
+            self.assertEqual(response.json(), expected.json(), query)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        run_sync(fetch_pages=lambda progress: make_stub_pages(('020000',), pages_per_group=2).values())
+        # 옵션이 없는 상품도 옵션 칸을 비운 한 행으로 나옵니다.
+        DepositProducts.objects.create(
+            fin_prdt_cd='NO-OPTION', kor_co_nm='은행', fin_prdt_nm='옵션 없음',
+            join_way='', join_member='', etc_note='', spcl_cnd='',
+        )
+
+    def test_streams_csv_and_gzipped_ndjson(self):
+        response = self.client.get('/finlife/export/')
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(tuple(rows[0]), EXPORT_COLUMNS)
+        self.assertEqual(len(rows), 1 + 7)
+        self.assertEqual(rows[-1][:2], ['NO-OPTION', '은행'])
+        self.assertEqual(rows[-1][EXPORT_COLUMNS.index('save_trm')], '')
+
+        response = self.client.get('/finlife/export/?format=ndjson&gzip=1&kor_co_nm=020000은행')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(json.loads(lines[0])['save_trm'], 12)
+        self.assertEqual(self.client.get('/finlife/export/?format=xml').status_code, 400)
+
+    def test_bad_filter_is_rejected_before_streaming(self):
+        response = self.client.get('/finlife/export/?save_trm=abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.json(), {'save_trm': '정수여야 합니다.'})
+
+    def test_command_writes_in_batches(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f'{directory}/catalog.ndjson.gz'
+            with CaptureQueriesContext(connection) as queries:
+                call_command('export_deposit_catalog', path, '--batch-size', '3')
+            with gzip.open(path, 'rt', encoding='utf-8') as fp:
+                records = [json.loads(line) for line in fp]
+        self.assertEqual([record['fin_prdt_cd'] for record in records][-1], 'NO-OPTION')
+        self.assertEqual(len(records), 7)
+        # 상품 3개마다 상품 쿼리 1번 + 옵션 쿼리 1번 (마지막 빈 배치 확인 쿼리 포함)
+        self.assertEqual(len(queries), 3 * 2 + 1)
+
+
+class BulkCreateTests(TestCase):
+    def product(self, code, **fields):
+        return {
+            'fin_prdt_cd': code, 'kor_co_nm': '테스트은행', 'fin_prdt_nm': f'상품 {code}',
+            'join_way': '인터넷', 'join_member': '개인', 'etc_note': '없음', 'spcl_cnd': '없음', **fields,
+        }
+
+    def post(self, items):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/finlife/deposit-products/', items, content_type='application/json')
+        return response, len(queries)
+
+    def test_bulk_create_reports_errors_per_item(self):
+        DepositProducts.objects.create(**self.product('TAKEN'))
+        response, _ = self.post([
+            self.product('A'),
+            self.product('TAKEN'),
+            self.product('A'),
+            self.product('B', fin_prdt_nm=''),
+            'not an object',
+            self.product('C'),
+        ])
+
+        self.assertEqual(response.status_code, 207)
+        body = response.json()
+        self.assertEqual((body['created'], body['failed']), (2, 4))
+        self.assertEqual([item.get('status') for item in body['results']], ['created', None, None, None, None, 'created'])
+        self.assertIn('fin_prdt_cd', body['results'][1]['errors'])
+        self.assertIn('fin_prdt_cd', body['results'][2]['errors'])
+        self.assertIn('fin_prdt_nm', body['results'][3]['errors'])
+        self.assertEqual(sorted(DepositProducts.objects.values_list('fin_prdt_cd', flat=True)), ['A', 'C', 'TAKEN'])
+        # 새 상품은 검색 색인에도 들어갑니다.
+        self.assertEqual([item['fin_prdt_cd'] for item in search_products('상품 C')], ['C'])
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        # 첫 요청은 카탈로그 버전 행을 만드는 쿼리가 더 있으므로 미리 한 번 보냅니다.
+        self.post([self.product('WARM')])
+        small, small_queries = self.post([self.product(f'S{i}') for i in range(2)])
+        large, large_queries = self.post([self.product(f'L{i}') for i in range(50)])
+        self.assertEqual((small.status_code, large.status_code), (201, 201))
+        self.assertEqual(small_queries, large_queries)
+        self.assertEqual(self.post([self.product('S0')])[0].status_code, 400)
+
+
+class SnapshotTests(TestCase):
+    URLS = (
+        '/finlife/deposit-product-options/{code}/',
+        '/finlife/deposit-product-options/?fin_prdt_cd={codes},NOPE',
+        '/finlife/top-rate/',
+        '/finlife/top-rate/?term=12&type=S&n=5',
+        '/finlife/top-rate/?n=50',
+    )
+
+    def setUp(self):
+        get_cache().clear()
+        clear_snapshot()
+        pages = SyntheticPages(40, options_per_product=4, seed=3)
+        run_sync(fetch_pages=lambda progress: pages.values())
+        self.codes = list(DepositProducts.objects.order_by('id').values_list('fin_prdt_cd', flat=True)[:5])
+
+    def fetch(self, url):
+        return self.client.get(url.format(code=self.codes[0], codes=','.join(self.codes))).json()
+
+    def test_reads_match_database_without_queries(self):
+        expected = [self.fetch(url) for url in self.URLS]
+        with override_settings(FINLIFE_SNAPSHOT=True):
+            get_cache().clear()
+            self.assertEqual([self.fetch(url) for url in self.URLS], expected)
+            # 스냅샷과 카탈로그 버전이 준비되면, 응답 캐시를 빗나간 요청도 DB 를 읽지 않습니다.
+            with self.assertNumQueries(0):
+                for index, url in enumerate(self.URLS):
+                    separator = '&' if '?' in url else '?'
+                    self.assertEqual(self.fetch(f'{url}{separator}_={index}'), expected[index])
+                self.client.get('/finlife/calculator/?amount=1000000&term=12')
+
+        body = self.client.get('/finlife/metrics/').content.decode()
+        self.assertIn(f'finlife_snapshot_bytes {get_snapshot().nbytes}', body)
+
+    def test_new_version_swaps_in_a_new_snapshot(self):
+        old = get_snapshot()
+        option = DepositOptions.objects.filter(product__fin_prdt_cd=self.codes[0]).first()
+        old_rate = old.option_data(old.options.find(option.pk))['intr_rate2']
+        DepositOptions.objects.filter(pk=option.pk).update(intr_rate2=old_rate + 1)
+        # 버전이 그대로면 이전 스냅샷을 그대로 씁니다.
+        self.assertIs(get_snapshot(), old)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_catalog_version()
+        new = get_snapshot()
+        self.assertIsNot(new, old)
+        self.assertEqual(new.option_data(new.options.find(option.pk))['intr_rate2'], old_rate + 1)
+        # 이전 스냅샷은 바뀌지 않으므로 읽고 있던 쪽은 끝까지 한 버전을 봅니다.
+        self.assertEqual(old.option_data(old.options.find(option.pk))['intr_rate2'], old_rate)
+        self.assertIsNone(new.find_product('NOPE'))
+
+
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.pages = make_stub_pages(('020000',), pages_per_group=1)
+        run_sync(fetch_pages=lambda progress: self.pages.values())
+
+    def test_feed_returns_changes_since_cursor(self):
+        head = self.client.get('/finlife/changes/?limit=100').json()
+        self.assertEqual([change['kind'] for change in head['results']], ['product_added'] * 3 + ['option_added'] * 3)
+        self.assertFalse(head['has_more'])
+
+        # 금리 하나를 바꾸고, 상품 하나를 추가하고, 상품 하나를 응답에서 뺍니다.
+        page = self.pages[('020000', 1)]
+        page['optionList'][0]['intr_rate2'] = 3.9
+        page['baseList'][2] = {**page['baseList'][2], 'fin_prdt_cd': 'NEW'}
+        page['optionList'][2] = {**page['optionList'][2], 'fin_prdt_cd': 'NEW'}
+        sync_run = run_sync(fetch_pages=lambda progress: self.pages.values(), prune=True)
+        self.assertEqual(sync_run.products_removed, 1)
+        self.assertFalse(DepositProducts.objects.filter(fin_prdt_cd='020000-1-2').exists())
+
+        changes = self.client.get(f"/finlife/changes/?cursor={head['next_cursor']}").json()['results']
+        self.assertEqual(
+            [(change['kind'], change['fin_prdt_cd']) for change in changes],
+            [
+                ('product_added', 'NEW'), ('rate_changed', '020000-1-0'),
+                ('option_added', 'NEW'), ('product_removed', '020000-1-2'),
+            ],
+        )
+        self.assertEqual(changes[1]['changes'], {'intr_rate2': [3.5, 3.9]})
+        self.assertEqual(changes[3]['changes']['fin_prdt_nm'], ['상품 020000-1-2', None])
+
+        # 페이지 나누기와 종류 필터
+        first = self.client.get(f"/finlife/changes/?cursor={head['next_cursor']}&limit=1&kind=rate_changed,product_removed").json()
+        self.assertEqual([change['kind'] for change in first['results']], ['rate_changed'])
+        self.assertTrue(first['has_more'])
+        rest = self.client.get(f"/finlife/changes/?cursor={first['next_cursor']}&kind=rate_changed,product_removed").json()
+        self.assertEqual([change['kind'] for change in rest['results']], ['product_removed'])
+        self.assertFalse(rest['has_more'])
+        self.assertEqual(self.client.get('/finlife/changes/?kind=nope').status_code, 400)
+
+    def test_options_missing_from_response_are_removed(self):
+        head = self.client.get('/finlife/changes/?limit=100').json()['next_cursor']
+        # 상품 하나는 24개월 옵션이 새로 생기고 12개월 옵션이 사라지며, 다른 상품은 옵션이 모두 사라집니다.
+        page = self.pages[('020000', 1)]
+        page['optionList'][0] = {**page['optionList'][0], 'save_trm': '24'}
+        del page['optionList'][1]
+        sync_run = run_sync(fetch_pages=lambda progress: self.pages.values())
+        self.assertEqual((sync_run.options_inserted, sync_run.options_removed), (1, 2))
+        self.assertEqual(
+            list(DepositOptions.objects.order_by('product_id').values_list('product__fin_prdt_cd', 'save_trm')),
+            [('020000-1-0', 24), ('020000-1-2', 12)],
+        )
+
+        changes = self.client.get(f'/finlife/changes/?cursor={head}&kind=option_added,option_removed').json()['results']
+        self.assertEqual(
+            [(change['kind'], change['fin_prdt_cd'], change['save_trm']) for change in changes],
+            [('option_added', '020000-1-0', 24), ('option_removed', '020000-1-0', 12), ('option_removed', '020000-1-1', 12)],
+        )
+        self.assertEqual(changes[1]['changes']['intr_rate2'], [3.5, None])
+
+    def test_fixture_load_records_product_changes(self):
+        from .fixtures import load_fixture
+
+        head = self.client.get('/finlife/changes/?limit=100').json()['next_cursor']
+        records = [
+            {'fin_prdt_cd': '020000-1-0', 'kor_co_nm': '다른은행', 'fin_prdt_nm': '상품 020000-1-0', 'join_deny': 1, 'options': []},
+            {'fin_prdt_cd': 'FIX', 'kor_co_nm': '은행', 'fin_prdt_nm': '적재 상품', 'options': [
+                {'save_trm': 6, 'intr_rate': 2.0, 'intr_rate2': 2.5, 'intr_rate_type': 'S', 'intr_rate_type_nm': '단리'},
+            ]},
+        ]
+        body = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        load_fixture(io.BytesIO(body.encode()), 'ndjson')
+
+        changes = self.client.get(f'/finlife/changes/?cursor={head}').json()['results']
+        self.assertEqual(
+            [(change['kind'], change['fin_prdt_cd']) for change in changes],
+            [('product_updated', '020000-1-0'), ('product_added', 'FIX'), ('option_added', 'FIX')],
+        )
+        self.assertEqual(changes[0]['changes']['kor_co_nm'], ['020000은행', '다른은행'])
+        # fixture 에 옵션이 없다고 기존 옵션을 지우지는 않습니다.
+        self.assertTrue(DepositOptions.objects.filter(product__fin_prdt_cd='020000-1-0').exists())
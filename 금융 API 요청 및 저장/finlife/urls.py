@@ -1,17 +1,63 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     # F01: 데이터 수집 API
     path('save-products/', views.save_deposit_products), 
+    # F01: 동기화 작업 진행 상황 조회
+    path('sync-jobs/<int:job_id>/', views.sync_job_status),
     
     # F02, F03: 상품 목록 조회 API 
+    # ?kor_co_nm=, ?join_deny=, 옵션 조건(?save_trm= 등), ?sort= 로 필터 / 정렬할 수 있습니다.
+    # POST 에 상품 목록([{...}, ...])을 보내면 한 번에 추가하고 항목별 결과를 돌려줍니다.
     path('deposit-products/', views.deposit_products),
 
+    # 옵션 목록 API (save_trm / intr_rate_type / 금리 범위 필터, 금리 정렬)
+    path('deposit-options/', views.deposit_options),
+
+    # F04: 여러 상품의 옵션 리스트를 한 번에 출력하는 API
+    # ?fin_prdt_cd=A,B,C 또는 POST {"fin_prdt_cds": [...]} (없는 상품은 항목별로 오류 표시)
+    path('deposit-product-options/', views.deposit_product_options_batch),
+
     # F04: 특정 상품 옵션 리스트 출력 API (방금 추가)
     # <str:fin_prdt_cd> 부분이 URL에서 상품 코드를 변수로 잡아줍니다.
     path('deposit-product-options/<str:fin_prdt_cd>/', views.deposit_product_options),
 
     # F05: 최고 금리 상품 조회 API (방금 추가)
+    # ?term=12&type=S&n=10 으로 기간 / 금리 유형별 상위 N개 순위표를 조회할 수 있습니다.
     path('top-rate/', views.top_rate_product),
+
+    # 상품 검색 API
+    # ?q=청년 우대 처럼 상품명 / 가입 대상 / 유의사항 / 우대 조건을 검색합니다. (관련도 순, 하이라이트 포함)
+    path('search/', views.search_deposit_products),
+
+    # 금리 변경 이력 API
+    # ?term=12&since=2024-01-01&until=2024-12-31 로 상품의 기간별 금리 시계열을 조회합니다.
+    path('rate-history/<str:fin_prdt_cd>/', views.rate_history),
+    # ?days=30&n=10&field=intr_rate2 로 최근 N일 동안 금리가 가장 많이 변한 옵션을 조회합니다.
+    path('rate-movers/', views.rate_movers),
+
+    # 카탈로그 변경 피드 API
+    # ?cursor=N 으로 마지막으로 읽은 위치 이후의 상품 추가 / 삭제, 금리 변경(이전 → 새 값) 등을 받습니다.
+    path('changes/', views.catalog_changes),
+
+    # 만기 수령액 계산 API
+    # ?amount=10000000&term=12 또는 POST {"queries": [...]} 로 세후 수령액이 가장 큰 옵션 k개를 조회합니다.
+    path('calculator/', views.payout_calculator),
+
+    # 카탈로그 내보내기 API (상품 × 옵션 평면 표를 스트리밍으로 내려받기)
+    # ?format=csv|ndjson, ?gzip=1, 목록 API 와 같은 필터(?kor_co_nm=, ?save_trm= ...)를 쓸 수 있습니다.
+    path('export/', views.export_deposit_catalog),
+
+    # 운영 지표 API (Prometheus 텍스트 형식: 요청 시간 / SQL 수 / 응답 크기 / 금융감독원 API 호출 시간)
+    path('metrics/', views.metrics_view),
+
+    # async 버전 API (ASGI 로 실행할 때 사용, 응답은 위의 같은 이름 API 와 동일 / JSON 전용)
+    # 동기화 작업은 이벤트 루프의 task 로 실행되고, 조회는 async ORM 으로 DB 를 읽습니다.
+    path('async/save-products/', async_views.save_deposit_products),
+    path('async/sync-jobs/<int:job_id>/', async_views.sync_job_status),
+    path('async/deposit-products/', async_views.deposit_products),
+    path('async/deposit-product-options/', async_views.deposit_product_options_batch),
+    path('async/deposit-product-options/<str:fin_prdt_cd>/', async_views.deposit_product_options),
+    path('async/top-rate/', async_views.top_rate_product),
 ]
\ No newline at end of file
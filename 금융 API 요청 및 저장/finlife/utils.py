@@ -0,0 +1,18 @@
+# finlife/utils.py
+# 여러 모듈(fixture 덤프, 카탈로그 내보내기)이 함께 쓰는 조회 도우미입니다.
+
+
+def iter_by_id(queryset, fields, batch_size):
+    """
+    queryset 을 id 순서로 batch_size 개씩 읽어 (id, *fields) 튜플 목록을 내놓습니다.
+
+    id 기준 keyset 페이지네이션이므로 OFFSET 없이 청크마다 기본키 인덱스로 이어서 읽고,
+    메모리에는 한 청크만 올라갑니다.
+    """
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id).order_by('id').values_list('id', *fields)[:batch_size])
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
@@ -1,157 +1,473 @@
 # finlife/views.py (save_deposit_products 함수 수정)
 
-import requests
-from django.conf import settings
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from .models import DepositProducts, DepositOptions
-from .serializers import DepositProductsSerializer, DepositProductOptionsSerializer
+from .models import DepositProducts, DepositOptions, SyncRun
+from .serializers import (
+    DepositProductsSerializer, DepositProductsBulkItemSerializer, DepositProductsWithOptionsSerializer,
+    DepositProductOptionsSerializer, SyncRunSerializer, RateMoverSerializer,
+    PayoutRequestSerializer,
+)
+from .jobs import enqueue_sync
+from .pagination import DepositProductsCursorPagination
+from .fastpath import FastJSONResponse, product_values, serialize_products, paginated_response
+from .filters import filter_options, filter_products, get_ordering, OPTION_SORTS, PRODUCT_SORTS
+from .cache import versioned_cache, bump_catalog_version
+from .leaderboard import get_leaderboard, leaderboard_size, ALL_TERMS, ALL_TYPES
+from .search import index_products, search_products
+from .history import biggest_movers, rate_series, RATE_FIELDS
+from .calculator import top_payouts, TAX_RATES
+from .snapshot import get_snapshot, snapshot_enabled
+from .changes import DEFAULT_LIMIT as CHANGES_DEFAULT_LIMIT, KINDS as CHANGE_KINDS, MAX_LIMIT as CHANGES_MAX_LIMIT, read_changes
+from .export import CONTENT_TYPES, FORMATS as EXPORT_FORMATS, export_chunks
+from . import metrics
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
 
-BASE_URL = 'http://finlife.fss.or.kr/finlifeapi'
-API_KEY = settings.API_KEY # settings.py에서 불러온 키
-PRODUCTS_SEARCH_URL = f'{BASE_URL}/depositProductsSearch.json'
-@api_view(['GET']) 
+@api_view(['GET', 'POST']) 
 def save_deposit_products(request):
     
-    # 1. 환경 설정 및 API 호출 (이전과 동일)
-    API_KEY = settings.API_KEY
-    URL = PRODUCTS_SEARCH_URL
-    params = {
-        'auth': API_KEY, 
-        'topFinGrpNo': '020000', 
-        'pageNo': 1
-    }
-    
-    response = requests.get(URL, params=params)
-    data = response.json()
-    result = data.get('result')
-    
-    if not result:
-        # API 응답에 result 자체가 없는 경우 (치명적인 오류)
-        return Response({'error': 'API 호출에 실패했거나 데이터가 없습니다.'}, status=400)
-    
-    # 수정된 부분: baseList와 optionList가 None인 경우 빈 리스트([])로 처리하여 오류 방지
-    product_list = result.get('baseList', []) # <--- .get(key, default)를 사용
-    options_list = result.get('optionList', []) # <--- .get(key, default)를 사용
+    # 수집 / 적재는 시간이 오래 걸리므로 요청 처리 중에 직접 실행하지 않고 작업으로 등록만 합니다. (F01)
+    # 실제 실행은 백그라운드 스레드 또는 sync_deposit_products 관리 명령이 맡고,
+    # 진행 상황은 sync-jobs/<job_id>/ 로 조회합니다.
+    sync_run = enqueue_sync()
 
-    # ----------------------------------------------------
-    # 2. 상품 (Products) 데이터 저장 (F01)
-    # ----------------------------------------------------
-    
-    # 상품 코드와 저장된 Product 객체를 매핑하는 딕셔너리 생성 (DB 재조회 방지 목적)
-    product_dict = {} 
-    
-    for product_data in product_list:
-        save_data = {
-            'fin_prdt_cd': product_data['fin_prdt_cd'],
-            'kor_co_nm': product_data['kor_co_nm'],
-            'fin_prdt_nm': product_data['fin_prdt_nm'],
-            # ... (나머지 필드: 이전 뷰와 동일하게 구성)
-            'join_way': product_data.get('join_way', ''),
-            'join_member': product_data.get('join_member', ''),
-            'join_deny': product_data.get('join_deny', 1),
-            'max_limit': product_data.get('max_limit'),
-            'etc_note': product_data.get('etc_note', ''),
-            'spcl_cnd': product_data.get('spcl_cnd', '')
-        }
-        
-        product, created = DepositProducts.objects.update_or_create(
-            fin_prdt_cd=save_data['fin_prdt_cd'],
-            defaults=save_data
-        )
-        
-        # 딕셔너리에 저장하여 나중에 옵션 연결 시 사용 (DB 쿼리 방지)
-        product_dict[product.fin_prdt_cd] = product
+    return Response({
+        'message': '정기예금 상품 동기화 작업이 등록되었습니다.',
+        'job_id': sync_run.pk,
+        'status': sync_run.status,
+    }, status=status.HTTP_202_ACCEPTED)
 
 
-    # ----------------------------------------------------
-    # 3. 옵션 (Options) 데이터 저장 (F01)
-    # ----------------------------------------------------
-    
-    for option_data in options_list:
-        fin_prdt_cd = option_data['fin_prdt_cd']
-        
-        # 딕셔너리에서 이미 저장된 Product 객체를 가져와 외래키로 사용
-        product_instance = product_dict.get(fin_prdt_cd)
-        
-        if product_instance:
-            # intr_rate, intr_rate2가 None일 경우 -1로 처리 (요구사항 F01 반영)
-            intr_rate = option_data.get('intr_rate') if option_data.get('intr_rate') is not None else -1
-            intr_rate2 = option_data.get('intr_rate2') if option_data.get('intr_rate2') is not None else -1
-            
-            DepositOptions.objects.update_or_create(
-                # 외래키 연결을 위해 Product 객체 사용
-                product=product_instance, 
-                save_trm=option_data['save_trm'],
-                defaults={
-                    'intr_rate': intr_rate,
-                    'intr_rate2': intr_rate2,
-                    'intr_rate_type': option_data['intr_rate_type'],
-                    'intr_rate_type_nm': option_data['intr_rate_type_nm'],
-                }
-            )
-            
-    return Response({'message': '정기예금 상품 및 옵션 데이터 저장이 완료되었습니다.'})
+# 동기화 작업 진행 상황 조회
+@api_view(['GET'])
+def sync_job_status(request, job_id):
+    try:
+        sync_run = SyncRun.objects.get(pk=job_id)
+    except SyncRun.DoesNotExist:
+        return Response({ 'error': '작업을 찾을 수 없습니다.' }, status=status.HTTP_404_NOT_FOUND)
+
+    return Response(SyncRunSerializer(sync_run).data)
 
 
 # [F02] 상품 목록 조회
+@versioned_cache
 @api_view(['GET', 'POST'])
 def deposit_products(request):
     if request.method == 'GET':
         # F02 로직: 목록 조회
-        products = DepositProducts.objects.all()
-        serializer = DepositProductsSerializer(products, many=True)
-        return Response(serializer.data)
+        # 전체를 한 번에 내려주지 않고 커서 기반으로 나눠서 응답합니다. (?cursor=, ?page_size=)
+        paginator = DepositProductsCursorPagination()
+        paginator.ordering = get_ordering(request.query_params, PRODUCT_SORTS, 'id')
+        nested = request.query_params.get('nested') in ('1', 'true')
+        # ?kor_co_nm=, ?join_deny=, ?save_trm=, ?min_intr_rate2= ... 등 서버 측 필터 (finlife/filters.py)
+        products = filter_products(DepositProducts.objects.all(), request.query_params)
+
+        # JSON 요청은 모델 객체 / Serializer 를 거치지 않는 빠른 경로로 응답합니다. (응답 모양은 동일)
+        # 브라우저용 API 화면(text/html)은 기존 Serializer 경로를 그대로 사용합니다.
+        if request.accepted_renderer.format == 'json':
+            rows = paginator.paginate_queryset(product_values(products), request)
+            return paginated_response(paginator, serialize_products(rows, nested=nested))
+
+        # ?nested=1 이면 상품마다 옵션 목록을 중첩해서 내려줍니다.
+        # 옵션은 prefetch_related 로 페이지 단위 쿼리 1번에 모두 읽으므로, 페이지 크기와 무관하게 쿼리 수가 고정됩니다.
+        if nested:
+            queryset = products.prefetch_related('options')
+            serializer_class = DepositProductsWithOptionsSerializer
+        else:
+            queryset = products
+            serializer_class = DepositProductsSerializer
+
+        products = paginator.paginate_queryset(queryset, request)
+        serializer = serializer_class(products, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     elif request.method == 'POST':
+        # 목록을 보내면 여러 상품을 한 번에 추가합니다. (항목별 오류 보고)
+        if isinstance(request.data, list):
+            return _bulk_create_products(request.data)
+
         # F03 로직: 상품 추가
         serializer = DepositProductsSerializer(data=request.data)
         if serializer.is_valid(raise_exception=True):
-            serializer.save()
+            with transaction.atomic():
+                product = serializer.save()
+                index_products([product.id])
+                # 목록 응답 캐시가 새 상품을 반영하도록 카탈로그 버전을 올립니다.
+                bump_catalog_version()
             return Response({ 'message': '데이터 삽입 성공' }, status=status.HTTP_201_CREATED)
 
+# [F03] 여러 상품 한 번에 추가
+BULK_CREATE_LIMIT = 1000
+
+def _bulk_create_products(items):
+    if not items:
+        return Response({ 'error': '추가할 상품을 하나 이상 보내 주세요.' }, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > BULK_CREATE_LIMIT:
+        return Response({ 'error': f'한 번에 최대 {BULK_CREATE_LIMIT}개까지 추가할 수 있습니다.' }, status=status.HTTP_400_BAD_REQUEST)
+
+    # 1. 이미 있는 상품 코드는 쿼리 1번으로 미리 읽습니다. (항목마다 중복 검사 쿼리를 하지 않음)
+    codes = {item.get('fin_prdt_cd') for item in items if isinstance(item, dict)}
+    codes = {code for code in codes if isinstance(code, str)}
+    taken = set(DepositProducts.objects.filter(fin_prdt_cd__in=codes).values_list('fin_prdt_cd', flat=True))
+
+    # 2. 모든 항목을 한 번에 검사하고, 통과한 항목만 모읍니다.
+    results, products = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results.append({ 'index': index, 'errors': { 'non_field_errors': ['상품 정보는 객체여야 합니다.'] } })
+            continue
+        serializer = DepositProductsBulkItemSerializer(data=item)
+        if not serializer.is_valid():
+            results.append({ 'index': index, 'fin_prdt_cd': item.get('fin_prdt_cd'), 'errors': serializer.errors })
+            continue
+        code = serializer.validated_data['fin_prdt_cd']
+        if code in taken:
+            # 이미 DB 에 있거나, 같은 요청의 앞 항목과 코드가 겹칩니다.
+            results.append({ 'index': index, 'fin_prdt_cd': code, 'errors': { 'fin_prdt_cd': ['이미 존재하는 상품 코드입니다.'] } })
+            continue
+        taken.add(code)
+        results.append({ 'index': index, 'fin_prdt_cd': code, 'status': 'created' })
+        products.append(DepositProducts(**serializer.validated_data))
+
+    # 3. 통과한 항목은 INSERT 1번으로 추가합니다.
+    if products:
+        try:
+            with transaction.atomic():
+                created = DepositProducts.objects.bulk_create(products)
+                index_products([product.id for product in created])
+                bump_catalog_version()
+        except IntegrityError:
+            # 검사 이후 다른 요청이 같은 코드를 먼저 추가한 경우입니다. 아무것도 추가하지 않았으므로 다시 보내면 됩니다.
+            return Response({ 'error': '다른 요청과 상품 코드가 충돌했습니다. 다시 시도해 주세요.' }, status=status.HTTP_409_CONFLICT)
+
+    failed = len(items) - len(products)
+    if not products:
+        response_status = status.HTTP_400_BAD_REQUEST
+    elif failed:
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = status.HTTP_201_CREATED
+    return Response({
+        'message': f'{len(products)}개 상품 삽입 성공, {failed}개 실패',
+        'created': len(products),
+        'failed': failed,
+        'results': results,
+    }, status=response_status)
+
+# 옵션 목록 조회 (필터 / 금리 정렬)
+@versioned_cache
+@api_view(['GET'])
+def deposit_options(request):
+    # ?save_trm=12&intr_rate_type=S&min_intr_rate2=3.5&sort=-intr_rate2 처럼 조건에 맞는 옵션을 금리 순으로 조회
+    paginator = DepositProductsCursorPagination()
+    paginator.ordering = get_ordering(request.query_params, OPTION_SORTS, '-intr_rate2')
+    options = filter_options(DepositOptions.objects.select_related('product'), request.query_params)
+
+    page = paginator.paginate_queryset(options, request)
+    serializer = DepositProductOptionsSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
 # [F04] 특정 상품 옵션 리스트 출력
+@versioned_cache
 @api_view(['GET'])
 def deposit_product_options(request, fin_prdt_cd):
+    # FINLIFE_SNAPSHOT 이 켜져 있으면 메모리의 카탈로그 스냅샷에서 답합니다. (DB 쿼리 없음, 응답 모양 동일)
+    if snapshot_enabled():
+        catalog = get_snapshot()
+        row = catalog.find_product(fin_prdt_cd)
+        if row is None:
+            return Response({ 'error': '상품을 찾을 수 없습니다.' }, status=status.HTTP_404_NOT_FOUND)
+        return Response(catalog.product_data(row, nested=True))
+
     # 1. 특정 상품 코드에 해당하는 상품 조회
     try:
         # get() 메서드를 사용하여 단 하나의 객체를 조회
-        product = DepositProducts.objects.get(fin_prdt_cd=fin_prdt_cd)
+        product = DepositProducts.objects.prefetch_related('options').get(fin_prdt_cd=fin_prdt_cd)
     
     except DepositProducts.DoesNotExist:
         # 상품을 찾지 못했을 경우 404 Not Found 응답 반환
         return Response({ 'error': '상품을 찾을 수 없습니다.' }, status=status.HTTP_404_NOT_FOUND)
 
     # 2. Serializer를 사용하여 객체를 JSON 형태로 변환
-    # F02에서 옵션 정보를 중첩하도록 구현했기 때문에, 이 Serializer 하나로 상품과 옵션이 모두 반환됩니다.
-    serializer = DepositProductsSerializer(product)
+    # 옵션 정보를 중첩하는 Serializer 를 사용하므로, 이 Serializer 하나로 상품과 옵션이 모두 반환됩니다.
+    serializer = DepositProductsWithOptionsSerializer(product)
     
     # 3. JSON 응답 반환
     return Response(serializer.data)
 
+# [F04] 여러 상품의 옵션 리스트를 한 번에 출력 (비교 화면용)
+BATCH_LOOKUP_LIMIT = 100
+
+@versioned_cache
+@api_view(['GET', 'POST'])
+def deposit_product_options_batch(request):
+    # GET ?fin_prdt_cd=A,B,C  또는  POST {"fin_prdt_cds": ["A", "B", "C"]}
+    if request.method == 'GET':
+        codes = [code for code in request.query_params.get('fin_prdt_cd', '').split(',') if code]
+    else:
+        codes = request.data.get('fin_prdt_cds') if hasattr(request.data, 'get') else None
+        if not isinstance(codes, list) or not all(isinstance(code, str) for code in codes):
+            return Response({ 'error': 'fin_prdt_cds 는 상품 코드 문자열 목록이어야 합니다.' }, status=status.HTTP_400_BAD_REQUEST)
+    if not codes:
+        return Response({ 'error': '상품 코드를 하나 이상 입력해 주세요.' }, status=status.HTTP_400_BAD_REQUEST)
+    if len(codes) > BATCH_LOOKUP_LIMIT:
+        return Response({ 'error': f'한 번에 최대 {BATCH_LOOKUP_LIMIT}개까지 조회할 수 있습니다.' }, status=status.HTTP_400_BAD_REQUEST)
+
+    # 1. 상품 쿼리 1번 + 옵션 쿼리 1번 (요청한 상품 수와 무관), 스냅샷이 켜져 있으면 쿼리 없음
+    if snapshot_enabled():
+        catalog = get_snapshot()
+        rows = {code: catalog.find_product(code) for code in set(codes)}
+        found = {code: catalog.product_data(row, nested=True) for code, row in rows.items() if row is not None}
+    else:
+        rows = list(product_values(DepositProducts.objects.filter(fin_prdt_cd__in=set(codes))))
+        found = {product['fin_prdt_cd']: product for product in serialize_products(rows, nested=True)}
+
+    # 2. 요청 순서대로 돌려주고, 없는 상품은 해당 항목에만 오류를 표시합니다.
+    results = [
+        found[code] if code in found else { 'fin_prdt_cd': code, 'error': '상품을 찾을 수 없습니다.' }
+        for code in codes
+    ]
+    return Response({ 'results': results, 'missing': [code for code in codes if code not in found] })
+
 # [F05] 최고 금리 상품 조회
+@versioned_cache
 @api_view(['GET'])
 def top_rate_product(request):
-    # 1. 모든 옵션 중 intr_rate2가 가장 높은 단 하나의 객체를 조회
+    # 쿼리 파라미터: term (저축 기간, 개월), type ('S':단리, 'M':월복리), n (개수)
+    params = request.query_params
     try:
-        # intr_rate2 필드를 기준으로 내림차순 정렬 후 첫 번째 객체 선택
-        # intr_rate2가 NULL인 경우를 제외하기 위해 filter로 거르는 것이 좋습니다.
-        top_option = DepositOptions.objects.filter(
-            intr_rate2__isnull=False
-        ).order_by('-intr_rate2').first() 
-        # DepositOptions 모델을 사용하셨다면 모델 이름 변경
-
-    except Exception:
-        # 데이터가 없는 경우 (F01을 실행하지 않은 경우)
-        return Response({ 'message': '저장된 상품 옵션 데이터가 없습니다.' }, status=status.HTTP_404_NOT_FOUND)
-
-    # 2. 최고 금리 옵션이 없는 경우 처리
-    if not top_option:
+        save_trm = int(params.get('term') or ALL_TERMS)
+        n = int(params.get('n') or 1)
+    except ValueError:
+        return Response({ 'error': 'term 과 n 은 정수여야 합니다.' }, status=status.HTTP_400_BAD_REQUEST)
+    # 순위표에는 상위 leaderboard_size() 개만 있으므로 그보다 큰 n 은 잘라 주지 않고 거절합니다.
+    if not 1 <= n <= leaderboard_size():
+        return Response({ 'error': f'n 은 1 이상 {leaderboard_size()} 이하여야 합니다.' }, status=status.HTTP_400_BAD_REQUEST)
+    intr_rate_type = (params.get('type') or ALL_TYPES).upper()
+    if intr_rate_type not in (ALL_TYPES, 'S', 'M'):
+        return Response({ 'error': "type 은 'S' 또는 'M' 이어야 합니다." }, status=status.HTTP_400_BAD_REQUEST)
+
+    # 1. 적재 시 미리 계산해 둔 금리 순위표에서 상위 n개만 읽습니다. (정렬 쿼리 없음)
+    #    스냅샷이 켜져 있으면 같은 순위 규칙으로 메모리에서 고릅니다. (쿼리 없음)
+    if snapshot_enabled():
+        catalog = get_snapshot()
+        top_options = [catalog.option_with_product(index) for index in catalog.top_options(save_trm, intr_rate_type, n)]
+    else:
+        top_options = DepositProductOptionsSerializer(get_leaderboard(save_trm, intr_rate_type, n), many=True).data
+
+    # 2. 최고 금리 옵션이 없는 경우 처리 (F01을 실행하지 않은 경우 등)
+    if not top_options:
         return Response({ 'message': '유효한 최고 금리 데이터를 찾을 수 없습니다.' }, status=status.HTTP_404_NOT_FOUND)
 
-    # 3. Serializer를 사용하여 옵션과 중첩된 상품 정보를 JSON으로 변환
-    serializer = DepositProductOptionsSerializer(top_option)
-    
-    # 4. JSON 응답 반환
-    return Response(serializer.data)
\ No newline at end of file
+    # 3. 파라미터 없이 호출하면 기존(F05)처럼 최고 금리 옵션 하나만 돌려줍니다.
+    if not any(key in params for key in ('term', 'type', 'n')):
+        return Response(top_options[0])
+
+    return Response(top_options)
+
+
+# 상품 검색 (상품명 / 가입 대상 / 유의사항 / 우대 조건)
+@versioned_cache
+@api_view(['GET'])
+def search_deposit_products(request):
+    # ?q=청년 우대&limit=20 : 관련도 순으로 정렬하고, 일치한 부분을 <mark> 로 감싼 스니펫을 함께 돌려줍니다.
+    query = (request.query_params.get('q') or '').strip()
+    if not query:
+        return Response({ 'error': '검색어(q)를 입력해 주세요.' }, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = max(1, min(int(request.query_params.get('limit') or 20), 100))
+    except ValueError:
+        return Response({ 'error': 'limit 은 정수여야 합니다.' }, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(search_products(query, limit=limit))
+
+
+def _parse_time(value):
+    # '2024-01-31' 또는 '2024-01-31T09:00:00' 형식을 받습니다.
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+# 상품 금리 변경 이력 (시계열)
+@versioned_cache
+@api_view(['GET'])
+def rate_history(request, fin_prdt_cd):
+    # ?term=12 (저축 기간), ?since=2024-01-01, ?until=2024-12-31
+    params = request.query_params
+    try:
+        product = DepositProducts.objects.only('id').get(fin_prdt_cd=fin_prdt_cd)
+    except DepositProducts.DoesNotExist:
+        return Response({ 'error': '상품을 찾을 수 없습니다.' }, status=status.HTTP_404_NOT_FOUND)
+    try:
+        save_trm = int(params['term']) if params.get('term') else None
+        since, until = _parse_time(params.get('since')), _parse_time(params.get('until'))
+    except ValueError:
+        return Response({ 'error': 'term 은 정수, since / until 은 날짜(YYYY-MM-DD)여야 합니다.' }, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'fin_prdt_cd': fin_prdt_cd,
+        'series': rate_series(product, save_trm=save_trm, since=since, until=until),
+    })
+
+
+# 기간 내 금리 변동폭 상위 옵션
+# 조회 기간(days)의 최댓값 (10년)
+RATE_MOVERS_MAX_DAYS = 3650
+
+@api_view(['GET'])
+def rate_movers(request):
+    # ?days=30 (최근 N일), ?n=10, ?field=intr_rate2 (또는 intr_rate), ?term=12
+    # 현재 시각 기준으로 기간이 정해지므로 카탈로그 버전 캐시는 쓰지 않습니다.
+    params = request.query_params
+    try:
+        days = int(params.get('days') or 30)
+        n = max(1, min(int(params.get('n') or 10), 100))
+        save_trm = int(params['term']) if params.get('term') else None
+    except ValueError:
+        return Response({ 'error': 'days, n, term 은 정수여야 합니다.' }, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= days <= RATE_MOVERS_MAX_DAYS:
+        return Response({ 'error': f'days 는 1 이상 {RATE_MOVERS_MAX_DAYS} 이하여야 합니다.' }, status=status.HTTP_400_BAD_REQUEST)
+    field = params.get('field') or 'intr_rate2'
+    if field not in RATE_FIELDS:
+        return Response({ 'error': "field 는 'intr_rate' 또는 'intr_rate2' 여야 합니다." }, status=status.HTTP_400_BAD_REQUEST)
+
+    movers = biggest_movers(timezone.now() - timedelta(days=days), n=n, field=field, save_trm=save_trm)
+    return Response(RateMoverSerializer(movers, many=True).data)
+
+
+# 카탈로그 변경 피드 (커서 이후의 상품 추가 / 삭제, 금리 변경 등)
+# 변경 기록은 카탈로그 버전이 올라가는 트랜잭션에서만 쌓이므로 버전 기준 응답 캐시를 그대로 쓸 수 있습니다.
+@versioned_cache
+@api_view(['GET'])
+def catalog_changes(request):
+    # ?cursor=0&limit=500&kind=rate_changed,product_added
+    # 응답의 next_cursor 를 다음 요청의 cursor 로 넘기면 그 뒤의 변경만 받습니다. (has_more 가 false 이면 최신까지 읽은 것)
+    params = request.query_params
+    try:
+        cursor = int(params.get('cursor') or 0)
+        limit = int(params.get('limit') or CHANGES_DEFAULT_LIMIT)
+    except ValueError:
+        return Response({ 'error': 'cursor 와 limit 은 정수여야 합니다.' }, status=status.HTTP_400_BAD_REQUEST)
+    kinds = [kind for kind in (params.get('kind') or '').split(',') if kind]
+    unknown = [kind for kind in kinds if kind not in CHANGE_KINDS]
+    if unknown:
+        return Response(
+            { 'error': f"알 수 없는 kind 입니다: {', '.join(unknown)} (가능한 값: {', '.join(CHANGE_KINDS)})" },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    changes, next_cursor, has_more = read_changes(cursor, max(1, min(limit, CHANGES_MAX_LIMIT)), kinds)
+    return Response({ 'results': changes, 'next_cursor': next_cursor, 'has_more': has_more })
+
+
+# 만기 수령액 계산기 (세후 수령액 상위 k개 옵션)
+@versioned_cache
+@api_view(['GET', 'POST'])
+def payout_calculator(request):
+    # GET  ?amount=10000000&term=12&k=10&rate=intr_rate2&tax=general
+    # POST {"queries": [{"amount": 10000000, "term": 12}, ...], "k": 10, "rate": "intr_rate2", "tax": "general"}
+    if request.method == 'GET':
+        params = request.query_params
+        data = {key: params[key] for key in ('k', 'rate', 'tax') if params.get(key)}
+        data['queries'] = [{'amount': params.get('amount'), 'term': params.get('term')}]
+    else:
+        data = request.data
+    serializer = PayoutRequestSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    options = serializer.validated_data
+    queries = [(query['amount'], query['term']) for query in options['queries']]
+
+    # 1. 모든 질의를 벡터 연산으로 한 번에 계산합니다.
+    #    스냅샷이 켜져 있으면 스냅샷의 옵션 열로 계산하고, 결과 옵션의 상품 정보도 같은 스냅샷에서 읽습니다. (쿼리 없음)
+    catalog = get_snapshot() if snapshot_enabled() else None
+    ranked = top_payouts(
+        queries, k=options['k'], rate_field=options['rate'], tax_rate=TAX_RATES[options['tax']],
+        columns=catalog.options if catalog is not None else None,
+    )
+    option_ids = {option_id for results in ranked for option_id, *_ in results}
+
+    # 2. 결과에 나온 옵션의 상품 정보만 읽습니다. (스냅샷이 꺼져 있으면 쿼리 1번)
+    if catalog is not None:
+        found = {}
+        for option_id in option_ids:
+            index = catalog.options.find(option_id)
+            found[option_id] = {**catalog.product_data(int(catalog.options.product[index])), **catalog.option_data(index)}
+    else:
+        rows = DepositOptions.objects.filter(id__in=option_ids).values_list(
+            'id', 'product__fin_prdt_cd', 'product__kor_co_nm', 'product__fin_prdt_nm', 'save_trm', 'intr_rate_type',
+        )
+        found = {
+            option_id: dict(zip(('fin_prdt_cd', 'kor_co_nm', 'fin_prdt_nm', 'save_trm', 'intr_rate_type'), values))
+            for option_id, *values in rows
+        }
+
+    response = []
+    for (amount, term), results in zip(queries, ranked):
+        response.append({
+            'amount': amount,
+            'term': term,
+            'results': [
+                {
+                    'fin_prdt_cd': found[option_id]['fin_prdt_cd'],
+                    'kor_co_nm': found[option_id]['kor_co_nm'],
+                    'fin_prdt_nm': found[option_id]['fin_prdt_nm'],
+                    'save_trm': found[option_id]['save_trm'],
+                    'intr_rate_type': found[option_id]['intr_rate_type'],
+                    'rate': rate,
+                    # 원 단위로 반올림
+                    'interest': round(interest),
+                    'tax': round(tax),
+                    'payout': round(payout),
+                }
+                for option_id, rate, interest, tax, payout in results
+                # 계산 뒤에 동기화로 삭제된 옵션은 뺍니다.
+                if option_id in found
+            ],
+        })
+    return Response(response)
+
+
+# 운영 지표 (Prometheus 텍스트 형식)
+# DRF 의 콘텐츠 협상을 거치지 않도록 일반 Django 뷰로 둡니다.
+def metrics_view(request):
+    return HttpResponse(metrics.registry.expose(), content_type=metrics.CONTENT_TYPE)
+
+
+# 카탈로그 내보내기 (상품 × 옵션 평면 표, CSV / NDJSON 스트리밍)
+# 응답을 한 번에 만들지 않고 배치마다 흘려보내야 하므로 DRF Response 대신 StreamingHttpResponse 를 씁니다.
+@require_GET
+def export_deposit_catalog(request):
+    # ?format=csv|ndjson, ?gzip=1, 그리고 목록 API 와 같은 필터(?kor_co_nm=, ?save_trm= ...)
+    fmt = request.GET.get('format') or 'csv'
+    if fmt not in EXPORT_FORMATS:
+        return FastJSONResponse({ 'error': "format 은 'csv' 또는 'ndjson' 이어야 합니다." }, status=status.HTTP_400_BAD_REQUEST)
+    use_gzip = request.GET.get('gzip') in ('1', 'true')
+    try:
+        # 스트림을 연 뒤에는 상태 코드를 바꿀 수 없으므로, 필터 값 검사는 응답을 만들기 전에 끝냅니다.
+        products = filter_products(DepositProducts.objects.all(), request.GET)
+    except ValidationError as exc:
+        return FastJSONResponse(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+
+    filename = f'deposit-catalog.{fmt}' + ('.gz' if use_gzip else '')
+    response = StreamingHttpResponse(
+        export_chunks(fmt, products, gzip=use_gzip),
+        content_type='application/gzip' if use_gzip else CONTENT_TYPES[fmt],
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
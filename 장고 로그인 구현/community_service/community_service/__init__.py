@@ -0,0 +1,2 @@
+# SQLite PRAGMA 시그널 등록
+from . import db  # noqa: F401
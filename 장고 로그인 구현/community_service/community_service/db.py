@@ -0,0 +1,20 @@
+# SQLite 연결 설정
+# 새 DB 연결이 열릴 때마다 settings.SQLITE_PRAGMAS 의 PRAGMA 를 실행합니다.
+# (Django 5.0 의 SQLite 백엔드에는 OPTIONS['init_command'] 가 없어서 connection_created 시그널을 씁니다)
+# - journal_mode=WAL : 쓰기 중에도 읽기가 막히지 않습니다.
+# - synchronous=NORMAL : WAL 에서 권장되는 값 (커밋마다 fsync 하지 않음)
+# - busy_timeout : 잠금을 만나면 바로 "database is locked" 를 내지 않고 기다립니다.
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
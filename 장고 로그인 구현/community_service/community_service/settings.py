@@ -83,9 +83,26 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # 잠금 대기 시간(초)
+            'timeout': 5,
+        },
+        # 요청마다 연결을 새로 열지 않고 재사용합니다.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# 연결이 열릴 때마다 실행하는 PRAGMA (community_service/db.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # 음수는 KiB 단위 (-65536 = 64MB)
+    'cache_size': -65536,
+    'busy_timeout': 5000,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators